@@ -51,6 +51,18 @@ def compileTTF(ufo, **kwargs):
     *allQuadratic* (bool) specifies whether to convert all curves to quadratic - True
     by default, builds traditional glyf v0 table. If False, quadratic curves or cubic
     curves are generated depending on which has fewer points; a glyf v1 is generated.
+
+    *jobs* (int) is the number of worker processes used to compile the glyphs
+    without components in parallel, and to run the filters that modify each glyph
+    independently (e.g. removing overlaps, converting curves) on batches of glyphs.
+    The default (1) processes all glyphs serially in the current process.
+
+    *cacheDir* (str) is the path to a directory where the compiled glyphs without
+    components, as well as the results of the cubic to quadratic conversion, are
+    cached, keyed by a hash of their outlines and the compile options, so that
+    subsequent builds can reuse them. The OpenType layout tables compiled from the
+    features are also cached there, keyed by a hash of the generated features and
+    the glyph order. By default (None), no cache is used.
     """
     return TTFCompiler(**kwargs).compile(ufo)
 
@@ -113,6 +125,18 @@ def compileOTF(ufo, **kwargs):
       By default "cffsubr" is used for both CFF 1 and CFF 2.
       NOTE: cffsubr is required for subroutinizing CFF2 tables, as compreffor
       currently doesn't support it.
+
+    *jobs* (int) is the number of worker processes used to build the charstrings
+      of the glyphs without components in parallel, and to run the filters that
+      modify each glyph independently (e.g. removing overlaps) on batches of
+      glyphs. The default (1) processes all glyphs serially in the current process.
+
+    *cacheDir* (str) is the path to a directory where the charstrings of the
+      glyphs without components are cached, keyed by a hash of their outlines
+      and the compile options, so that subsequent builds can reuse them. The
+      OpenType layout tables compiled from the features are also cached there,
+      keyed by a hash of the generated features and the glyph order. By
+      default (None), no cache is used.
     """
     return OTFCompiler(**kwargs).compile(ufo)
 
@@ -161,6 +185,10 @@ def compileVariableTTFs(designSpaceDoc, **kwargs):
       by default, builds traditional glyf v0 table. If False, quadratic curves or cubic
       curves are generated depending on which has fewer points; a glyf v1 is generated.
 
+    *jobs* (int) is the number of worker processes used to compile the masters
+      in parallel. The default (1) compiles them one at a time in the current
+      process.
+
     The rest of the arguments works the same as in the other compile functions.
 
     Returns a dictionary that maps each variable font filename to a new variable
@@ -196,6 +224,10 @@ def compileInterpolatableTTFsFromDS(designSpaceDoc, **kwargs):
     For sources that have the 'layerName' attribute defined, the corresponding TTFont
     object will contain only a minimum set of tables ("head", "hmtx", "glyf", "loca",
     "maxp", "post" and "vmtx"), and no OpenType layout tables.
+
+    *jobs* (int) is the number of worker processes used to compile the masters
+      in parallel. The default (1) compiles them one at a time in the current
+      process.
     """
     return InterpolatableTTFCompiler(**kwargs).compile_designspace(designSpaceDoc)
 
@@ -284,6 +316,10 @@ def compileVariableCFF2s(designSpaceDoc, **kwargs):
       by default, builds traditional glyf v0 table. If False, quadratic curves or cubic
       curves are generated depending on which has fewer points; a glyf v1 is generated.
 
+    *jobs* (int) is the number of worker processes used to compile the masters
+      in parallel. The default (1) compiles them one at a time in the current
+      process.
+
     The rest of the arguments works the same as in the other compile functions.
 
     Returns a dictionary that maps each variable font filename to a new variable
@@ -1,5 +1,7 @@
 import logging
+import multiprocessing
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Callable, Optional, Type
 
@@ -50,6 +52,8 @@ class BaseCompiler:
     feaIncludeDir: Optional[str] = None
     skipFeatureCompilation: bool = False
     ftConfig: dict = field(default_factory=dict)
+    jobs: int = 1
+    cacheDir: Optional[str] = None
 
     def __post_init__(self):
         self.logger = logging.getLogger("ufo2ft")
@@ -67,7 +71,7 @@ class BaseCompiler:
             font = self.postprocess(font, ufo, glyphSet)
         return font
 
-    def preprocess(self, ufo_or_ufos):
+    def preprocess(self, ufo_or_ufos, glyphNames=None):
         self.logger.info("Pre-processing glyphs")
         if self.skipExportGlyphs is None:
             if isinstance(ufo_or_ufos, (list, tuple)):
@@ -89,6 +93,9 @@ class BaseCompiler:
         # Preprocessors expect this parameter under a different name.
         if hasattr(self, "cubicConversionError"):
             preprocessor_args["conversionError"] = self.cubicConversionError
+        # only process some of the glyphs, e.g. in incremental builds
+        if glyphNames is not None:
+            preprocessor_args["glyphNames"] = glyphNames
         preProcessor = self.preProcessorClass(ufo_or_ufos, **preprocessor_args)
         return preProcessor.process()
 
@@ -151,6 +158,29 @@ class BaseCompiler:
         return otFont
 
 
+# State shared with the worker processes that compile interpolatable masters
+# in parallel; see BaseInterpolatableCompiler._compile_parallel.
+_worker_state = None
+
+
+def _init_master_worker(compiler, ufos):
+    global _worker_state
+    # the masters are already compiled in parallel, don't spawn nested pools
+    # for compiling each master's glyphs
+    compiler.jobs = 1
+    _worker_state = (compiler, ufos)
+
+
+def _compile_master_in_worker(i):
+    compiler, ufos = _worker_state
+    default_idx = (
+        compiler.instantiator.default_source_idx if compiler.instantiator else None
+    )
+    if default_idx is not None:
+        compiler.compilingVFDefaultSource = i == default_idx
+    return compiler.compile_one(ufos[i], compiler.glyphSets[i], compiler.layerNames[i])
+
+
 @dataclass
 class BaseInterpolatableCompiler(BaseCompiler):
     """Create FontTools TrueType fonts from the DesignSpaceDocument UFO sources
@@ -193,6 +223,18 @@ class BaseInterpolatableCompiler(BaseCompiler):
         assert len(ufos) == len(self.layerNames)
         self.glyphSets = self.preprocess(ufos)
 
+        # when a debugFeatureFile is set, the per-master feature files must be
+        # written to it in order from the current process; the workers must be
+        # forked, as the compiler and UFOs may not be picklable
+        if (
+            self.jobs > 1
+            and len(ufos) > 1
+            and not self.debugFeatureFile
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            yield from self._compile_parallel(ufos)
+            return
+
         default_idx = (
             self.instantiator.default_source_idx if self.instantiator else None
         )
@@ -203,6 +245,26 @@ class BaseInterpolatableCompiler(BaseCompiler):
                 self.compilingVFDefaultSource = i == default_idx
             yield self.compile_one(ufo, glyphSet, layerName)
 
+    def _compile_parallel(self, ufos):
+        """Compile the preprocessed masters in a pool of `self.jobs` worker
+        processes, and yield the TTFonts in the same order as the `ufos`.
+
+        The 'fork' start method is used so that the compiler state and the UFO
+        objects (which may not be picklable) are inherited by the workers instead
+        of being pickled; only the resulting TTFonts are sent back to the main
+        process. Where it is not available (e.g. on Windows), `compile` does
+        not call this and compiles the masters in the current process instead.
+        """
+        mp_context = multiprocessing.get_context("fork")
+        jobs = min(self.jobs, len(ufos))
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=mp_context,
+            initializer=_init_master_worker,
+            initargs=(self, ufos),
+        ) as executor:
+            yield from executor.map(_compile_master_in_worker, range(len(ufos)))
+
     def compile_one(self, ufo, glyphSet, layerName):
         fontName = _LazyFontName(ufo)
         if layerName is not None:
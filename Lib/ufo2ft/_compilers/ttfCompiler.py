@@ -1,12 +1,23 @@
+import weakref
 from dataclasses import dataclass
-from typing import Optional, Type
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Type
 
+from fontTools.ttLib import newTable
+
+from ufo2ft.fontInfoData import getAttrWithFallback
 from ufo2ft.outlineCompiler import OutlineTTFCompiler
+from ufo2ft.postProcessor import _reloadFont
 from ufo2ft.preProcessor import TTFPreProcessor
-from ufo2ft.util import prune_unknown_kwargs
+from ufo2ft.util import _GlyphSet, closeGlyphsOverComponents, prune_unknown_kwargs
 
 from .baseCompiler import BaseCompiler
 
+# the tables that are recomputed in incremental builds, as they depend on the
+# glyphs' outlines and metrics; the others are copied from the previous font
+INCREMENTAL_TABLES = frozenset(
+    ["glyf", "loca", "hmtx", "head", "hhea", "OS/2", "maxp", "vmtx", "vhea"]
+)
+
 
 @dataclass
 class TTFCompiler(BaseCompiler):
@@ -21,8 +32,157 @@ class TTFCompiler(BaseCompiler):
     dropImpliedOnCurves: bool = False
     allQuadratic: bool = True
 
-    def compileOutlines(self, ufo, glyphSet):
+    def compile(self, ufo, previous=None, changedGlyphs=None):
+        """Compile the UFO into a TTFont.
+
+        If a `previous` TTFont is given, it must have been returned by this method
+        for an earlier version of the same UFO, with the same compiler options:
+        the font is then rebuilt incrementally, given the set of `changedGlyphs`
+        names. Only the changed glyphs and the composite glyphs that reference
+        them are preprocessed and compiled again; the glyf, loca, hmtx, head,
+        hhea, OS/2 and maxp tables (plus vmtx and vhea, if any) are recomputed,
+        and all the other tables are copied from the previous font.
+
+        Changes to the features, kerning, unicodes or anchors, or to the glyph
+        set or glyph order, require a full build, as do fonts with COLR or MATH
+        tables: in these cases, or if the previous font was not compiled by this
+        method (e.g. it was loaded from a file), the font is compiled in full.
+        """
+        if previous is not None:
+            if changedGlyphs is None:
+                raise TypeError("'changedGlyphs' argument is required with 'previous'")
+            font = self._compileIncremental(ufo, previous, changedGlyphs)
+            if font is not None:
+                return font
+            self.logger.info("Can't rebuild the font incrementally; compiling it")
+
+        with self.timer("preprocess UFO"):
+            glyphSet = self.preprocess(ufo)
+        with self.timer("compile a basic TTF"):
+            self.logger.info("Building OpenType tables")
+            font = self.compileOutlines(ufo, glyphSet)
+        # remember what the font is built from before post-processing renames
+        # the glyphs, for incremental builds based on it
+        sources = _GlyphSources.fromGlyphSet(
+            self._getLayer(ufo),
+            self.skipExportGlyphs,
+            font.getGlyphOrder(),
+            glyphSet,
+        )
+        if self.layerName is None and not self.skipFeatureCompilation:
+            self.compileFeatures(ufo, font, glyphSet=glyphSet)
+        with self.timer("postprocess TTF"):
+            font = self.postprocess(font, ufo, glyphSet)
+        _compiledSources[font] = sources
+        return font
+
+    def compileOutlines(self, ufo, glyphSet, previous=None, changedGlyphs=None):
         kwargs = prune_unknown_kwargs(self.__dict__, self.outlineCompilerClass)
         kwargs["glyphDataFormat"] = 0 if self.allQuadratic else 1
+        if previous is not None:
+            kwargs["tables"] = INCREMENTAL_TABLES
+            kwargs["previousFont"] = previous
+            kwargs["changedGlyphs"] = changedGlyphs
+            kwargs["previousGlyphOrder"] = _compiledSources[previous].glyphOrder
         outlineCompiler = self.outlineCompilerClass(ufo, glyphSet=glyphSet, **kwargs)
         return outlineCompiler.compile()
+
+    def _getLayer(self, ufo):
+        if self.layerName is not None:
+            return ufo.layers[self.layerName]
+        return ufo.layers.defaultLayer
+
+    def _compileIncremental(self, ufo, previous, changedGlyphs):
+        # return None if the previous font can't be rebuilt incrementally
+        sources = _compiledSources.get(previous)
+        if sources is None or "COLR" in previous or "MATH" in previous:
+            return None
+        glyphs = {glyph.name: glyph for glyph in self._getLayer(ufo)}
+        if glyphs.keys() != sources.glyphNames:
+            return None
+        # filters may decompose composite glyphs, so we must also include
+        # those that referenced the changed glyphs before preprocessing
+        changedGlyphs = closeGlyphsOverComponents(glyphs, changedGlyphs)
+
+        with self.timer("preprocess changed glyphs"):
+            changedGlyphSet = self.preprocess(ufo, glyphNames=changedGlyphs)
+        if set(self.skipExportGlyphs or ()) != sources.skipExportGlyphs:
+            return None
+        glyphSet = _GlyphSet(sources.glyphSet)
+        glyphSet.lib = changedGlyphSet.lib
+        glyphSet.name = changedGlyphSet.name
+        for glyphName in changedGlyphs:
+            if glyphName in changedGlyphSet:
+                glyphSet[glyphName] = changedGlyphSet[glyphName]
+                # the features generated from these would differ
+                if _getLayoutData(glyphSet[glyphName]) != sources.layoutData.get(
+                    glyphName
+                ):
+                    return None
+
+        with self.timer("compile changed outlines"):
+            self.logger.info("Building glyph tables")
+            font = self.compileOutlines(
+                ufo, glyphSet, previous=previous, changedGlyphs=changedGlyphs
+            )
+        if font.getGlyphOrder() != sources.glyphOrder:
+            return None
+        with self.timer("copy unchanged tables"):
+            font = self._copyUnchangedTables(ufo, previous, font)
+        _compiledSources[font] = sources._replace(glyphSet=glyphSet)
+        return font
+
+    @staticmethod
+    def _copyUnchangedTables(ufo, previous, font):
+        # compile the new tables and load them with the previous font's glyph
+        # names, which may have been renamed when post-processing
+        font = _reloadFont(font)
+        font.setGlyphOrder(previous.getGlyphOrder())
+        for tag in previous.keys():
+            if tag == "GlyphOrder" or tag in font:
+                continue
+            table = font[tag] = newTable(tag)
+            table.decompile(previous.getTableData(tag), font)
+        # these are computed from the features and the cmap, which are unchanged
+        os2 = font["OS/2"]
+        previousOS2 = previous["OS/2"]
+        os2.usMaxContext = previousOS2.usMaxContext
+        if getAttrWithFallback(ufo.info, "openTypeOS2UnicodeRanges") is None:
+            for i in range(1, 5):
+                attr = f"ulUnicodeRange{i}"
+                setattr(os2, attr, getattr(previousOS2, attr))
+        return font
+
+
+def _getLayoutData(glyph):
+    # the unicodes and anchors of the glyph, from which features are generated
+    return (
+        tuple(glyph.unicodes),
+        tuple((a.name, a.x, a.y) for a in glyph.anchors),
+    )
+
+
+class _GlyphSources(NamedTuple):
+    # the names of the glyphs in the source layer, and of those not exported
+    glyphNames: FrozenSet[str]
+    skipExportGlyphs: FrozenSet[str]
+    # the preprocessed glyph set (kept alive as long as the font), and the
+    # glyph order of the font before post-processing renames the glyphs
+    glyphSet: Dict[str, Any]
+    glyphOrder: List[str]
+    # the layout data of each glyph, see _getLayoutData()
+    layoutData: Dict[str, Tuple]
+
+    @classmethod
+    def fromGlyphSet(cls, layer, skipExportGlyphs, glyphOrder, glyphSet):
+        return cls(
+            frozenset(glyph.name for glyph in layer),
+            frozenset(skipExportGlyphs or ()),
+            glyphSet,
+            list(glyphOrder),
+            {glyphName: _getLayoutData(glyph) for glyphName, glyph in glyphSet.items()},
+        )
+
+
+# The _GlyphSources of the TTFonts returned by TTFCompiler.compile()
+_compiledSources = weakref.WeakKeyDictionary()
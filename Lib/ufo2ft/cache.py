@@ -0,0 +1,82 @@
+"""Persistent, content-addressed cache for compiled font data.
+
+Entries are stored on disk as pickle files, keyed by a hash of all the inputs
+that determine their value, so that repeated builds of the same sources can
+skip recomputing the data that did not change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any
+
+from fontTools import version as fontToolsVersion
+
+import ufo2ft
+
+logger = logging.getLogger(__name__)
+
+# bump this whenever the layout or the meaning of the cached data changes
+CACHE_FORMAT_VERSION = 1
+
+
+class DiskCache:
+    """Store picklable values in the `path` directory, grouped by `namespace`.
+
+    Keys are returned by the `makeKey` method, which hashes the given data
+    together with the cache format, ufo2ft and fontTools versions, so that
+    entries created by different versions are never mixed up.
+
+    NOTE: cached values are unpickled when read, thus the cache directory must
+    only be writable by trusted users.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], namespace: str) -> None:
+        self.path = os.path.join(os.fspath(path), namespace)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r})"
+
+    @staticmethod
+    def makeKey(*data: Any) -> str:
+        """Return a hex digest of the repr() of `data`.
+
+        The data must only contain objects with a stable repr(), i.e. built-in
+        types like str, numbers, tuples, lists or dicts.
+        """
+        data = (CACHE_FORMAT_VERSION, ufo2ft.__version__, fontToolsVersion, data)
+        return hashlib.sha256(repr(data).encode("utf-8")).hexdigest()
+
+    def _entryPath(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key[2:])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value stored for `key`, or `default` if none."""
+        try:
+            with open(self._entryPath(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            logger.warning("Ignoring invalid cache entry %s: %s", key, e)
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` for `key`, replacing any existing entry."""
+        path = self._entryPath(key)
+        dirname = os.path.dirname(path)
+        os.makedirs(dirname, exist_ok=True)
+        # write to a temporary file first and then rename it, so that concurrent
+        # builds sharing the same cache never read partially written entries
+        fd, tmp = tempfile.mkstemp(dir=dirname)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
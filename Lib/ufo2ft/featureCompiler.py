@@ -10,11 +10,15 @@ from tempfile import NamedTemporaryFile
 
 from fontTools import mtiLib
 from fontTools.designspaceLib import DesignSpaceDocument, SourceDescriptor
-from fontTools.feaLib.builder import addOpenTypeFeaturesFromString
+from fontTools.feaLib.builder import Builder, addOpenTypeFeaturesFromString
 from fontTools.feaLib.error import FeatureLibError, IncludedFeaNotFound
 from fontTools.feaLib.parser import Parser
 from fontTools.misc.loggingTools import Timer
+from fontTools.otlLib.maxContextCalc import maxCtxFont
+from fontTools.ttLib import newTable
+from fontTools.ttLib.tables import otTables
 
+from ufo2ft.cache import DiskCache
 from ufo2ft.constants import MTI_FEATURES_PREFIX
 from ufo2ft.featureWriters import (
     CursFeatureWriter,
@@ -30,6 +34,12 @@ from ufo2ft.util import describe_ufo
 logger = logging.getLogger(__name__)
 timer = Timer(logging.getLogger("ufo2ft.timer"), level=logging.DEBUG)
 
+CACHE_NAMESPACE = "features"
+
+# the tables built by feaLib from the features alone, which can be cached; the
+# others (e.g. 'name' or 'OS/2') are updated rather than built from scratch
+CACHED_TABLES = ("BASE", "GDEF", "GPOS", "GSUB")
+
 
 def parseLayoutFeatures(font, includeDir=None):
     """Parse OpenType layout features in the UFO and return a
@@ -169,6 +179,17 @@ def _deprecateMethod(arg, repl):
 class FeatureCompiler(BaseFeatureCompiler):
     """Generate automatic features and compile OpenType tables from Adobe
     Feature File stored in the UFO, using fontTools.feaLib as compiler.
+
+    When feature writers are used, the OpenType tables are built directly from
+    the feaLib AST which the writers extended (the ``featureFile`` attribute);
+    the ``features`` string is only generated from it when needed, e.g. for
+    writing a debug feature file or for reporting compilation errors.
+
+    If a ``cacheDir`` is set, the compiled tables are stored there, keyed by a
+    hash of the features generated by the writers, the glyph order and the
+    fontTools config of the TTFont, and reused without running feaLib when
+    these did not change. Only then is the ``features`` string always generated,
+    once, and it is reused for the debug feature file.
     """
 
     defaultFeatureWriters = [
@@ -186,6 +207,7 @@ class FeatureCompiler(BaseFeatureCompiler):
         featureWriters=None,
         feaIncludeDir=None,
         extraSubstitutions=None,
+        cacheDir=None,
         **kwargs,
     ):
         """
@@ -210,11 +232,14 @@ class FeatureCompiler(BaseFeatureCompiler):
           feaIncludeDir: a directory to be used as the include directory for
             the feature file. If None, the include directory is set to the
             parent directory of the UFO, provided the UFO has a path.
+          cacheDir: a directory where the compiled layout tables are cached.
+            If None (default), no cache is used.
         """
         BaseFeatureCompiler.__init__(
             self, ufo, ttFont, glyphSet, extraSubstitutions=extraSubstitutions
         )
         self.feaIncludeDir = feaIncludeDir
+        self.featureCache = DiskCache(cacheDir, CACHE_NAMESPACE) if cacheDir else None
 
         self.initFeatureWriters(featureWriters)
 
@@ -318,12 +343,36 @@ class FeatureCompiler(BaseFeatureCompiler):
                             self._write_temporary_feature_file(featureFile.asFea())
                         raise
 
-                # stringify AST to get correct line numbers in error messages
-                self.features = featureFile.asFea()
+                self.setFeatureFile(featureFile)
             else:
                 # no featureWriters, simply read existing features' text
                 self.features = self.ufo.features.text or ""
 
+    def setFeatureFile(self, featureFile):
+        """Set the feaLib AST from which the OpenType tables are built."""
+        self.featureFile = featureFile
+        self._features = None
+
+    @property
+    def features(self):
+        """The features source as a string.
+
+        If the features were set up as a feaLib AST, this is generated from the
+        AST when first accessed.
+        """
+        features = self.__dict__.get("_features")
+        if features is None:
+            featureFile = self.__dict__.get("featureFile")
+            if featureFile is None:
+                raise AttributeError("features")
+            features = self._features = featureFile.asFea()
+        return features
+
+    @features.setter
+    def features(self, features):
+        self.featureFile = None
+        self._features = features
+
     def writeFeatures(self, outfile):
         if hasattr(self, "features"):
             outfile.write(self.features)
@@ -338,6 +387,30 @@ class FeatureCompiler(BaseFeatureCompiler):
         in a different way if desired.
         """
 
+        featureFile = getattr(self, "featureFile", None)
+        if featureFile is not None:
+            if not featureFile.statements:
+                return
+            cacheKey = self._makeCacheKey(featureFile)
+            if cacheKey is not None:
+                tables = self.featureCache.get(cacheKey)
+                if tables is not None:
+                    with timer("load cached OpenType features"):
+                        self._loadTables(tables)
+                    return
+            with timer("build OpenType features"):
+                try:
+                    _addOpenTypeFeatures(self.ttFont, featureFile)
+                except FeatureLibError as e:
+                    # the statements generated by the feature writers have no
+                    # location, build again from the stringified AST to get the
+                    # correct line numbers in the error message
+                    logger.debug("Failed to build features from AST: %s", e)
+                else:
+                    if cacheKey is not None:
+                        self.featureCache.set(cacheKey, self._compileTables())
+                    return
+
         if not self.features:
             return
 
@@ -353,6 +426,35 @@ class FeatureCompiler(BaseFeatureCompiler):
                     self._write_temporary_feature_file(self.features)
                 raise
 
+    def _makeCacheKey(self, featureFile):
+        # Return the key of the compiled tables in the cache, or None if there is
+        # no cache or the features also modify tables that are not cached. The
+        # features are only stringified here when there is a cache, and the
+        # text is kept in self.features for writeFeatures and error reporting.
+        if self.featureCache is None or not _onlyBuildsCachedTables(featureFile):
+            return None
+        return self.featureCache.makeKey(
+            self.features,
+            self.ttFont.getGlyphOrder(),
+            sorted(self.ttFont.cfg.items()),
+        )
+
+    def _compileTables(self):
+        return {
+            tag: self.ttFont.getTableData(tag)
+            for tag in CACHED_TABLES
+            if tag in self.ttFont
+        }
+
+    def _loadTables(self, tables):
+        for tag, data in tables.items():
+            table = newTable(tag)
+            table.decompile(data, self.ttFont)
+            self.ttFont[tag] = table
+        # this is normally computed by feaLib's Builder from the layout tables
+        if "OS/2" in self.ttFont:
+            self.ttFont["OS/2"].usMaxContext = maxCtxFont(self.ttFont)
+
     def _write_temporary_feature_file(self, features: str) -> None:
         # if compilation fails, create temporary file for inspection
         data = features.encode("utf-8")
@@ -361,6 +463,63 @@ class FeatureCompiler(BaseFeatureCompiler):
         logger.error("Compilation failed! Inspect temporary file: %r", tmp.name)
 
 
+def _addOpenTypeFeatures(ttFont, featureFile):
+    # Like feaLib's addOpenTypeFeatures, but the lookups declared with the
+    # 'useExtension' keyword are built as extension lookups, e.g. the large
+    # lookups generated by the kern feature writer, whose subtables may be too
+    # far apart to be referenced by 16-bit offsets. feaLib ignores the keyword,
+    # and leaves them to the slow overflow resolution of the fontTools compiler.
+    builder = Builder(ttFont, featureFile)
+    builder.build()
+    extensionNames = set(_iterExtensionLookupNames(featureFile))
+    if not extensionNames:
+        return
+    for tableTag, lookupInfos in builder.lookup_locations.items():
+        if tableTag not in ttFont:
+            continue
+        lookups = ttFont[tableTag].table.LookupList.Lookup
+        for lookupIndex, info in lookupInfos.items():
+            if info.name in extensionNames:
+                _makeExtensionLookup(tableTag, lookups[int(lookupIndex)])
+
+
+def _iterExtensionLookupNames(block):
+    for statement in block.statements:
+        if isinstance(statement, ast.LookupBlock) and statement.use_extension:
+            yield statement.name
+        if isinstance(statement, ast.Block):
+            yield from _iterExtensionLookupNames(statement)
+
+
+def _makeExtensionLookup(tableTag, lookup):
+    extType = 7 if tableTag == "GSUB" else 9
+    if lookup.LookupType == extType:
+        return
+    extSubTableClass = otTables.lookupTypes[tableTag][extType]
+    for i, subTable in enumerate(lookup.SubTable):
+        extSubTable = extSubTableClass()
+        extSubTable.Format = 1
+        extSubTable.ExtSubTable = subTable
+        lookup.SubTable[i] = extSubTable
+    lookup.LookupType = extType
+
+
+def _onlyBuildsCachedTables(block):
+    # name records (e.g. 'featureNames' or 'cvParameters') are added to the
+    # 'name' table, and the other table blocks update tables like 'OS/2' or
+    # 'head' which also hold data not coming from the features
+    for statement in block.statements:
+        if isinstance(statement, ast.NameRecord):
+            return False
+        if isinstance(statement, ast.TableBlock):
+            if statement.name not in CACHED_TABLES:
+                return False
+        elif isinstance(statement, ast.Block):
+            if not _onlyBuildsCachedTables(statement):
+                return False
+    return True
+
+
 class MtiFeatureCompiler(BaseFeatureCompiler):
     """Compile OpenType layout tables from MTI feature files using
     fontTools.mtiLib.
@@ -438,7 +597,9 @@ class VariableFeatureCompiler(FeatureCompiler):
             for writer in self.featureWriters:
                 writer.write(self.designspace, featureFile, compiler=self)
 
-            # stringify AST to get correct line numbers in error messages
+            # feaLib replaces the variable anchors in the AST with their default
+            # values while building the tables, so stringify it beforehand; this
+            # also gets correct line numbers in error messages
             self.features = featureFile.asFea()
         else:
             # no featureWriters, simply read existing features' text
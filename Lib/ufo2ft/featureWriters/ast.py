@@ -135,8 +135,9 @@ def makeGlyphClassDefinitions(groups, feaFile=None, stripPrefix=""):
 
 
 def makeGlyphClassDefinition(className, members):
-    glyphNames = [ast.GlyphName(g) for g in members]
-    glyphClass = ast.GlyphClass(glyphNames)
+    # like feaLib's parser, store glyph class members as plain glyph names so
+    # the AST can be compiled directly by the feaLib Builder
+    glyphClass = ast.GlyphClass(list(members))
     classDef = ast.GlyphClassDefinition(className, glyphClass)
     return classDef
 
@@ -1,5 +1,6 @@
 import logging
 from collections import OrderedDict
+from functools import partial
 from types import SimpleNamespace
 
 from fontTools.designspaceLib import DesignSpaceDocument
@@ -19,6 +20,14 @@ from ufo2ft.util import (
 INSERT_FEATURE_MARKER = r"\s*# Automatic Code.*"
 
 
+def _sameStatements(fingerprint, other):
+    # feaLib AST elements are compared by identity
+    return len(fingerprint) == len(other) and all(
+        (a[0] is b[0] and a[1] == b[1]) if isinstance(a, tuple) else a is b
+        for a, b in zip(fingerprint, other)
+    )
+
+
 class BaseFeatureWriter:
     """Abstract features writer.
 
@@ -284,8 +293,41 @@ class BaseFeatureWriter:
                     insertComments[block.name] = (block, comment)
         return insertComments
 
+    def _getAnalysis(self, key, func, *statementTypes):
+        """Return the result of calling `func`, which analyses the current font
+        and feature file.
+
+        When this writer runs in the context of a FeatureCompiler, the result is
+        cached in the compiler under `key` and shared by all its writers. The
+        cached result is reused until the feature file changes in a way that can
+        affect it, i.e. if the top-level statements of any of the given
+        `statementTypes` are added, removed or (for blocks) extended.
+
+        Since the same object is returned to all the writers, the result must
+        either be immutable or be copied by the caller before handing it out.
+        """
+        compiler = self.context.compiler
+        if compiler is None:
+            return func()
+        feaFile = self.context.feaFile
+        fingerprint = (feaFile,) + tuple(
+            (st, len(st.statements)) if isinstance(st, ast.Block) else st
+            for st in feaFile.statements
+            if isinstance(st, statementTypes)
+        )
+        cache = compiler.__dict__.setdefault("_analysisCache", {})
+        entry = cache.get(key)
+        if entry is not None and _sameStatements(entry[0], fingerprint):
+            return entry[1]
+        result = func()
+        cache[key] = (fingerprint, result)
+        return result
+
     def makeUnicodeToGlyphNameMapping(self):
         """Return the Unicode to glyph name mapping for the current font."""
+        return dict(self._getAnalysis("cmap", self._makeUnicodeToGlyphNameMapping))
+
+    def _makeUnicodeToGlyphNameMapping(self):
         # Try to get the "best" Unicode cmap subtable if this writer is running
         # in the context of a FeatureCompiler, else create a new mapping from
         # the UFO glyphs
@@ -356,7 +398,9 @@ class BaseFeatureWriter:
     def getOpenTypeCategories(self):
         """Return 'public.openTypeCategories' values as a tuple of sets of
         unassigned, bases, ligatures, marks, components."""
-        return OpenTypeCategories.load(self.context.font)
+        return self._getAnalysis(
+            "openTypeCategories", partial(OpenTypeCategories.load, self.context.font)
+        )
 
     def getGDEFGlyphClasses(self):
         """Return a tuple of GDEF GlyphClassDef base, ligature, mark, component
@@ -364,6 +408,11 @@ class BaseFeatureWriter:
         Sets are `None` if no 'public.openTypeCategories' values are defined or
         if no GDEF table is defined in the feature file.
         """
+        return self._getAnalysis(
+            "gdefGlyphClasses", self._getGDEFGlyphClasses, ast.TableBlock
+        )
+
+    def _getGDEFGlyphClasses(self):
         feaFile = self.context.feaFile
 
         if ast.findTable(feaFile, "GDEF") is not None:
@@ -391,9 +440,14 @@ class BaseFeatureWriter:
            (Thaa) but not U+061F ARABIC QUESTION MARK (multiple scripts).
         2. Adding explicitly declared `languagesystem` scripts on top.
         """
+        scripts = self._getAnalysis(
+            "fontScripts", self._guessFontScripts, ast.LanguageSystemStatement
+        )
+        return set(scripts)
+
+    def _guessFontScripts(self):
         font = self.context.font
         glyphSet = self.context.glyphSet
-        feaFile = self.context.feaFile
         single_scripts = set()
 
         # If we're dealing with a Designspace, look at the default source.
@@ -410,34 +464,31 @@ class BaseFeatureWriter:
                     single_scripts.update(scripts)
 
         # Then, add explicitly declared languagesystems on top.
-        feaScripts = ast.getScriptLanguageSystems(feaFile)
+        feaScripts = self.getScriptLanguageSystems()
         single_scripts.update(feaScripts.keys())
 
         return single_scripts
 
+    def getScriptLanguageSystems(self, excludeDflt=True):
+        """Return the `languagesystem` statements of the feature file, like the
+        `ast.getScriptLanguageSystems` function.
+        """
+        langSysMap = self._getAnalysis(
+            ("scriptLanguageSystems", excludeDflt),
+            partial(ast.getScriptLanguageSystems, self.context.feaFile, excludeDflt),
+            ast.LanguageSystemStatement,
+        )
+        return OrderedDict(
+            (sc, [(script, list(languages)) for script, languages in langSyses])
+            for sc, langSyses in langSysMap.items()
+        )
+
     def _getAnchor(self, glyphName, anchorName, anchor=None):
         if self.context.isVariable:
-            designspace = self.context.font
-            x_value = VariableScalar()
-            y_value = VariableScalar()
-            found = False
-            for source in designspace.sources:
-                if source.layerName is None:
-                    layer = source.font
-                else:
-                    layer = source.font.layers[source.layerName]
-                if glyphName not in layer:
-                    continue
-                glyph = layer[glyphName]
-                for anchor in glyph.anchors:
-                    if anchor.name == anchorName:
-                        location = get_userspace_location(designspace, source.location)
-                        x_value.add_value(location, otRound(anchor.x))
-                        y_value.add_value(location, otRound(anchor.y))
-                        found = True
-            if not found:
+            anchors = self._getVariableAnchors().get(glyphName)
+            if not anchors or anchorName not in anchors:
                 return None
-            x, y = collapse_varscalar(x_value), collapse_varscalar(y_value)
+            x, y = anchors[anchorName]
         else:
             if anchor is None:
                 if glyphName not in self.context.font:
@@ -456,3 +507,50 @@ class BaseFeatureWriter:
                 x = quantize(x, self.options.quantization)
                 y = quantize(y, self.options.quantization)
         return x, y
+
+    def _getVariableAnchors(self):
+        """Return a dictionary mapping glyph names to dictionaries of the
+        (x, y) coordinates of their anchors keyed by anchor name, the coordinates
+        being variable scalars when they differ across the designspace sources.
+
+        The index is built from all the sources once for all the writers of the
+        same compiler, and each writer gets its own copy.
+        """
+        anchors = getattr(self.context, "variableAnchors", None)
+        if anchors is None:
+            anchors = self._getAnalysis("variableAnchors", self._makeVariableAnchors)
+            anchors = self.context.variableAnchors = {
+                glyphName: dict(glyphAnchors)
+                for glyphName, glyphAnchors in anchors.items()
+            }
+        return anchors
+
+    def _makeVariableAnchors(self):
+        designspace = self.context.font
+        # glyph name => anchor name => (x, y) VariableScalars
+        values = {}
+        for source in designspace.sources:
+            if source.layerName is None:
+                layer = source.font
+            else:
+                layer = source.font.layers[source.layerName]
+            location = None
+            for glyph in layer:
+                if not glyph.anchors:
+                    continue
+                if location is None:
+                    location = get_userspace_location(designspace, source.location)
+                glyphValues = values.setdefault(glyph.name, {})
+                for anchor in glyph.anchors:
+                    x_value, y_value = glyphValues.setdefault(
+                        anchor.name, (VariableScalar(), VariableScalar())
+                    )
+                    x_value.add_value(location, otRound(anchor.x))
+                    y_value.add_value(location, otRound(anchor.y))
+        return {
+            glyphName: {
+                anchorName: (collapse_varscalar(x_value), collapse_varscalar(y_value))
+                for anchorName, (x_value, y_value) in glyphValues.items()
+            }
+            for glyphName, glyphValues in values.items()
+        }
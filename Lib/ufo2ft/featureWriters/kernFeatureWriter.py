@@ -10,7 +10,6 @@ from fontTools import unicodedata
 from fontTools.designspaceLib import DesignSpaceDocument
 from fontTools.feaLib.variableScalar import Location as VariableScalarLocation
 from fontTools.feaLib.variableScalar import VariableScalar
-from fontTools.ufoLib.kerning import lookupKerningValue
 from fontTools.unicodedata import script_horizontal_direction
 
 from ufo2ft.constants import COMMON_SCRIPT, INDIC_SCRIPTS, USE_SCRIPTS
@@ -22,6 +21,7 @@ from ufo2ft.util import (
     describe_ufo,
     get_userspace_location,
     quantize,
+    unicodeBidiType,
     unicodeScriptExtensions,
 )
 
@@ -39,25 +39,13 @@ SIDE2_PREFIX = "public.kern2."
 # `hb_ot_shape_complex_categorize` in src/hb-ot-shape-complex-private.hh
 DIST_ENABLED_SCRIPTS = set(INDIC_SCRIPTS) | set(["Khmr", "Mymr"]) | set(USE_SCRIPTS)
 
-RTL_BIDI_TYPES = {"R", "AL"}
-LTR_BIDI_TYPES = {"L", "AN", "EN"}
 AMBIGUOUS_BIDIS = {"R", "L"}
 COMMON_SCRIPTS_SET = {COMMON_SCRIPT}
 COMMON_CLASS_NAME = "Default"
 
-
-def unicodeBidiType(uv):
-    """Return "R" for characters with RTL direction, or "L" for LTR (whether
-    'strong' or 'weak'), or None for neutral direction.
-    """
-    char = chr(uv)
-    bidiType = unicodedata.bidirectional(char)
-    if bidiType in RTL_BIDI_TYPES:
-        return "R"
-    elif bidiType in LTR_BIDI_TYPES:
-        return "L"
-    else:
-        return None
+# The offsets to the PairPos subtables and within them are 16-bit; the sizes
+# are only estimated, so leave some room for the estimation error.
+MAX_PAIRPOS_SIZE = 0xF000
 
 
 def script_direction(script: str) -> str:
@@ -244,7 +232,7 @@ class KernFeatureWriter(BaseFeatureWriter):
         # generated kerning needs to be registered for the script's `dflt`
         # language, but also all those the designer defined manually. Otherwise,
         # setting any language for a script would deactivate kerning.
-        feaLanguagesByScript = ast.getScriptLanguageSystems(feaFile, excludeDflt=False)
+        feaLanguagesByScript = self.getScriptLanguageSystems(excludeDflt=False)
         ctx.feaLanguagesByScript = {
             otTag: languages
             for _, languageSystems in feaLanguagesByScript.items()
@@ -451,7 +439,6 @@ class KernFeatureWriter(BaseFeatureWriter):
         # Gather utility variables for faster kerning lookups.
         # TODO: Do we construct these in code elsewhere?
         assert not (set(side1Classes) & set(side2Classes))
-        unified_groups = {**side1Classes, **side2Classes}
 
         glyphToFirstGroup = {
             glyph_name: group_name  # TODO: Is this overwrite safe? User input is adversarial
@@ -477,64 +464,61 @@ class KernFeatureWriter(BaseFeatureWriter):
         #           Always interpolate from other locations, ignoring more
         #           general pairs that this one excepts.
         # See discussion: https://github.com/googlefonts/ufo2ft/pull/635
-        all_pairs: set[tuple[str, str]] = set()
-        for source in designspace.sources:
-            if source.layerName is not None:
-                continue
+        # Skip sparse sources, because they can have no kerning. Copy the kerning
+        # of the other sources to plain dicts, which are faster to look up.
+        sources = [s for s in designspace.sources if s.layerName is None]
+        kernings: list[dict[tuple[str, str], float]] = []
+        for source in sources:
             assert source.font is not None
-            all_pairs |= set(source.font.kerning)
+            kernings.append(dict(source.font.kerning))
+        all_pairs: set[tuple[str, str]] = set().union(*kernings)
+
+        # Index the kerning pairs: resolve once for all sources the keys to look
+        # up for each pair, following the glyph and group fallbacks of
+        # fontTools.ufoLib's `lookupKerningValue`.
+        kerning_lookups: dict[tuple[str, str], tuple[tuple[str, str], ...]] = {}
+        for pair in all_pairs:
+            side1, side2 = pair
+            # Filter out pairs that reference missing groups or glyphs.
+            if side1 not in side1Classes and side1 not in glyphSet:
+                continue
+            if side2 not in side2Classes and side2 not in glyphSet:
+                continue
+            kerning_lookups[pair] = _kerningLookupKeys(
+                pair, glyphToFirstGroup, glyphToSecondGroup
+            )
 
+        locations = [
+            VariableScalarLocation(get_userspace_location(designspace, s.location))
+            for s in sources
+        ]
         kerning_pairs_in_progress: dict[
             tuple[str | tuple[str], str | tuple[str]], VariableScalar
         ] = {}
-        for source in designspace.sources:
-            # Skip sparse sources, because they can have no kerning.
-            if source.layerName is not None:
-                continue
-            assert source.font is not None
-
-            location = VariableScalarLocation(
-                get_userspace_location(designspace, source.location)
-            )
-
-            kerning: Mapping[tuple[str, str], float] = source.font.kerning
-            for pair in all_pairs:
-                side1, side2 = pair
-                firstIsClass = side1 in side1Classes
-                secondIsClass = side2 in side2Classes
-
-                # Filter out pairs that reference missing groups or glyphs.
-                # TODO: Can we do this outside of the loop? We know the pairs already.
-                if not firstIsClass and side1 not in glyphSet:
-                    continue
-                if not secondIsClass and side2 not in glyphSet:
-                    continue
-
-                # Get the kerning value for this source and quantize, following
-                # the DS+UFO semantics described above.
-                value = quantize(
-                    lookupKerningValue(
-                        pair,
-                        kerning,
-                        unified_groups,
-                        glyphToFirstGroup=glyphToFirstGroup,
-                        glyphToSecondGroup=glyphToSecondGroup,
-                    ),
-                    quantization,
-                )
+        for (side1, side2), lookup_keys in kerning_lookups.items():
+            # Get the kerning value for each source and quantize, following the
+            # DS+UFO semantics described above.
+            values = {}
+            for location, kerning in zip(locations, kernings):
+                for key in lookup_keys:
+                    if key in kerning:
+                        value = kerning[key]
+                        break
+                else:
+                    value = 0
+                values[location] = quantize(value, quantization)
 
-                if firstIsClass:
-                    side1 = side1Classes[side1]
-                if secondIsClass:
-                    side2 = side2Classes[side2]
+            if side1 in side1Classes:
+                side1 = side1Classes[side1]
+            if side2 in side2Classes:
+                side2 = side2Classes[side2]
 
-                # TODO: Can we instantiate these outside of the loop? We know the pairs already.
-                var_scalar = kerning_pairs_in_progress.setdefault(
-                    (side1, side2), VariableScalar()
-                )
-                # NOTE: Avoid using .add_value because it instantiates a new
-                # VariableScalarLocation on each call.
-                var_scalar.values[location] = value
+            var_scalar = kerning_pairs_in_progress.setdefault(
+                (side1, side2), VariableScalar()
+            )
+            # NOTE: Avoid using .add_value because it instantiates a new
+            # VariableScalarLocation on each call.
+            var_scalar.values.update(values)
 
         # We may need to provide a default location value to the variation
         # model, find out where that is.
@@ -745,6 +729,7 @@ class KernFeatureWriter(BaseFeatureWriter):
                     pair, side1Classes, side2Classes, pairIsRtl
                 )
                 lookup.statements.append(rule)
+            splitLargeKerningLookup(lookup)
             for script in scripts:
                 lookups.setdefault(script, {})[lookupName] = lookup
 
@@ -846,13 +831,42 @@ class KernFeatureWriter(BaseFeatureWriter):
                 )
 
 
+def _kerningLookupKeys(pair, glyphToFirstGroup, glyphToSecondGroup):
+    """Return the kerning pairs, without duplicates, that fontTools.ufoLib's
+    `lookupKerningValue` looks up in order to find the value of the given `pair`.
+    """
+    first, second = pair
+    if first.startswith(SIDE1_PREFIX):
+        firstGroup = first
+        first = None
+    else:
+        firstGroup = glyphToFirstGroup.get(first)
+    if second.startswith(SIDE2_PREFIX):
+        secondGroup = second
+        second = None
+    else:
+        secondGroup = glyphToSecondGroup.get(second)
+    keys = [pair]
+    for key in (
+        (first, second),
+        (first, secondGroup),
+        (firstGroup, second),
+        (firstGroup, secondGroup),
+    ):
+        if None not in key and key not in keys:
+            keys.append(key)
+    return tuple(keys)
+
+
 def splitKerning(pairs, glyphScripts):
     # Split kerning into per-script buckets, so we can post-process them before
     # continuing. Scripts that have cross-script kerning pairs will be put in
     # the same bucket.
     kerningPerScript = {}
+    # the same classes are used by many pairs, only partition them once
+    sideCache = {}
     for pair in pairs:
-        for scripts, splitPair in partitionByScript(pair, glyphScripts):
+        for scripts, splitPair in partitionByScript(pair, glyphScripts, sideCache):
             scripts = tuple(sorted(scripts))
             kerningPerScript.setdefault(scripts, []).append(splitPair)
 
@@ -872,58 +886,27 @@ def splitKerning(pairs, glyphScripts):
 def partitionByScript(
     pair: KerningPair,
     glyphScripts: Mapping[str, set[str]],
+    sideCache: dict[str | tuple[str, ...], dict] | None = None,
 ) -> Iterator[tuple[str, KerningPair]]:
     """Split a potentially mixed-script pair into pairs that make sense based
-    on the dominant script, and yield each combination with its dominant script."""
+    on the dominant script, and yield each combination with its dominant script.
 
-    side1Directions: dict[str, set[str]] = {}
-    side2Directions: dict[str, set[str]] = {}
-    resolvedScripts: dict[str, set[str]] = {}
-    for glyph in pair.firstGlyphs:
-        scripts = glyphScripts.get(glyph, DFLT_SCRIPTS)
-        # If a glyph is both common or inherited *and* another script, treat it
-        # as just common (throwing Zyyy and Zinh into the same bucket for
-        # simplicity). This ensures that a pair appears to the shaper exactly
-        # once, as long as every script sees at most 2 lookups (or 3 with mark
-        # lookups, but they contain distinct pairs), the common one and the
-        # script-specific one.
-        if scripts & DFLT_SCRIPTS:
-            scripts = COMMON_SCRIPTS_SET
-        resolvedScripts[glyph] = scripts
-        for direction in (script_direction(script) for script in sorted(scripts)):
-            side1Directions.setdefault(direction, set()).add(glyph)
-    for glyph in pair.secondGlyphs:
-        scripts = glyphScripts.get(glyph, DFLT_SCRIPTS)
-        if scripts & DFLT_SCRIPTS:
-            scripts = COMMON_SCRIPTS_SET
-        resolvedScripts[glyph] = scripts
-        for direction in (script_direction(script) for script in sorted(scripts)):
-            side2Directions.setdefault(direction, set()).add(glyph)
+    The optional `sideCache` dictionary stores the partition of each side of the
+    pair, to be reused for other pairs with the same glyphs or classes.
+    """
+    if sideCache is None:
+        sideCache = {}
+    sideDirections = []
+    for side in (pair.side1, pair.side2):
+        directions = sideCache.get(side)
+        if directions is None:
+            directions = sideCache[side] = partitionSideByDirection(side, glyphScripts)
+        sideDirections.append(directions)
+    side1Directions, side2Directions = sideDirections
 
     for side1Direction, side2Direction in itertools.product(
         side1Directions, side2Directions
     ):
-        localSide1: str | tuple[str, ...]
-        localSide2: str | tuple[str, ...]
-        side1Scripts: set[str] = set()
-        side2Scripts: set[str] = set()
-        if pair.firstIsClass:
-            localSide1 = tuple(sorted(side1Directions[side1Direction]))
-            for glyph in localSide1:
-                side1Scripts |= resolvedScripts[glyph]
-        else:
-            assert len(side1Directions[side1Direction]) == 1
-            (localSide1,) = side1Directions[side1Direction]
-            side1Scripts |= resolvedScripts[localSide1]
-        if pair.secondIsClass:
-            localSide2 = tuple(sorted(side2Directions[side2Direction]))
-            for glyph in localSide2:
-                side2Scripts |= resolvedScripts[glyph]
-        else:
-            assert len(side2Directions[side2Direction]) == 1
-            (localSide2,) = side2Directions[side2Direction]
-            side2Scripts |= resolvedScripts[localSide2]
-
         # Skip pairs with mixed direction.
         if side1Direction != side2Direction and not any(
             side == "Auto" for side in (side1Direction, side2Direction)
@@ -938,6 +921,8 @@ def partitionByScript(
             )
             continue
 
+        localSide1, side1Scripts = side1Directions[side1Direction]
+        localSide2, side2Scripts = side2Directions[side2Direction]
         scripts = side1Scripts | side2Scripts
         # If only one side has Common, drop it
         if not all(side & COMMON_SCRIPTS_SET for side in (side1Scripts, side2Scripts)):
@@ -950,39 +935,183 @@ def partitionByScript(
         )
 
 
+def partitionSideByDirection(
+    side: str | tuple[str, ...],
+    glyphScripts: Mapping[str, set[str]],
+) -> dict[str, tuple[str | tuple[str, ...], frozenset[str]]]:
+    """Split one side of a kerning pair, i.e. a glyph name or a class (tuple of
+    glyph names), by the direction of its glyphs' scripts.
+
+    Return a dictionary mapping each direction to the glyph or the sub-class in
+    that direction and the set of the scripts of its glyphs.
+    """
+    isClass = isinstance(side, tuple)
+    directions: dict[str, set[str]] = {}
+    resolvedScripts: dict[str, set[str]] = {}
+    for glyph in side if isClass else (side,):
+        scripts = glyphScripts.get(glyph, DFLT_SCRIPTS)
+        # If a glyph is both common or inherited *and* another script, treat it
+        # as just common (throwing Zyyy and Zinh into the same bucket for
+        # simplicity). This ensures that a pair appears to the shaper exactly
+        # once, as long as every script sees at most 2 lookups (or 3 with mark
+        # lookups, but they contain distinct pairs), the common one and the
+        # script-specific one.
+        if scripts & DFLT_SCRIPTS:
+            scripts = COMMON_SCRIPTS_SET
+        resolvedScripts[glyph] = scripts
+        for direction in (script_direction(script) for script in sorted(scripts)):
+            directions.setdefault(direction, set()).add(glyph)
+
+    result = {}
+    for direction, glyphs in directions.items():
+        localSide: str | tuple[str, ...]
+        if isClass:
+            localSide = tuple(sorted(glyphs))
+        else:
+            assert len(glyphs) == 1
+            (localSide,) = glyphs
+        scripts = frozenset().union(*(resolvedScripts[glyph] for glyph in glyphs))
+        result[direction] = (localSide, scripts)
+    return result
+
+
 def mergeScripts(kerningPerScript):
     """Merge buckets that have common scripts. If we have [A, B], [B, C], and
     [D] buckets, we want to merge the first two into [A, B, C] and leave [D] so
     that all kerning pairs of the three scripts are in the same lookup."""
-    sets = [set(scripts) for scripts in kerningPerScript if scripts]
-    merged = True
-    while merged:
-        merged = False
-        result = []
-        while sets:
-            common, rest = sets[0], sets[1:]
-            sets = []
-            for scripts in rest:
-                if scripts.isdisjoint(common):
-                    sets.append(scripts)
-                else:
-                    merged = True
-                    common |= scripts
-            result.append(common)
-        sets = result
+    # Union-find: map each script to another script of the same merged bucket,
+    # the root of the bucket mapping to itself.
+    parents = {}
+
+    def find(script):
+        root = parents.setdefault(script, script)
+        while root != parents[root]:
+            root = parents[root]
+        # compress the path to the root
+        while script != root:
+            script, parents[script] = parents[script], root
+        return root
+
+    for scripts in kerningPerScript:
+        for script in scripts[1:]:
+            root1, root2 = find(scripts[0]), find(script)
+            if root1 != root2:
+                parents[root2] = root1
 
     # Now that we have merged all common-script buckets, we need to re-assign
-    # the kerning pairs to the new buckets.
-    result = {tuple(sorted(scripts)): [] for scripts in sets}
+    # the kerning pairs to the new buckets, in the order they are first found.
+    buckets = {}
     for scripts, pairs in kerningPerScript.items():
-        for scripts2 in sets:
-            if scripts2 & set(scripts):
-                result[tuple(sorted(scripts2))].extend(pairs)
-                break
-        else:
+        if not scripts:
             # Shouldn't happen, but just in case.
             raise AssertionError
-    return result
+        bucket = buckets.setdefault(find(scripts[0]), ([], set()))
+        bucket[0].extend(pairs)
+        bucket[1].update(scripts)
+    return {tuple(sorted(scripts)): pairs for pairs, scripts in buckets.values()}
+
+
+def splitLargeKerningLookup(lookup, maxSize=MAX_PAIRPOS_SIZE):
+    """Add `subtable;` breaks between the class-to-class pairs of a kerning
+    lookup (feaLib LookupBlock) so that the estimated size of each class-based
+    PairPos subtable stays below `maxSize` bytes, and make it an extension
+    lookup if the estimated size of all its subtables exceeds it.
+
+    This way the offsets in the compiled GPOS table don't overflow, which the
+    fontTools compiler would otherwise resolve by splitting the subtables or
+    promoting the lookups to extensions and compiling the table again, over and
+    over. The breaks are only added before a pair with a different first class
+    than the previous pair, as a first glyph matched in a subtable hides the
+    pairs in the following ones.
+
+    Return the estimated size of all the lookup's subtables.
+    """
+    # the glyph-to-glyph pairs, also from enumerated pairs, are built into
+    # format 1 subtables, which can't be split with subtable breaks
+    glyphPairs: dict[str, int] = {}
+    glyphPairsSize = 0
+    subtable = _ClassPairPosSize()
+    totalSize = 0
+    statements = []
+    for st in lookup.statements:
+        if isinstance(st, ast.SubtableStatement):
+            totalSize += subtable.size
+            subtable = _ClassPairPosSize()
+        elif isinstance(st, ast.PairPosStatement):
+            recordSize = _valueRecordSize(st.valuerecord1)
+            if isinstance(st.glyphs1, ast.GlyphClassName) and not st.enumerated:
+                class1 = st.glyphs1.glyphclass.name
+                if class1 not in subtable.class1Sizes and subtable.class1Sizes:
+                    size = subtable.size
+                    subtable.add(st, recordSize)
+                    if subtable.size > maxSize:
+                        statements.append(ast.SubtableStatement())
+                        totalSize += size
+                        subtable = _ClassPairPosSize()
+                        subtable.add(st, recordSize)
+                else:
+                    subtable.add(st, recordSize)
+            else:
+                count2 = len(st.glyphs2.glyphSet())
+                for glyph in st.glyphs1.glyphSet():
+                    if glyph not in glyphPairs:
+                        # coverage, PairSet offset and count
+                        glyphPairsSize += 6
+                    glyphPairs[glyph] = glyphPairs.get(glyph, 0) + count2
+                    glyphPairsSize += count2 * (2 + recordSize)
+        statements.append(st)
+    lookup.statements = statements
+
+    totalSize += subtable.size
+    if glyphPairs:
+        totalSize += 14 + glyphPairsSize
+    if totalSize > maxSize:
+        lookup.use_extension = True
+    return totalSize
+
+
+class _ClassPairPosSize:
+    """Estimate the size of a class-based PairPos subtable."""
+
+    def __init__(self):
+        self.class1Sizes: dict[str, int] = {}
+        self.class2Sizes: dict[str, int] = {}
+        self.recordSize = 0
+
+    def add(self, st, recordSize):
+        self.class1Sizes[st.glyphs1.glyphclass.name] = len(st.glyphs1.glyphSet())
+        self.class2Sizes[st.glyphs2.glyphclass.name] = len(st.glyphs2.glyphSet())
+        self.recordSize = max(self.recordSize, recordSize)
+
+    @property
+    def size(self):
+        if not self.class1Sizes:
+            return 0
+        glyphs1 = sum(self.class1Sizes.values())
+        glyphs2 = sum(self.class2Sizes.values())
+        # header, coverage, class definitions and the class1 x class2 records,
+        # the second classes starting at 1
+        return (
+            16
+            + (4 + 2 * glyphs1)
+            + (6 + 2 * glyphs1)
+            + (6 + 2 * glyphs2)
+            + len(self.class1Sizes) * (len(self.class2Sizes) + 1) * self.recordSize
+        )
+
+
+def _valueRecordSize(valuerecord):
+    size = 0
+    for value in (
+        valuerecord.xPlacement,
+        valuerecord.yPlacement,
+        valuerecord.xAdvance,
+        valuerecord.yAdvance,
+    ):
+        if value is not None:
+            # plus the offset to the device table of variable values
+            size += 4 if isinstance(value, VariableScalar) else 2
+    return size
 
 
 def makeAllGlyphClassDefinitions(kerningPerScript, context, feaFile=None):
@@ -13,7 +13,12 @@ from ufo2ft.featureWriters import BaseFeatureWriter, ast
 from ufo2ft.featureWriters.kernFeatureWriter import (
     KernFeatureWriter as NewKernFeatureWriter,
 )
-from ufo2ft.util import classifyGlyphs, quantize, unicodeScriptDirection
+from ufo2ft.util import (
+    classifyGlyphs,
+    quantize,
+    unicodeBidiType,
+    unicodeScriptDirection,
+)
 
 SIDE1_PREFIX = "public.kern1."
 SIDE2_PREFIX = "public.kern2."
@@ -27,23 +32,6 @@ SIDE2_PREFIX = "public.kern2."
 # `hb_ot_shape_complex_categorize` in src/hb-ot-shape-complex-private.hh
 DIST_ENABLED_SCRIPTS = set(INDIC_SCRIPTS) | set(["Khmr", "Mymr"]) | set(USE_SCRIPTS)
 
-RTL_BIDI_TYPES = {"R", "AL"}
-LTR_BIDI_TYPES = {"L", "AN", "EN"}
-
-
-def unicodeBidiType(uv):
-    """Return "R" for characters with RTL direction, or "L" for LTR (whether
-    'strong' or 'weak'), or None for neutral direction.
-    """
-    char = chr(uv)
-    bidiType = unicodedata.bidirectional(char)
-    if bidiType in RTL_BIDI_TYPES:
-        return "R"
-    elif bidiType in LTR_BIDI_TYPES:
-        return "L"
-    else:
-        return None
-
 
 class KerningPair:
     __slots__ = ("side1", "side2", "value", "directions", "bidiTypes")
@@ -79,12 +67,12 @@ class KerningPair:
     def glyphs(self):
         if self.firstIsClass:
             classDef1 = self.side1.glyphclass
-            glyphs1 = {g.asFea() for g in classDef1.glyphSet()}
+            glyphs1 = set(classDef1.glyphSet())
         else:
             glyphs1 = {self.side1.asFea()}
         if self.secondIsClass:
             classDef2 = self.side2.glyphclass
-            glyphs2 = {g.asFea() for g in classDef2.glyphSet()}
+            glyphs2 = set(classDef2.glyphSet())
         else:
             glyphs2 = {self.side2.asFea()}
         return glyphs1 | glyphs2
@@ -124,7 +112,7 @@ class KernFeatureWriter(BaseFeatureWriter):
             font, self.options, feaFile, self.getOrderedGlyphSet()
         )
 
-        feaScripts = ast.getScriptLanguageSystems(feaFile)
+        feaScripts = self.getScriptLanguageSystems()
         ctx.scriptGroups = self._groupScriptsByTagAndDirection(feaScripts)
 
         return ctx
@@ -229,19 +217,11 @@ class KernFeatureWriter(BaseFeatureWriter):
             # Reuse the newer kern writers variable kerning extractor. Repack
             # some arguments and the return type for this.
             side1ClassesRaw: Mapping[str, tuple[str, ...]] = {
-                group_name: tuple(
-                    glyph
-                    for glyphs in glyph_defs.glyphSet()
-                    for glyph in glyphs.glyphSet()
-                )
+                group_name: glyph_defs.glyphSet()
                 for group_name, glyph_defs in side1Classes.items()
             }
             side2ClassesRaw: Mapping[str, tuple[str, ...]] = {
-                group_name: tuple(
-                    glyph
-                    for glyphs in glyph_defs.glyphSet()
-                    for glyph in glyphs.glyphSet()
-                )
+                group_name: glyph_defs.glyphSet()
                 for group_name, glyph_defs in side2Classes.items()
             }
             pairs = NewKernFeatureWriter.getVariableKerningPairs(
@@ -253,19 +233,11 @@ class KernFeatureWriter(BaseFeatureWriter):
             )
             pairs.sort()
             side1toClass: Mapping[tuple[str, ...], ast.GlyphClassDefinition] = {
-                tuple(
-                    glyph
-                    for glyphs in glyph_defs.glyphSet()
-                    for glyph in glyphs.glyphSet()
-                ): glyph_defs
+                glyph_defs.glyphSet(): glyph_defs
                 for glyph_defs in side1Classes.values()
             }
             side2toClass: Mapping[tuple[str, ...], ast.GlyphClassDefinition] = {
-                tuple(
-                    glyph
-                    for glyphs in glyph_defs.glyphSet()
-                    for glyph in glyphs.glyphSet()
-                ): glyph_defs
+                glyph_defs.glyphSet(): glyph_defs
                 for glyph_defs in side2Classes.values()
             }
             return [
@@ -7,9 +7,9 @@ from ufo2ft.constants import INDIC_SCRIPTS, USE_SCRIPTS
 from ufo2ft.featureWriters import BaseFeatureWriter, ast
 from ufo2ft.util import (
     classifyGlyphs,
+    getUnicodeProperties,
     otRoundIgnoringVariable,
     unicodeInScripts,
-    unicodeScriptExtensions,
 )
 
 
@@ -324,7 +324,7 @@ class MarkFeatureWriter(BaseFeatureWriter):
         ctx.gdefClasses = self.getGDEFGlyphClasses()
         ctx.anchorLists = self._getAnchorLists()
         ctx.anchorPairs = self._getAnchorPairs()
-        ctx.feaScripts = set(ast.getScriptLanguageSystems(feaFile).keys())
+        ctx.feaScripts = set(self.getScriptLanguageSystems().keys())
 
     def shouldContinue(self):
         if not self.context.anchorPairs:
@@ -904,8 +904,11 @@ class MarkFeatureWriter(BaseFeatureWriter):
             cmap = self.makeUnicodeToGlyphNameMapping()
             unicodeIsAbvm = partial(unicodeInScripts, scripts=scriptsUsingAbvm)
 
+            unicodeProperties = getUnicodeProperties()
+
             def unicodeIsNotAbvm(uv):
-                return bool(unicodeScriptExtensions(uv) - self.scriptsUsingAbvm)
+                scripts = unicodeProperties.getScriptExtensions(uv)
+                return not scripts.issubset(self.scriptsUsingAbvm)
 
             if any(unicodeIsAbvm(uv) for uv in cmap):
                 # If there are any characters from Indic/USE/Khmer scripts in
@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import logging
 import sys
+from functools import partial
+from inspect import getfullargspec
 from types import SimpleNamespace
 from typing import TYPE_CHECKING, FrozenSet, Tuple
 
 from fontTools.misc.loggingTools import Timer
+from fontTools.pens.recordingPen import RecordingPointPen
 
 from ufo2ft.util import (
     _getNewGlyphFactory,
     _GlyphSet,
     _LazyFontName,
-    getMaxComponentDepth,
+    _processPoolMap,
+    getComponentGraph,
     zip_strict,
 )
 
@@ -43,6 +47,11 @@ class BaseFilter:
     # filters
     _pre = False
 
+    # glyph-local filters only read and modify the contours and components of
+    # the glyph being filtered, hence they can be run in worker processes on
+    # independent subsets of the glyphs (see the `jobs` argument of `__call__`)
+    _glyph_local = False
+
     def __init__(self, *args, **kwargs):
         self.options = options = SimpleNamespace()
 
@@ -174,6 +183,39 @@ class BaseFilter:
         self.context.glyphFactory = _getNewGlyphFactory(proto)
         return self.context
 
+    def get_worker_context(self):
+        """Return a dict with the attributes of `self.context` which the
+        `filter` method of a glyph-local filter needs when it is run in a
+        worker process. The values must be picklable.
+
+        The same method is called in the worker processes when they are
+        done, and the returned dict is passed to `merge_worker_context`.
+
+        The default implementation returns an empty dict.
+        """
+        return {}
+
+    def set_worker_context(self, glyphSet, context):
+        """Populate a `self.context` namespace in a worker process, from
+        the `context` dict returned by `get_worker_context`.
+
+        The `glyphSet` only contains the glyphs to be filtered in the worker,
+        and the font is not available.
+
+        Returns the namespace instance.
+        """
+        self.context = SimpleNamespace(glyphSet=glyphSet, **context)
+        self.context.modified = set()
+        return self.context
+
+    def merge_worker_context(self, context):
+        """Merge into `self.context` the `context` dict returned by the
+        `get_worker_context` method in a worker process (e.g. statistics).
+
+        The default implementation does nothing.
+        """
+        pass
+
     def filter(self, glyph):
         """This is where the filter is applied to a single glyph.
         Subclasses must override this method, and return True
@@ -185,7 +227,7 @@ class BaseFilter:
     def name(self):
         return self.__class__.__name__
 
-    def __call__(self, font, glyphSet=None):
+    def __call__(self, font, glyphSet=None, *, jobs=1):
         """Run this filter on all the included glyphs.
         Return the set of glyph names that were modified, if any.
 
@@ -193,6 +235,10 @@ class BaseFilter:
         the glyphs contained therein (which may be copies).
         Otherwise, run the filter in-place on the font's default
         glyph set.
+
+        If the filter is glyph-local and `jobs` is greater than 1, the
+        glyphs are filtered in batches in a pool of `jobs` worker processes,
+        and the modified outlines are copied back to the glyphs.
         """
         fontName = _LazyFontName(font)
         if glyphSet is not None and getattr(glyphSet, "name", None):
@@ -209,21 +255,26 @@ class BaseFilter:
         include = self.include
         modified = context.modified
 
-        # process composite glyphs in decreasing component depth order (i.e. composites
-        # with more deeply nested components before shallower ones) to avoid
-        # order-dependent interferences while filtering glyphs with nested components
-        # https://github.com/googlefonts/ufo2ft/issues/621
-        orderedGlyphs = sorted(
-            glyphSet.keys(), key=lambda g: -getMaxComponentDepth(glyphSet[g], glyphSet)
-        )
+        if jobs > 1 and self._glyph_local:
+            with Timer() as t:
+                self._filter_in_workers(glyphSet, jobs)
+        else:
+            # process composite glyphs in decreasing component depth order (i.e.
+            # composites with more deeply nested components before shallower ones)
+            # to avoid order-dependent interferences while filtering glyphs with
+            # nested components https://github.com/googlefonts/ufo2ft/issues/621
+            componentGraph = getComponentGraph(glyphSet)
+            orderedGlyphs = sorted(
+                glyphSet.keys(), key=lambda g: -componentGraph.getMaxComponentDepth(g)
+            )
 
-        with Timer() as t:
-            for glyphName in orderedGlyphs:
-                if glyphName in modified:
-                    continue
-                glyph = glyphSet[glyphName]
-                if include(glyph) and filter_(glyph):
-                    modified.add(glyphName)
+            with Timer() as t:
+                for glyphName in orderedGlyphs:
+                    if glyphName in modified:
+                        continue
+                    glyph = glyphSet[glyphName]
+                    if include(glyph) and filter_(glyph):
+                        modified.add(glyphName)
 
         num = len(modified)
         if num > 0:
@@ -236,6 +287,41 @@ class BaseFilter:
             )
         return modified
 
+    def _filter_in_workers(self, glyphSet, jobs):
+        # The glyphs are sent to the workers as recordings of their outlines, since
+        # not all glyph objects can be pickled (e.g. defcon's); the order in which
+        # they are filtered doesn't matter as glyph-local filters don't look at the
+        # components' base glyphs.
+        include = self.include
+        glyphs = [glyph for glyph in glyphSet.values() if include(glyph)]
+        if not glyphs:
+            return
+        # a few batches per worker, to balance the load
+        numBatches = min(len(glyphs), jobs * 4)
+        batches = [
+            [(glyph.name, _recordOutline(glyph)) for glyph in glyphs[i::numBatches]]
+            for i in range(numBatches)
+        ]
+        options = {
+            key: getattr(self.options, key) for key in (*self._args, *self._kwargs)
+        }
+        worker = partial(
+            _filter_glyphs_in_worker,
+            type(self),
+            options,
+            self.get_worker_context(),
+            type(glyphs[0]),
+        )
+        modified = self.context.modified
+        for results, context in _processPoolMap(worker, batches, jobs):
+            for glyphName, outline in results:
+                glyph = glyphSet[glyphName]
+                glyph.clearContours()
+                glyph.clearComponents()
+                _drawOutline(outline, glyph.getPointPen())
+                modified.add(glyphName)
+            self.merge_worker_context(context)
+
     @classmethod
     def getInterpolatableFilterClass(cls) -> BaseIFilter | None:
         """Return interpolatable filter class if one is found in the same module.
@@ -254,6 +340,41 @@ class BaseFilter:
         return getattr(module, ifilter_name, None)
 
 
+def _recordOutline(glyph):
+    pen = RecordingPointPen()
+    glyph.drawPoints(pen)
+    return pen.value
+
+
+def _drawOutline(outline, pointPen):
+    for operator, args, kwargs in outline:
+        getattr(pointPen, operator)(*args, **kwargs)
+
+
+def _filter_glyphs_in_worker(filterClass, options, context, glyphClass, batch):
+    # Run a glyph-local filter on a batch of (glyphName, outline) tuples in a worker
+    # process; return the outlines of the modified glyphs and the worker's context.
+    filter_ = filterClass(**options)
+    # defcon.Glyph doesn't take a name argument, ufoLib2 requires one...
+    hasNameArg = "name" in getfullargspec(glyphClass.__init__).args
+    glyphSet = {}
+    for glyphName, outline in batch:
+        if hasNameArg:
+            glyph = glyphClass(name=glyphName)
+        else:
+            glyph = glyphClass()
+            glyph.name = glyphName
+        glyphSet[glyphName] = glyph
+        _drawOutline(outline, glyph.getPointPen())
+    filter_.set_worker_context(glyphSet, context)
+    results = [
+        (glyphName, _recordOutline(glyph))
+        for glyphName, glyph in glyphSet.items()
+        if filter_.filter(glyph)
+    ]
+    return results, filter_.get_worker_context()
+
+
 HashableLocation: TypeAlias = FrozenSet[Tuple[str, float]]
 
 
@@ -344,10 +465,12 @@ class BaseIFilter(BaseFilter):
         # https://github.com/googlefonts/ufo2ft/issues/621
         allGlyphNames = set.union(*(set(glyphSet.keys()) for glyphSet in glyphSets))
 
+        componentGraphs = [getComponentGraph(glyphSet) for glyphSet in glyphSets]
+
         def comp_depth(g):
-            for glyphSet in glyphSets:
+            for glyphSet, componentGraph in zip(glyphSets, componentGraphs):
                 if g in glyphSet:
-                    return -getMaxComponentDepth(glyphSet[g], glyphSet)
+                    return -componentGraph.getMaxComponentDepth(g)
             raise AssertionError
 
         orderedGlyphs = sorted(allGlyphNames, key=comp_depth)
@@ -1,13 +1,137 @@
 import logging
 
-from fontTools.cu2qu.ufo import CURVE_TYPE_LIB_KEY, DEFAULT_MAX_ERR
+from fontTools.cu2qu.errors import IncompatibleFontsError, IncompatibleGlyphsError
+from fontTools.cu2qu.ufo import (
+    CURVE_TYPE_LIB_KEY,
+    DEFAULT_MAX_ERR,
+    fonts_to_quadratic,
+    glyphs_to_quadratic,
+)
 from fontTools.pens.cu2quPen import Cu2QuPointPen
+from fontTools.pens.recordingPen import RecordingPointPen
 
+from ufo2ft.cache import DiskCache
 from ufo2ft.filters import BaseFilter
 from ufo2ft.fontInfoData import getAttrWithFallback
 
 logger = logging.getLogger(__name__)
 
+CACHE_NAMESPACE = "cu2qu"
+
+
+def _recordContours(glyph):
+    pen = RecordingPointPen()
+    for contour in glyph:
+        contour.drawPoints(pen)
+    return pen.value
+
+
+def _replaceContours(glyph, recording):
+    glyph.clearContours()
+    pen = glyph.getPointPen()
+    for method, args, kwargs in recording:
+        getattr(pen, method)(*args, **kwargs)
+
+
+def _updateStats(stats, other):
+    for splineLength, count in other.items():
+        stats[splineLength] = stats.get(splineLength, 0) + count
+
+
+def fontsToQuadratic(
+    glyphSets,
+    maxErrors,
+    reverseDirection=False,
+    rememberCurveType=True,
+    allQuadratic=True,
+    cacheDir=None,
+):
+    """Convert the curves of a list of interpolatable glyph sets to quadratic.
+
+    This works like fontTools.cu2qu.ufo.fonts_to_quadratic, with ``maxErrors``
+    being a list of absolute errors, one per glyph set. If a ``cacheDir`` is
+    set, the converted contours are looked up in a persistent cache keyed by
+    the cubic contours of each glyph across all glyph sets, and only the glyphs
+    that are missing from it are converted.
+
+    Return the set of modified glyph names.
+    """
+    if cacheDir is None:
+        modified = fonts_to_quadratic(
+            glyphSets,
+            max_err=maxErrors,
+            reverse_direction=reverseDirection,
+            dump_stats=True,
+            remember_curve_type=rememberCurveType,
+            all_quadratic=allQuadratic,
+        )
+        # fonts_to_quadratic returns False if the curves are already quadratic
+        return modified or set()
+
+    if rememberCurveType:
+        curveTypes = {gs.lib.get(CURVE_TYPE_LIB_KEY, "cubic") for gs in glyphSets}
+        if curveTypes in ({"quadratic"}, {"mixed"}):
+            logger.info("Curves already converted to quadratic")
+            return set()
+
+    cache = DiskCache(cacheDir, CACHE_NAMESPACE)
+    stats = {}
+    modified = set()
+    glyphErrors = {}
+    for name in set().union(*(gs.keys() for gs in glyphSets)):
+        glyphs = []
+        errors = []
+        for glyphSet, error in zip(glyphSets, maxErrors):
+            if name in glyphSet:
+                glyphs.append(glyphSet[name])
+                errors.append(error)
+        key = cache.makeKey(
+            "glyphs",
+            errors,
+            reverseDirection,
+            allQuadratic,
+            [_recordContours(glyph) for glyph in glyphs],
+        )
+        cached = cache.get(key)
+        if cached is None:
+            glyphStats = {}
+            try:
+                glyphModified = glyphs_to_quadratic(
+                    glyphs, errors, reverseDirection, glyphStats, allQuadratic
+                )
+            except IncompatibleGlyphsError as exc:
+                logger.error(exc)
+                glyphErrors[name] = exc
+                continue
+            recordings = (
+                [_recordContours(glyph) for glyph in glyphs] if glyphModified else None
+            )
+            cache.set(key, (recordings, glyphStats))
+        else:
+            recordings, glyphStats = cached
+            if recordings is not None:
+                for glyph, recording in zip(glyphs, recordings):
+                    _replaceContours(glyph, recording)
+        _updateStats(stats, glyphStats)
+        if recordings is not None:
+            modified.add(name)
+
+    if glyphErrors:
+        raise IncompatibleFontsError(glyphErrors)
+
+    if modified:
+        logger.info(
+            "New spline lengths: %s"
+            % (", ".join("%s: %d" % (ln, stats[ln]) for ln in sorted(stats.keys())))
+        )
+
+    if rememberCurveType:
+        curveType = "quadratic" if allQuadratic else "mixed"
+        for glyphSet in glyphSets:
+            glyphSet.lib[CURVE_TYPE_LIB_KEY] = curveType
+
+    return modified
+
 
 class CubicToQuadraticFilter(BaseFilter):
     _kwargs = {
@@ -15,8 +139,11 @@ class CubicToQuadraticFilter(BaseFilter):
         "reverseDirection": True,
         "rememberCurveType": False,
         "allQuadratic": True,
+        "cacheDir": None,
     }
 
+    _glyph_local = True
+
     def set_context(self, font, glyphSet):
         ctx = super().set_context(font, glyphSet)
 
@@ -25,9 +152,23 @@ class CubicToQuadraticFilter(BaseFilter):
 
         ctx.stats = {}
 
+        cacheDir = self.options.cacheDir
+        ctx.cache = DiskCache(cacheDir, CACHE_NAMESPACE) if cacheDir else None
+
         return ctx
 
-    def __call__(self, font, glyphSet=None):
+    def get_worker_context(self):
+        ctx = self.context
+        return {
+            "absoluteError": ctx.absoluteError,
+            "stats": ctx.stats,
+            "cache": ctx.cache,
+        }
+
+    def merge_worker_context(self, context):
+        _updateStats(self.context.stats, context["stats"])
+
+    def __call__(self, font, glyphSet=None, **kwargs):
         if self.options.rememberCurveType:
             # check first in the global font lib, then in layer lib
             for lib in (font.lib, getattr(glyphSet, "lib", {})):
@@ -40,7 +181,7 @@ class CubicToQuadraticFilter(BaseFilter):
                 else:
                     raise NotImplementedError(curve_type)
 
-        modified = super().__call__(font, glyphSet)
+        modified = super().__call__(font, glyphSet, **kwargs)
         if modified:
             stats = self.context.stats
             logger.info(
@@ -60,15 +201,38 @@ class CubicToQuadraticFilter(BaseFilter):
         if not len(glyph):
             return False
 
+        cache = self.context.cache
+        if cache is None:
+            self._convertContours(glyph, self.context.stats)
+            return True
+
+        key = cache.makeKey(
+            "glyph",
+            self.context.absoluteError,
+            self.options.reverseDirection,
+            self.options.allQuadratic,
+            _recordContours(glyph),
+        )
+        cached = cache.get(key)
+        if cached is None:
+            stats = {}
+            self._convertContours(glyph, stats)
+            cache.set(key, (_recordContours(glyph), stats))
+        else:
+            recording, stats = cached
+            _replaceContours(glyph, recording)
+        _updateStats(self.context.stats, stats)
+        return True
+
+    def _convertContours(self, glyph, stats):
         pen = Cu2QuPointPen(
             glyph.getPointPen(),
             self.context.absoluteError,
             reverse_direction=self.options.reverseDirection,
-            stats=self.context.stats,
+            stats=stats,
             all_quadratic=self.options.allQuadratic,
         )
         contours = list(glyph)
         glyph.clearContours()
         for contour in contours:
             contour.drawPoints(pen)
-        return True
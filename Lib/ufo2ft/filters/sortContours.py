@@ -20,6 +20,8 @@ class SortContoursFilter(BaseFilter):
     or U+2591 LIGHT SHADE).
     """
 
+    _glyph_local = True
+
     def filter(self, glyph):
         if len(glyph) == 0:  # As in, no contours.
             return False
@@ -32,14 +32,18 @@ from __future__ import annotations
 
 import copy
 import logging
+import multiprocessing
 import typing
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from functools import cached_property
+from inspect import getfullargspec
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -54,11 +58,17 @@ from fontTools import designspaceLib, varLib
 
 from ufo2ft.util import (
     _getNewGlyphFactory,
+    getComponentGraph,
     importUfoModule,
     openFontFactory,
     zip_strict,
 )
 
+try:
+    from ufo2ft.instantiatorNumpy import GlyphArrays, KerningArrays
+except ImportError:
+    GlyphArrays = KerningArrays = None
+
 if TYPE_CHECKING:
     from collections.abc import Iterable, KeysView
 
@@ -209,17 +219,27 @@ class Instantiator:
     copy_info: Optional[Info] = None
     copy_lib: Mapping[str, Any] = field(default_factory=dict)
     designspace_rules: List[designspaceLib.RuleDescriptor] = field(default_factory=list)
-    glyph_mutators: Mapping[str, Optional["Variator"]] = field(default_factory=dict)
+    glyph_mutators: Mapping[str, Optional["GlyphVariator"]] = field(
+        default_factory=dict
+    )
     info_mutator: Optional["Variator"] = None
-    kerning_mutator: Optional["Variator"] = None
+    kerning_mutator: Optional["KerningVariator"] = None
     round_geometry: bool = False
     skip_export_glyphs: List[str] = field(default_factory=list)
     special_axes: Mapping[str, designspaceLib.AxisDescriptor] = field(
         default_factory=dict
     )
+    # VariationModels shared by all the mutators, see get_variation_model
+    variation_models: Dict[Any, varLib.models.VariationModel] = field(
+        default_factory=dict
+    )
     # computed attributes (see __post_init__ below)
     default_source_idx: int = field(init=False)
     default_design_location: Location = field(init=False)
+    # shallow copies of the source layers the glyph mutators were built from
+    _source_glyphs: List[Dict[str, Glyph]] = field(
+        init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         default_location = {
@@ -240,6 +260,9 @@ class Instantiator:
         object.__setattr__(
             self, "default_design_location", {**default_location, **location}
         )
+        object.__setattr__(
+            self, "_source_glyphs", [dict(glyphs) for _, glyphs in self.source_layers]
+        )
 
     @classmethod
     def from_designspace(
@@ -331,11 +354,14 @@ class Instantiator:
             if axis.tag in {"wght", "wdth", "slnt"}:
                 special_axes[axis.tag] = axis
 
+        variation_models: Dict[Any, varLib.models.VariationModel] = {}
         info_mutator = None
         if do_info:
             masters_info = collect_info_masters(designspace, axis_bounds)
             try:
-                info_mutator = Variator.from_masters(masters_info, axis_order)
+                info_mutator = Variator.from_masters(
+                    masters_info, axis_order, variation_models
+                )
             except varLib.errors.VarLibError as e:
                 raise InstantiatorError(
                     f"Cannot set up fontinfo for interpolation: {e}'"
@@ -345,14 +371,16 @@ class Instantiator:
         if do_kerning:
             masters_kerning = collect_kerning_masters(designspace, axis_bounds)
             try:
-                kerning_mutator = Variator.from_masters(masters_kerning, axis_order)
+                kerning_mutator = KerningVariator.from_masters(
+                    masters_kerning, axis_order, variation_models
+                )
             except varLib.errors.VarLibError as e:
                 raise InstantiatorError(
                     f"Cannot set up kerning for interpolation: {e}'"
                 ) from e
 
         # left empty as the glyph sources will be loaded later on-demand
-        glyph_mutators: Dict[str, Variator] = {}
+        glyph_mutators: Dict[str, GlyphVariator] = {}
         source_layers = []
         if do_glyphs:
             # collect (location, source layer) tuples
@@ -403,6 +431,7 @@ class Instantiator:
             round_geometry,
             skip_export_glyphs,
             special_axes,
+            variation_models,
         )
 
     @property
@@ -513,6 +542,89 @@ class Instantiator:
 
         return font
 
+    def generate_instances(
+        self,
+        instances: list[designspaceLib.InstanceDescriptor],
+        jobs: int = 1,
+        output_paths: list[str] | None = None,
+    ) -> Iterator[Font | str]:
+        """Generate the instance fonts of several InstanceDescriptors, and return
+        an iterator yielding them in the same order.
+
+        If `jobs` is greater than 1, the instances are generated in a pool of
+        `jobs` worker processes. The glyph variation models are all prepared
+        beforehand, and the workers are forked so that they inherit them (and
+        the source glyphs) instead of each building their own or unpickling
+        them. Where the 'fork' start method is not available (e.g. on Windows),
+        the instances are generated one after the other in the current process.
+
+        If `output_paths` is given (one path per instance), each instance font is
+        saved to its path as soon as it is generated, and the path is yielded
+        instead of the font: this avoids sending the fonts back from the workers
+        and keeping them all in memory. Otherwise, when generating in parallel,
+        the fonts must be picklable (ufoLib2 fonts are, defcon ones are not).
+        """
+        if output_paths is not None and len(output_paths) != len(instances):
+            raise ValueError(
+                f"Expected {len(instances)} output paths; found {len(output_paths)}"
+            )
+        if (
+            jobs
+            and jobs > 1
+            and len(instances) > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            return self._generate_instances_parallel(instances, jobs, output_paths)
+        return (
+            _generate_instance(self, instances, output_paths, i)
+            for i in range(len(instances))
+        )
+
+    def _generate_instances_parallel(self, instances, jobs, output_paths):
+        # the workers are forked, as the source fonts may not be picklable
+        self._prepare_glyph_mutators()
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(instances)),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_instance_worker,
+            initargs=(self, instances, output_paths),
+        ) as executor:
+            yield from executor.map(_generate_instance_in_worker, range(len(instances)))
+
+    def _prepare_glyph_mutators(self):
+        """Build the glyph variation models of all the glyphs that don't have one.
+
+        The glyphs that can't be set up for interpolation are skipped here, so
+        that the error is reported (or ignored, for non-exportable glyphs) when
+        generating the instances.
+        """
+        for glyph_name in self.glyph_names:
+            try:
+                self._get_glyph_mutator(glyph_name)
+            except InstantiatorError:
+                pass
+
+    def _get_glyph_mutator(self, glyph_name: str) -> GlyphVariator:
+        glyph_mutator = self.glyph_mutators.get(glyph_name)
+        if glyph_mutator is None:
+            sources = collect_glyph_masters(
+                self.source_layers,
+                glyph_name,
+                self.axis_bounds,
+                self.default_source_idx,
+            )
+            try:
+                glyph_mutator = self.glyph_mutators[glyph_name] = (
+                    GlyphVariator.from_masters(
+                        sources, self.axis_order, self.variation_models
+                    )
+                )
+            except varLib.errors.VarLibError as e:
+                raise InstantiatorError(
+                    f"Cannot set up glyph {glyph_name} for interpolation: {e}'"
+                ) from e
+        return glyph_mutator
+
     @cached_property
     def glyph_factory(self) -> Callable[[str], Glyph]:
         glyphs = self.default_source_glyphs
@@ -537,23 +649,7 @@ class Instantiator:
         If output_glyph is None, the instance is generated in a new Glyph object
         and returned. Otherwise, the instance is extracted to the given Glyph object.
         """
-        glyph_mutator = self.glyph_mutators.get(glyph_name)
-        if glyph_mutator is None:
-            sources = collect_glyph_masters(
-                self.source_layers,
-                glyph_name,
-                self.axis_bounds,
-                self.default_source_idx,
-            )
-            try:
-                glyph_mutator = self.glyph_mutators[glyph_name] = Variator.from_masters(
-                    sources, self.axis_order
-                )
-            except varLib.errors.VarLibError as e:
-                raise InstantiatorError(
-                    f"Cannot set up glyph {glyph_name} for interpolation: {e}'"
-                ) from e
-
+        glyph_mutator = self._get_glyph_mutator(glyph_name)
         glyph_instance = glyph_mutator.instance_at(normalized_location)
 
         if self.round_geometry:
@@ -645,17 +741,75 @@ class Instantiator:
             for loc, source_layer in self.source_layers
         ]
 
-    def replace_source_layers(self, new_layers: list[dict[str, Glyph]]):
+    def replace_source_layers(
+        self,
+        new_layers: list[dict[str, Glyph]],
+        modified: Iterable[str] | None = None,
+    ):
         """Replace source layers with `new_layers` and clear the cached glyph models.
 
+        If `modified` is None, all the cached glyph models are cleared. Otherwise
+        it is the set of names of the glyphs that were modified in place since the
+        last replacement: only the models of these glyphs, of the glyphs that were
+        added, removed or replaced by different glyph objects in any layer, and of
+        the composite glyphs referencing any of them are cleared.
+
         Raises `ValueError` if len(new_layers) != len(self.source_layers).
         """
         self.source_layers[:] = [
             (loc, new_glyphs)
             for (loc, _), new_glyphs in zip_strict(self.source_layers, new_layers)
         ]
+        old_layers = self._source_glyphs
+        object.__setattr__(self, "_source_glyphs", [dict(g) for g in new_layers])
         # this forces to reload the glyph variation models when an instance is requested
-        self.glyph_mutators.clear()
+        if modified is None:
+            self.glyph_mutators.clear()
+            return
+        if not self.glyph_mutators:
+            return
+
+        changed = set(modified)
+        for old_glyphs, new_glyphs in zip(old_layers, new_layers):
+            changed.update(
+                name
+                for name in old_glyphs.keys() | new_glyphs.keys()
+                if old_glyphs.get(name) is not new_glyphs.get(name)
+            )
+        if not changed:
+            return
+        invalid = set(changed)
+        for new_glyphs in new_layers:
+            invalid |= getComponentGraph(new_glyphs).closeOverComposites(changed)
+        for glyph_name in invalid:
+            self.glyph_mutators.pop(glyph_name, None)
+
+
+def _generate_instance(instantiator, instances, output_paths, i):
+    font = instantiator.generate_instance(instances[i])
+    if output_paths is None:
+        return font
+    path = output_paths[i]
+    # defcon's Font.save has no 'overwrite' argument
+    if "overwrite" in getfullargspec(font.save).args:
+        font.save(path, overwrite=True)
+    else:
+        font.save(path)
+    return path
+
+
+# State shared with the worker processes that generate instances in parallel;
+# see Instantiator.generate_instances.
+_worker_state = None
+
+
+def _init_instance_worker(instantiator, instances, output_paths):
+    global _worker_state
+    _worker_state = (instantiator, instances, output_paths)
+
+
+def _generate_instance_in_worker(i):
+    return _generate_instance(*_worker_state, i)
 
 
 def _error_msg_no_default(designspace: designspaceLib.DesignSpaceDocument) -> str:
@@ -916,6 +1070,45 @@ def swap_glyph_names(font: Any, name_old: str, name_new: str):
         font.groups[group_name] = group_members_new
 
 
+def get_variation_model(
+    master_locations: List[Location],
+    axis_order: List[str],
+    cache: Optional[Dict[Any, varLib.models.VariationModel]] = None,
+) -> varLib.models.VariationModel:
+    """Return a VariationModel for the given normalized master locations.
+
+    Most glyphs have masters at the same locations as the others, so if a
+    `cache` dict is given, the models are stored in it keyed by the master
+    locations (in order) and the axis order, and reused for all the glyphs,
+    the font info and the kerning with the same master locations.
+    """
+    if cache is None:
+        return varLib.models.VariationModel(master_locations, axis_order)
+    key = (tuple(location_to_key(loc) for loc in master_locations), tuple(axis_order))
+    model = cache.get(key)
+    if model is None:
+        model = cache[key] = varLib.models.VariationModel(master_locations, axis_order)
+    return model
+
+
+def get_master_scalars(
+    model: varLib.models.VariationModel, normalized_location: Location
+) -> List[float]:
+    """Return the master scalars of the model at the given normalized location,
+    like `model.getMasterScalars`.
+
+    The scalars are computed once per location and stored on the model, so that
+    all the mutators sharing a model (see `get_variation_model`) reuse them when
+    generating an instance.
+    """
+    cache = model.__dict__.setdefault("_masterScalars", {})
+    key = location_to_key(normalized_location)
+    scalars = cache.get(key)
+    if scalars is None:
+        scalars = cache[key] = model.getMasterScalars(normalized_location)
+    return scalars
+
+
 @dataclass(frozen=True)
 class Variator:
     """A middle-man class that ingests a mapping of normalized locations to
@@ -933,8 +1126,16 @@ class Variator:
 
     @classmethod
     def from_masters(
-        cls, items: List[Tuple[Location, FontMathObject]], axis_order: List[str]
+        cls,
+        items: List[Tuple[Location, FontMathObject]],
+        axis_order: List[str],
+        model_cache: Optional[Dict[Any, varLib.models.VariationModel]] = None,
     ):
+        """Make a Variator from (normalized location, master) tuples.
+
+        The VariationModel is looked up in, or else added to, the optional
+        `model_cache` dict (see `get_variation_model`).
+        """
         masters = []
         master_locations = []
         location_to_master = {}
@@ -942,7 +1143,7 @@ class Variator:
             master_locations.append(normalized_location)
             masters.append(master)
             location_to_master[location_to_key(normalized_location)] = master
-        model = varLib.models.VariationModel(master_locations, axis_order)
+        model = get_variation_model(master_locations, axis_order, model_cache)
 
         return cls(masters, location_to_master, model)
 
@@ -964,7 +1165,86 @@ class Variator:
         if normalized_location_key in self.location_to_master:
             return copy.deepcopy(self.location_to_master[normalized_location_key])
 
-        return self.model.interpolateFromMasters(normalized_location, self.masters)
+        scalars = get_master_scalars(self.model, normalized_location)
+        return self.model.interpolateFromValuesAndScalars(self.masters, scalars)
+
+
+@dataclass(frozen=True)
+class GlyphVariator(Variator):
+    """A Variator for the MathGlyph masters of a single glyph.
+
+    When NumPy is available and the masters are compatible, the coordinates of
+    the masters are packed into arrays (see `ufo2ft.instantiatorNumpy`) and
+    the instances are interpolated from those, with the same results as
+    fontMath. Instances at a master location are a copy of the master, made
+    without going through `copy.deepcopy`.
+    """
+
+    arrays: Optional["GlyphArrays"] = field(init=False)
+
+    def __post_init__(self):
+        arrays = None
+        if GlyphArrays is not None:
+            arrays = GlyphArrays.fromMasters(self.masters)
+        object.__setattr__(self, "arrays", arrays)
+
+    def instance_at(self, normalized_location: Location) -> fontMath.MathGlyph:
+        master = self.location_to_master.get(location_to_key(normalized_location))
+        if master is not None:
+            return _copy_math_glyph(master)
+
+        scalars = get_master_scalars(self.model, normalized_location)
+        if self.arrays is not None:
+            instance = self.arrays.interpolate(scalars)
+            if instance is not None:
+                return instance
+        return self.model.interpolateFromValuesAndScalars(self.masters, scalars)
+
+
+@dataclass(frozen=True)
+class KerningVariator(Variator):
+    """A Variator for the MathKerning masters of a font.
+
+    When NumPy is available, the kerning of all the masters is aligned once
+    into a matrix (see `ufo2ft.instantiatorNumpy`), and the kerning of each
+    instance is interpolated from it instead of with fontMath's dict
+    arithmetic, with the same results.
+    """
+
+    arrays: Optional["KerningArrays"] = field(init=False)
+
+    def __post_init__(self):
+        arrays = None
+        if KerningArrays is not None:
+            arrays = KerningArrays.fromMasters(self.masters)
+        object.__setattr__(self, "arrays", arrays)
+
+    def instance_at(self, normalized_location: Location) -> fontMath.MathKerning:
+        master = self.location_to_master.get(location_to_key(normalized_location))
+        if master is not None:
+            return master.copy()
+
+        scalars = get_master_scalars(self.model, normalized_location)
+        if self.arrays is not None:
+            instance = self.arrays.interpolate(scalars)
+            if instance is not None:
+                return instance
+        return self.model.interpolateFromValuesAndScalars(self.masters, scalars)
+
+
+def _copy_math_glyph(glyph: fontMath.MathGlyph) -> fontMath.MathGlyph:
+    # The points, transformations and guideline/anchor values are immutable, so
+    # only the containers need copying.
+    result = glyph.copyWithoutMathSubObjects()
+    result.contours = [
+        dict(identifier=contour["identifier"], points=list(contour["points"]))
+        for contour in glyph.contours
+    ]
+    result.components = [dict(component) for component in glyph.components]
+    result.anchors = [dict(anchor) for anchor in glyph.anchors]
+    result.guidelines = [dict(guideline) for guideline in glyph.guidelines]
+    result.image = dict(glyph.image)
+    return result
 
 
 @dataclass(frozen=True, repr=False)
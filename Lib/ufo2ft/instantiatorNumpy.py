@@ -0,0 +1,286 @@
+"""Array-backed glyph and kerning interpolation for the Instantiator, using NumPy.
+
+fontMath interpolates a glyph by multiplying each master MathGlyph by its
+scalar and adding up the results, building new Python objects for every point
+at each step. Here the coordinates of each master are packed once into a flat
+array of floats (advance, image transformation, contour points, component
+transformations and anchors), so that an instance only takes one array
+operation per master; the MathGlyph is built at the end from the structure of
+one of the masters. The floating point operations are the same, and in the
+same order, as fontMath's, so the results are identical.
+
+Likewise, the kerning of all the masters is aligned once into a matrix with
+one row per master and one column per pair that is kerned in any master, and
+fontMath's sum of the weighted masters is replayed one master at a time on
+whole rows: like fontMath, each partial sum only keeps the pairs listed by the
+masters added so far, and the value of a pair that it doesn't list falls back
+to the group kerning of the partial sum, so the results are also identical.
+
+This module requires NumPy, which is an optional dependency of ufo2ft.
+"""
+
+from __future__ import annotations
+
+import fontMath
+import numpy as np
+from fontMath.mathKerning import side1Prefix, side2Prefix
+
+__all__ = ["GlyphArrays", "KerningArrays"]
+
+
+class GlyphArrays:
+    """The masters of a glyph (fontMath.MathGlyph objects), packed as arrays.
+
+    Use `fromMasters` to make one: it returns None if the masters are not
+    compatible in a way that this can handle, in which case fontMath must be
+    used instead.
+    """
+
+    def __init__(self, masters, values):
+        self.masters = masters
+        # one 1-D array of floats for each master
+        self.values = values
+
+    @classmethod
+    def fromMasters(cls, masters):
+        """Return a GlyphArrays for the list of MathGlyph masters, or None if
+        they have guidelines, or different numbers of points per contour, or
+        different components, anchors or background images.
+        """
+        structure = None
+        values = []
+        for master in masters:
+            masterStructure = _glyphStructure(master)
+            if masterStructure is None:
+                return None
+            if structure is None:
+                structure = masterStructure
+            elif masterStructure != structure:
+                return None
+            values.append(np.fromiter(_iterGlyphValues(master), dtype=float))
+        return cls(masters, values)
+
+    def interpolate(self, scalars):
+        """Return a new MathGlyph with the sum of the masters multiplied by the
+        given scalars (as returned by VariationModel.getMasterScalars).
+
+        Return None if less than two masters contribute to the instance: the
+        MathGlyph that fontMath returns in that case is not normalized the
+        same way (e.g. the anchors are not grouped by name), so the caller
+        should let fontMath handle it.
+        """
+        contributions = [(i, scalar) for i, scalar in enumerate(scalars) if scalar]
+        if len(contributions) < 2:
+            return None
+        result = None
+        for i, scalar in contributions:
+            contribution = self.values[i] * scalar
+            if result is None:
+                result = contribution
+            else:
+                result += contribution
+        template = self.masters[contributions[0][0]]
+        return _makeMathGlyph(template, result.tolist())
+
+
+def _groupAnchors(anchors):
+    # fontMath pairs the anchors by name, which groups them by name in the
+    # order the names first appear
+    groups = {}
+    for anchor in anchors:
+        groups.setdefault(anchor.get("name"), []).append(anchor)
+    return [anchor for group in groups.values() for anchor in group]
+
+
+def _glyphStructure(glyph):
+    if glyph.guidelines or glyph.width is None or glyph.height is None:
+        return None
+    return (
+        tuple(len(contour["points"]) for contour in glyph.contours),
+        tuple((c["baseGlyph"], c["identifier"]) for c in glyph.components),
+        tuple((a.get("name"), a.get("identifier")) for a in glyph.anchors),
+        glyph.image["fileName"],
+    )
+
+
+def _iterGlyphValues(glyph):
+    yield glyph.width
+    yield glyph.height
+    yield from glyph.image["transformation"]
+    for contour in glyph.contours:
+        for _, (x, y), _, _, _ in contour["points"]:
+            yield x
+            yield y
+    for component in glyph.components:
+        yield from component["transformation"]
+    for anchor in _groupAnchors(glyph.anchors):
+        yield anchor["x"]
+        yield anchor["y"]
+
+
+def _makeMathGlyph(template, values):
+    glyph = template.copyWithoutMathSubObjects()
+    glyph.width, glyph.height = values[0:2]
+    image = template.image
+    glyph.image = dict(
+        fileName=image["fileName"],
+        transformation=tuple(values[2:8]),
+        color=image["color"],
+    )
+    i = 8
+    contours = []
+    for contour in template.contours:
+        points = []
+        for segmentType, _, smooth, name, identifier in contour["points"]:
+            points.append(
+                (segmentType, (values[i], values[i + 1]), smooth, name, identifier)
+            )
+            i += 2
+        contours.append(dict(identifier=contour["identifier"], points=points))
+    glyph.contours = contours
+    components = []
+    for component in template.components:
+        component = dict(component)
+        component["transformation"] = tuple(values[i : i + 6])
+        i += 6
+        components.append(component)
+    glyph.components = components
+    anchors = []
+    for anchor in _groupAnchors(template.anchors):
+        anchors.append(
+            dict(
+                name=anchor.get("name"),
+                identifier=anchor.get("identifier"),
+                x=values[i],
+                y=values[i + 1],
+                color=anchor.get("color"),
+            )
+        )
+        i += 2
+    glyph.anchors = anchors
+    assert i == len(values)
+    return glyph
+
+
+class KerningArrays:
+    """The kerning masters of a font (fontMath.MathKerning objects), aligned
+    in a matrix of masters by pairs.
+
+    Use `fromMasters` to make one: it returns None if the masters don't have
+    the same groups, in which case fontMath must be used instead.
+    """
+
+    def __init__(self, pairs, values, explicit, exceptions, fallbacks, groups):
+        # the pairs kerned in any master, in the order of the matrix columns
+        self.pairs = pairs
+        # float matrix of the value of each pair (column) in each master (row),
+        # zero where the master doesn't list the pair
+        self.values = values
+        # bool matrix, True where the master lists the pair explicitly
+        self.explicit = explicit
+        # bool array, True for the pairs with a glyph side that is in a group
+        self.exceptions = exceptions
+        # int arrays of the columns of the group pairs that each pair falls
+        # back to, in the order MathKerning looks them up: (group, glyph),
+        # (glyph, group) and (group, group); -1 where there's none
+        self.fallbacks = fallbacks
+        self.groups = groups
+
+    @classmethod
+    def fromMasters(cls, masters):
+        """Return a KerningArrays for the list of MathKerning masters, or None
+        if their groups differ.
+        """
+        if not masters:
+            return None
+        groups = masters[0].groups()
+        if any(master.groups() != groups for master in masters[1:]):
+            return None
+        pairs = list(
+            dict.fromkeys(pair for master in masters for pair in master.keys())
+        )
+        columns = {pair: i for i, pair in enumerate(pairs)}
+        values = np.zeros((len(masters), len(pairs)))
+        explicit = np.zeros((len(masters), len(pairs)), dtype=bool)
+        for row, master in enumerate(masters):
+            masterColumns = [columns[pair] for pair in master.keys()]
+            values[row, masterColumns] = list(master.values())
+            explicit[row, masterColumns] = True
+        side1Groups = {}
+        side2Groups = {}
+        for groupName, glyphNames in groups.items():
+            if groupName.startswith(side1Prefix):
+                side1Groups.update(dict.fromkeys(glyphNames, groupName))
+            elif groupName.startswith(side2Prefix):
+                side2Groups.update(dict.fromkeys(glyphNames, groupName))
+        exceptions = np.zeros(len(pairs), dtype=bool)
+        fallbacks = np.full((3, len(pairs)), -1)
+        for i, (side1, side2) in enumerate(pairs):
+            # same as MathKerning.__getitem__ and guessPairType
+            if side1.startswith(side1Prefix):
+                side1, side1Group = None, side1
+            else:
+                side1Group = side1Groups.get(side1)
+            if side2.startswith(side2Prefix):
+                side2, side2Group = None, side2
+            else:
+                side2Group = side2Groups.get(side2)
+            exceptions[i] = (side1 is not None and side1Group is not None) or (
+                side2 is not None and side2Group is not None
+            )
+            for j, fallback in enumerate(
+                ((side1Group, side2), (side1, side2Group), (side1Group, side2Group))
+            ):
+                fallbacks[j, i] = columns.get(fallback, -1)
+        return cls(pairs, values, explicit, exceptions, fallbacks, groups)
+
+    def _resolve(self, values, present):
+        # the values that a MathKerning with the given pairs (columns where
+        # `present` is True) returns for all the pairs, i.e. falling back to
+        # the group kerning for the pairs that it doesn't list
+        values = np.append(values, 0.0)
+        present = np.append(present, False)
+        result = np.where(present[:-1], values[:-1], 0.0)
+        missing = ~present[:-1]
+        for fallback in self.fallbacks:
+            found = missing & present[fallback]
+            result[found] = values[fallback[found]]
+            missing &= ~found
+        return result
+
+    def _cleanup(self, values, present):
+        # MathKerning.cleanup drops the pairs that are zero, unless they are
+        # exceptions
+        return present & ((values != 0) | self.exceptions)
+
+    def interpolate(self, scalars):
+        """Return a new MathKerning with the sum of the masters multiplied by
+        the given scalars (as returned by VariationModel.getMasterScalars).
+
+        This gives the same result as summing the MathKerning masters with
+        fontMath, i.e. VariationModel.interpolateFromValuesAndScalars. Return
+        None if no master contributes.
+        """
+        result = present = None
+        for i, scalar in enumerate(scalars):
+            if not scalar:
+                continue
+            contribution = self.values[i] * scalar
+            contributionPresent = self._cleanup(contribution, self.explicit[i])
+            if result is None:
+                result, present = contribution, contributionPresent
+                continue
+            # MathKerning.__add__ sums the values of the pairs listed by either
+            # operand, as returned by each operand with the group fallback
+            result = self._resolve(result, present) + self._resolve(
+                contribution, contributionPresent
+            )
+            present = self._cleanup(result, present | contributionPresent)
+        if result is None:
+            return None
+        (columns,) = np.nonzero(present)
+        pairs = self.pairs
+        kerning = {}
+        for column, value in zip(columns.tolist(), result[columns].tolist()):
+            kerning[pairs[column]] = int(value) if value.is_integer() else value
+        return fontMath.MathKerning(kerning, self.groups)
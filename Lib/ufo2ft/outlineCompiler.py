@@ -1,6 +1,7 @@
 import logging
 import math
 from collections import Counter, namedtuple
+from functools import partial
 from io import BytesIO
 from types import SimpleNamespace
 
@@ -14,9 +15,15 @@ from fontTools.cffLib import (
     TopDictIndex,
 )
 from fontTools.misc.arrayTools import unionRect
+from fontTools.misc.psCharStrings import T2CharString
 from fontTools.misc.roundTools import noRound, otRound
 from fontTools.pens.boundsPen import ControlBoundsPen
 from fontTools.pens.pointPen import SegmentToPointPen
+from fontTools.pens.recordingPen import (
+    RecordingPen,
+    RecordingPointPen,
+    replayRecording,
+)
 from fontTools.pens.reverseContourPen import ReverseContourPen
 from fontTools.pens.t2CharStringPen import T2CharStringPen
 from fontTools.pens.ttGlyphPen import TTGlyphPointPen
@@ -26,6 +33,7 @@ from fontTools.ttLib.tables._g_l_y_f import Glyph, flagCubic
 from fontTools.ttLib.tables._h_e_a_d import mac_epoch_diff
 from fontTools.ttLib.tables.O_S_2f_2 import Panose
 
+from ufo2ft.cache import DiskCache
 from ufo2ft.constants import (
     COLOR_LAYERS_KEY,
     COLOR_PALETTES_KEY,
@@ -51,9 +59,11 @@ from ufo2ft.instructionCompiler import InstructionCompiler
 from ufo2ft.util import (
     _copyGlyph,
     _getNewGlyphFactory,
+    _processPoolMap,
     calcCodePageRanges,
+    closeGlyphsOverComponents,
     colrClipBoxQuantization,
-    getMaxComponentDepth,
+    getComponentGraph,
     makeOfficialGlyphOrder,
     makeUnicodeToGlyphNameMapping,
 )
@@ -72,6 +82,41 @@ def _isNonBMP(s):
     return False
 
 
+def _buildSimpleTTGlyph(recording, dropImpliedOnCurves=False, roundCoordinates=True):
+    """Build a TrueType glyph from a list of (method, args, kwargs) point pen calls,
+    as recorded by a RecordingPointPen for a glyph without components.
+
+    Return None if the glyph has an invalid curve format.
+
+    This is a module-level function so that it can be pickled and run in worker
+    processes by OutlineTTFCompiler.compileGlyphs.
+    """
+    pen = TTGlyphPointPen(None)
+    try:
+        for method, args, kwargs in recording:
+            getattr(pen, method)(*args, **kwargs)
+    except NotImplementedError:
+        return None
+    return pen.glyph(
+        dropImpliedOnCurves=dropImpliedOnCurves,
+        round=otRound if roundCoordinates else noRound,
+    )
+
+
+def _buildT2CharStringProgram(item, roundTolerance=0.5, optimize=True):
+    """Build a Type2 charstring program from a (width, recording) tuple, where
+    the recording is a list of (operator, operands) segment pen calls, as
+    recorded by a RecordingPen for a glyph without components.
+
+    This is a module-level function so that it can be pickled and run in worker
+    processes by OutlineOTFCompiler.compileGlyphs.
+    """
+    width, recording = item
+    pen = T2CharStringPen(width, None, roundTolerance=roundTolerance)
+    replayRecording(recording, pen)
+    return pen.getCharString(optimize=optimize).program
+
+
 def _getVerticalOrigin(font, glyph):
     if hasattr(glyph, "verticalOrigin") and glyph.verticalOrigin is not None:
         verticalOrigin = glyph.verticalOrigin
@@ -1299,6 +1344,8 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         ftConfig=None,
         *,
         compilingVFDefaultSource=True,
+        jobs=1,
+        cacheDir=None,
     ):
         if roundTolerance is not None:
             self.roundTolerance = float(roundTolerance)
@@ -1320,6 +1367,8 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         if not isinstance(optimizeCFF, bool):
             optimizeCFF = optimizeCFF >= CFFOptimization.SPECIALIZE
         self.optimizeCFF = optimizeCFF
+        self.jobs = jobs
+        self.glyphCache = DiskCache(cacheDir, "CFF") if cacheDir else None
         self._defaultAndNominalWidths = None
 
     def getDefaultAndNominalWidths(self):
@@ -1351,7 +1400,14 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         return self._defaultAndNominalWidths
 
     def compileGlyphs(self):
-        """Compile and return the CFF T2CharStrings for this font."""
+        """Compile and return the CFF T2CharStrings for this font.
+
+        If a ``cacheDir`` is set, the charstrings of the glyphs without components
+        are looked up in a persistent cache keyed by their outline data, and only
+        the missing ones are built. If the ``jobs`` option is greater than 1, these
+        are built in a pool of worker processes. Neither applies to subclasses that
+        override `getCharStringForGlyph`, which is then called for every glyph.
+        """
         defaultWidth, nominalWidth = self.getDefaultAndNominalWidths()
         # The real PrivateDict will be created later on in setupTable_CFF.
         # For convenience here we use a namespace object to pass the default/nominal
@@ -1359,13 +1415,66 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         private = SimpleNamespace(
             defaultWidthX=defaultWidth, nominalWidthX=nominalWidth
         )
+        if (self.jobs > 1 or self.glyphCache is not None) and (
+            type(self).getCharStringForGlyph
+            is OutlineOTFCompiler.getCharStringForGlyph
+        ):
+            charStrings = self._compileSimpleGlyphs(private)
+        else:
+            charStrings = {}
         compiledGlyphs = {}
         for glyphName in self.glyphOrder:
-            glyph = self.allGlyphs[glyphName]
-            cs = self.getCharStringForGlyph(glyph, private)
+            if glyphName in charStrings:
+                cs = charStrings[glyphName]
+            else:
+                glyph = self.allGlyphs[glyphName]
+                cs = self.getCharStringForGlyph(glyph, private)
             compiledGlyphs[glyphName] = cs
         return compiledGlyphs
 
+    def _compileSimpleGlyphs(self, private):
+        """Build the charstrings of the glyphs that have no components, and
+        return a dict of T2CharStrings keyed by glyph name.
+
+        The glyphs' outlines are recorded as plain segment pen calls, which are
+        hashed to look up the charstring programs in the glyph cache (if any).
+        The missing programs are built in `self.jobs` worker processes, as UFO
+        glyph objects may not be picklable.
+        """
+        cache = self.glyphCache
+        options = (self.roundTolerance, bool(self.optimizeCFF))
+        programs = {}
+        missing = []
+        for glyphName in self.glyphOrder:
+            glyph = self.allGlyphs[glyphName]
+            if glyph.components:
+                continue
+            pen = RecordingPen()
+            glyph.draw(pen)
+            item = (self._getCharStringWidth(glyph, private), pen.value)
+            key = None
+            if cache is not None:
+                key = cache.makeKey(options, item)
+                program = cache.get(key)
+                if program is not None:
+                    programs[glyphName] = program
+                    continue
+            missing.append((glyphName, item, key))
+        buildProgram = partial(
+            _buildT2CharStringProgram,
+            roundTolerance=self.roundTolerance,
+            optimize=self.optimizeCFF,
+        )
+        results = _processPoolMap(buildProgram, [m[1] for m in missing], self.jobs)
+        for (glyphName, _, key), program in zip(missing, results):
+            programs[glyphName] = program
+            if cache is not None:
+                cache.set(key, program)
+        return {
+            glyphName: T2CharString(program=program, private=private)
+            for glyphName, program in programs.items()
+        }
+
     def makeGlyphsBoundingBoxes(self):
         """
         Make bounding boxes for all the glyphs, and return a dictionary of
@@ -1411,6 +1520,16 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         may override this method to handle the charstring creation
         in a different way if desired.
         """
+        width = self._getCharStringWidth(glyph, private)
+        pen = T2CharStringPen(width, self.allGlyphs, roundTolerance=self.roundTolerance)
+        glyph.draw(pen)
+        charString = pen.getCharString(private, globalSubrs, optimize=self.optimizeCFF)
+        return charString
+
+    @staticmethod
+    def _getCharStringWidth(glyph, private):
+        # return the width to encode in the glyph's charstring, or None if it
+        # equals the default width and can be omitted
         width = glyph.width
         defaultWidth = private.defaultWidthX
         nominalWidth = private.nominalWidthX
@@ -1422,10 +1541,7 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
             width -= nominalWidth
         if width is not None:
             width = otRound(width)
-        pen = T2CharStringPen(width, self.allGlyphs, roundTolerance=self.roundTolerance)
-        glyph.draw(pen)
-        charString = pen.getCharString(private, globalSubrs, optimize=self.optimizeCFF)
-        return charString
+        return width
 
     def setupTable_maxp(self):
         """Make the maxp table."""
@@ -1493,7 +1609,7 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         trademark = getAttrWithFallback(info, "trademark")
         if trademark:
             trademark = normalizeStringForPostscript(
-                trademark.replace("\u00A9", "Copyright")
+                trademark.replace("\u00a9", "Copyright")
             )
         if trademark != self.ufo.info.trademark:
             logger.info(
@@ -1508,7 +1624,7 @@ class OutlineOTFCompiler(BaseOutlineCompiler):
         copyright = getAttrWithFallback(info, "copyright")
         if copyright:
             copyright = normalizeStringForPostscript(
-                copyright.replace("\u00A9", "Copyright")
+                copyright.replace("\u00a9", "Copyright")
             )
         if copyright != self.ufo.info.copyright:
             logger.info(
@@ -1642,6 +1758,11 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
         ftConfig=None,
         *,
         compilingVFDefaultSource=True,
+        jobs=1,
+        cacheDir=None,
+        previousFont=None,
+        changedGlyphs=None,
+        previousGlyphOrder=None,
     ):
         super().__init__(
             font,
@@ -1659,6 +1780,11 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
         self.dropImpliedOnCurves = dropImpliedOnCurves
         self.roundCoordinates = roundCoordinates
         self.glyphDataFormat = glyphDataFormat
+        self.jobs = jobs
+        self.glyphCache = DiskCache(cacheDir, "glyf") if cacheDir else None
+        self.previousFont = previousFont
+        self.changedGlyphs = set(changedGlyphs) if changedGlyphs is not None else None
+        self.previousGlyphOrder = previousGlyphOrder
 
     def makeMissingRequiredGlyphs(self, font, glyphSet, sfntVersion, notdefGlyph=None):
         """
@@ -1689,34 +1815,154 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
                         )
 
     def compileGlyphs(self):
-        """Compile and return the TrueType glyphs for this font."""
+        """Compile and return the TrueType glyphs for this font.
+
+        If a ``previousFont`` is set, the glyphs that are not affected by the
+        ``changedGlyphs`` are reused from it (see `getReusableGlyphs`).
+
+        If a ``cacheDir`` is set, the glyphs without components are looked up in
+        a persistent cache keyed by their outline data, and only the missing ones
+        are compiled. If the ``jobs`` option is greater than 1, these are compiled
+        in a pool of worker processes. The composite glyphs are then built in the
+        main process, in increasing component depth order.
+        """
         allGlyphs = self.allGlyphs
-        ttGlyphs = {}
-        round = otRound if self.roundCoordinates else noRound
         glyphDataFormat = self.glyphDataFormat
-        for name in self.glyphOrder:
+        ttGlyphs = self.getReusableGlyphs()
+        glyphNames = [name for name in self.glyphOrder if name not in ttGlyphs]
+        if self.jobs > 1 or self.glyphCache is not None:
+            ttGlyphs.update(self._compileSimpleGlyphs(glyphNames))
+            maxComponentDepths = self.getMaxComponentDepths()
+            glyphNames = sorted(
+                (name for name in glyphNames if name not in ttGlyphs),
+                key=lambda n: maxComponentDepths.get(n, 0),
+            )
+        round = otRound if self.roundCoordinates else noRound
+        for name in glyphNames:
             glyph = allGlyphs[name]
             pen = TTGlyphPointPen(allGlyphs)
             try:
                 glyph.drawPoints(pen)
             except NotImplementedError:
-                logger.error("%r has invalid curve format; skipped", name)
-                ttGlyph = Glyph()
+                ttGlyphs[name] = None
             else:
-                ttGlyph = pen.glyph(
+                ttGlyphs[name] = pen.glyph(
                     dropImpliedOnCurves=self.dropImpliedOnCurves,
                     round=round,
                 )
-                if (
-                    glyphDataFormat == 0
-                    and ttGlyph.numberOfContours > 0
-                    and any(f & flagCubic for f in ttGlyph.flags)
-                ):
-                    raise ValueError(
-                        f"{name!r} has cubic Bezier curves, but glyphDataFormat=0; "
-                        "either convert to quadratic (convertCubics=True) or use "
-                        "allQuadratic=False so that glyphDataFormat=1."
-                    )
+        # return the glyphs in the same order as the glyphOrder
+        result = {}
+        for name in self.glyphOrder:
+            ttGlyph = ttGlyphs[name]
+            if ttGlyph is None:
+                logger.error("%r has invalid curve format; skipped", name)
+                ttGlyph = Glyph()
+            elif (
+                glyphDataFormat == 0
+                and ttGlyph.numberOfContours > 0
+                and any(f & flagCubic for f in ttGlyph.flags)
+            ):
+                raise ValueError(
+                    f"{name!r} has cubic Bezier curves, but glyphDataFormat=0; "
+                    "either convert to quadratic (convertCubics=True) or use "
+                    "allQuadratic=False so that glyphDataFormat=1."
+                )
+            result[name] = ttGlyph
+        return result
+
+    def _compileSimpleGlyphs(self, glyphNames):
+        """Compile the glyphs in `glyphNames` that have no components, and return
+        a dict of TrueType glyphs keyed by glyph name.
+
+        The glyphs' outlines are recorded as plain point pen calls, which are
+        hashed to look up the compiled glyphs in the glyph cache (if any).
+        The missing glyphs are compiled in `self.jobs` worker processes, as UFO
+        glyph objects may not be picklable.
+        Glyphs that fail to draw are skipped and left to the caller.
+        """
+        cache = self.glyphCache
+        options = (self.dropImpliedOnCurves, self.roundCoordinates)
+        ttGlyphs = {}
+        missing = []
+        for name in glyphNames:
+            glyph = self.allGlyphs[name]
+            if glyph.components:
+                continue
+            pen = RecordingPointPen()
+            try:
+                glyph.drawPoints(pen)
+            except NotImplementedError:
+                continue
+            key = None
+            if cache is not None:
+                key = cache.makeKey(options, pen.value)
+                ttGlyph = cache.get(key)
+                if ttGlyph is not None:
+                    ttGlyphs[name] = ttGlyph
+                    continue
+            missing.append((name, pen.value, key))
+        buildGlyph = partial(
+            _buildSimpleTTGlyph,
+            dropImpliedOnCurves=self.dropImpliedOnCurves,
+            roundCoordinates=self.roundCoordinates,
+        )
+        results = _processPoolMap(buildGlyph, [m[1] for m in missing], self.jobs)
+        for (name, _, key), ttGlyph in zip(missing, results):
+            ttGlyphs[name] = ttGlyph
+            if cache is not None and ttGlyph is not None:
+                cache.set(key, ttGlyph)
+        return ttGlyphs
+
+    def getReusableGlyphs(self):
+        """Return a dict of TrueType glyphs from the ``previousFont`` that can be
+        reused as is, keyed by glyph name.
+
+        The previous font must have been compiled from an earlier version of the
+        same glyph set with the same options. Its glyphs are matched by glyph
+        ID, as they may have been renamed when post-processing: the glyph order
+        it was compiled from, before renaming, can be given as
+        ``previousGlyphOrder``, else its current glyph order is used. All the
+        glyphs are reused except the ``changedGlyphs`` and the composite glyphs
+        that reference them (the caller should also include the glyphs that
+        were decomposed by filters). If the previous font's glyph order or
+        advance widths don't match, nothing is reused.
+        """
+        previous = self.previousFont
+        if previous is None or "glyf" not in previous:
+            return {}
+        previousGlyphOrder = previous.getGlyphOrder()
+        sourceGlyphOrder = self.previousGlyphOrder
+        if sourceGlyphOrder is None:
+            sourceGlyphOrder = previousGlyphOrder
+        if list(sourceGlyphOrder) != list(self.glyphOrder):
+            logger.info("Previous font has a different glyph order; can't reuse it")
+            return {}
+        nameMap = dict(zip(previousGlyphOrder, self.glyphOrder))
+        if self.changedGlyphs is None:
+            affected = set(self.glyphOrder)
+        else:
+            affected = closeGlyphsOverComponents(self.allGlyphs, self.changedGlyphs)
+        previousGlyf = previous["glyf"]
+        previousMetrics = previous["hmtx"].metrics
+        ttGlyphs = {}
+        for previousName, name in nameMap.items():
+            if name in affected:
+                continue
+            if previousMetrics[previousName][0] != otRound(self.allGlyphs[name].width):
+                logger.info(
+                    "Advance width of unchanged glyph %r differs from previous font; "
+                    "can't reuse it",
+                    name,
+                )
+                return {}
+            # copy the glyph via its binary data, which is cheap to get if the
+            # previous glyph was not expanded (e.g. the font was loaded lazily)
+            previousGlyph = previousGlyf.glyphs[previousName]
+            ttGlyph = Glyph(previousGlyph.compile(previousGlyf, recalcBBoxes=False))
+            ttGlyph.expand(previousGlyf)
+            if ttGlyph.isComposite():
+                for component in ttGlyph.components:
+                    component.glyphName = nameMap[component.glyphName]
             ttGlyphs[name] = ttGlyph
         return ttGlyphs
 
@@ -1747,12 +1993,8 @@ class OutlineTTFCompiler(BaseOutlineCompiler):
         """
         if self._maxComponentDepths:
             return self._maxComponentDepths
-        maxComponentDepths = dict()
-        for name, glyph in self.allGlyphs.items():
-            depth = getMaxComponentDepth(glyph, self.allGlyphs)
-            if depth > 0:
-                maxComponentDepths[name] = depth
-        self._maxComponentDepths = maxComponentDepths
+        componentGraph = getComponentGraph(self.allGlyphs)
+        self._maxComponentDepths = componentGraph.getMaxComponentDepths()
         return self._maxComponentDepths
 
     def setupTable_maxp(self):
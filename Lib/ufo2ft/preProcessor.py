@@ -75,6 +75,14 @@ class BasePreProcessor:
     insert additional filters before or after those already defined in the
     UFO lib, as opposed to discard/replace them which is the default behavior
     when ``...`` is absent.
+
+    If ``jobs`` is greater than 1, the filters that only modify each glyph
+    independently of the others (e.g. removing overlaps) are run on batches
+    of glyphs in a pool of ``jobs`` worker processes.
+
+    If ``glyphNames`` is given, only these glyphs are processed, together with
+    the glyphs they reference as components (which some filters need, e.g. for
+    decomposing them); the returned glyphset only contains these glyphs.
     """
 
     def __init__(
@@ -84,13 +92,21 @@ class BasePreProcessor:
         layerName=None,
         skipExportGlyphs=None,
         filters=None,
+        *,
+        jobs=1,
+        glyphNames=None,
         **kwargs,
     ):
         self.ufo = ufo
         self.inplace = inplace
+        self.jobs = jobs
         self.layerName = layerName
         self.glyphSet = _GlyphSet.from_layer(
-            ufo, layerName, copy=not inplace, skipExportGlyphs=skipExportGlyphs
+            ufo,
+            layerName,
+            copy=not inplace,
+            skipExportGlyphs=skipExportGlyphs,
+            glyphNames=glyphNames,
         )
         self.defaultFilters = self.initDefaultFilters(**kwargs)
 
@@ -105,10 +121,18 @@ class BasePreProcessor:
         ufo = self.ufo
         glyphSet = self.glyphSet
         for func in self.preFilters + self.defaultFilters + self.postFilters:
-            func(ufo, glyphSet)
+            _run_filter(func, ufo, glyphSet, self.jobs)
         return glyphSet
 
 
+def _run_filter(filter_, ufo, glyphSet, jobs):
+    # only glyph-local filters can be run in parallel, custom filters may not
+    # even accept the 'jobs' argument
+    if jobs > 1 and getattr(filter_, "_glyph_local", False):
+        return filter_(ufo, glyphSet, jobs=jobs)
+    return filter_(ufo, glyphSet)
+
+
 def _init_explode_color_layer_glyphs_filter(ufo, filters):
     # Initialize ExplodeColorLayerGlyphsFilter, which copies color glyph layers
     # as standalone glyphs to the default glyph set (for building COLR table), if the
@@ -193,6 +217,11 @@ class TTFPreProcessor(OTFPreProcessor):
     type "quadratic" is saved in font' lib under a private cu2qu key; the
     preprocessor will not try to convert them again if the curve type is
     already set to "quadratic".
+
+    If a ``cacheDir`` is set, the results of the curve conversion are stored
+    in a persistent cache in that directory, keyed by the cubic contours of
+    each glyph and the conversion options, so that unchanged glyphs are not
+    converted again in subsequent builds.
     """
 
     def initDefaultFilters(
@@ -205,6 +234,7 @@ class TTFPreProcessor(OTFPreProcessor):
         allQuadratic=True,
         reverseDirection=True,
         rememberCurveType=True,
+        cacheDir=None,
     ):
         filters = []
 
@@ -236,6 +266,7 @@ class TTFPreProcessor(OTFPreProcessor):
                     reverseDirection=reverseDirection,
                     rememberCurveType=rememberCurveType and self.inplace,
                     allQuadratic=allQuadratic,
+                    cacheDir=cacheDir,
                 )
             )
         elif reverseDirection:
@@ -256,6 +287,9 @@ class BaseInterpolatablePreProcessor:
     The optional `instantiator` can be used by filters to interpolate glyph
     instances (e.g. when decomposing composite glyphs defined at more or less
     source locations as some of their components' base glyphs).
+
+    The optional `jobs` works as in the ``BasePreProcessor``, for the filters
+    that are applied to each source layer individually.
     """
 
     def __init__(
@@ -267,10 +301,12 @@ class BaseInterpolatablePreProcessor:
         filters=None,
         *,
         instantiator: Instantiator | None = None,
+        jobs: int = 1,
         **kwargs,
     ):
         self.ufos = ufos
         self.inplace = inplace
+        self.jobs = jobs
 
         if layerNames is None:
             layerNames = [None] * len(ufos)
@@ -316,17 +352,19 @@ class BaseInterpolatablePreProcessor:
                 self._run(*filters)
         return self.glyphSets
 
-    def _update_instantiator(self):
+    def _update_instantiator(self, modified: set[str] | None = None):
         # the instantiator's source layers must be updated after each filter is run,
-        # since each filter can modify/remove/add glyphs.
+        # since each filter can modify/remove/add glyphs. Only the glyph models of
+        # the 'modified' glyphs (and of the composites using them) are reset, or
+        # all of them if None.
         if self.instantiator is not None:
-            self.instantiator.replace_source_layers(self.glyphSets)
+            self.instantiator.replace_source_layers(self.glyphSets, modified)
 
     def _run_interpolatable(self, filter_: BaseIFilter) -> set[str]:
         # apply a single, interpolatable filter to all the glyphSets
         modified = filter_(self.ufos, self.glyphSets, self.instantiator)
         if modified:
-            self._update_instantiator()
+            self._update_instantiator(modified)
         return modified
 
     @staticmethod
@@ -391,9 +429,9 @@ class BaseInterpolatablePreProcessor:
         modified = set()
         for filter_, ufo, glyphSet in zip_strict(filters, self.ufos, self.glyphSets):
             if filter_ is not None:
-                modified |= filter_(ufo, glyphSet)
+                modified |= _run_filter(filter_, ufo, glyphSet, self.jobs)
         if modified:
-            self._update_instantiator()
+            self._update_instantiator(modified)
         return modified
 
 
@@ -415,9 +453,10 @@ class TTFInterpolatablePreProcessor(BaseInterpolatablePreProcessor):
     be interpolation compatible, depending on the particular filter used or
     whether they are applied to only some vs all of the UFOs.
 
-    The ``conversionError``, ``reverseDirection``, ``flattenComponents`` and
-    ``rememberCurveType`` arguments work in the same way as in the
-    ``TTFPreProcessor``.
+    The ``conversionError``, ``reverseDirection``, ``flattenComponents``,
+    ``rememberCurveType`` and ``cacheDir`` arguments work in the same way as in
+    the ``TTFPreProcessor``; the cached conversion results are keyed by the
+    cubic contours of each glyph across all the masters.
     """
 
     def __init__(
@@ -435,6 +474,8 @@ class TTFInterpolatablePreProcessor(BaseInterpolatablePreProcessor):
         allQuadratic=True,
         *,
         instantiator: Instantiator | None = None,
+        cacheDir=None,
+        jobs: int = 1,
         **kwargs,
     ):
         from fontTools.cu2qu.ufo import DEFAULT_MAX_ERR
@@ -446,6 +487,7 @@ class TTFInterpolatablePreProcessor(BaseInterpolatablePreProcessor):
             skipExportGlyphs=skipExportGlyphs,
             filters=filters,
             instantiator=instantiator,
+            jobs=jobs,
             **kwargs,
         )
         self.flattenComponents = flattenComponents
@@ -458,9 +500,10 @@ class TTFInterpolatablePreProcessor(BaseInterpolatablePreProcessor):
         self._reverseDirection = reverseDirection
         self._rememberCurveType = rememberCurveType
         self.allQuadratic = allQuadratic
+        self.cacheDir = cacheDir
 
     def process(self):
-        from fontTools.cu2qu.ufo import fonts_to_quadratic
+        from ufo2ft.filters.cubicToQuadratic import fontsToQuadratic
 
         # first apply all custom pre-filters
         for funcs in itertools.zip_longest(*self.preFilters):
@@ -485,15 +528,16 @@ class TTFInterpolatablePreProcessor(BaseInterpolatablePreProcessor):
             self._run(*funcs)
 
         if self.convertCubics:
-            if fonts_to_quadratic(
+            modified = fontsToQuadratic(
                 self.glyphSets,
-                max_err=self._conversionErrors,
-                reverse_direction=self._reverseDirection,
-                dump_stats=True,
-                remember_curve_type=self._rememberCurveType and self.inplace,
-                all_quadratic=self.allQuadratic,
-            ):
-                self._update_instantiator()
+                self._conversionErrors,
+                reverseDirection=self._reverseDirection,
+                rememberCurveType=self._rememberCurveType and self.inplace,
+                allQuadratic=self.allQuadratic,
+                cacheDir=self.cacheDir,
+            )
+            if modified:
+                self._update_instantiator(modified)
         elif self._reverseDirection:
             from ufo2ft.filters.reverseContourDirection import (
                 ReverseContourDirectionFilter,
@@ -4,6 +4,9 @@ import importlib
 import logging
 import re
 import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from functools import partial
 from inspect import currentframe, getfullargspec
@@ -17,6 +20,8 @@ from fontTools.misc.transform import Identity
 from fontTools.pens.filterPen import DecomposingFilterPointPen
 from fontTools.pens.reverseContourPen import ReverseContourPen
 from fontTools.pens.transformPen import TransformPen
+from fontTools.ttLib.tables import otTables
+from fontTools.unicodedata import ScriptExtensions, Scripts
 
 from ufo2ft.constants import OPENTYPE_CATEGORIES_KEY, UNICODE_SCRIPT_ALIASES
 from ufo2ft.errors import InvalidDesignSpaceData, InvalidFontData
@@ -85,18 +90,28 @@ def decomposeCompositeGlyph(
 
 class _GlyphSet(dict):
     @classmethod
-    def from_layer(cls, font, layerName=None, copy=False, skipExportGlyphs=None):
-        """Return a mapping of glyph names to glyph objects from `font`."""
+    def from_layer(
+        cls, font, layerName=None, copy=False, skipExportGlyphs=None, glyphNames=None
+    ):
+        """Return a mapping of glyph names to glyph objects from `font`.
+
+        If `glyphNames` is given, only include these glyphs and the glyphs they
+        reference as components, either directly or through nested components.
+        """
         if layerName is not None:
             layer = font.layers[layerName]
         else:
             layer = font.layers.defaultLayer
 
+        glyphs = layer
+        if glyphNames is not None:
+            glyphs = [layer[name] for name in _closeOverComponents(layer, glyphNames)]
+
         if copy:
-            self = _copyLayer(layer, obj_type=cls)
+            self = _copyLayer(glyphs, obj_type=cls)
             self.lib = deepcopy(layer.lib)
         else:
-            self = cls((g.name, g) for g in layer)
+            self = cls((g.name, g) for g in glyphs)
             self.lib = layer.lib
         self.name = layer.name if layerName is not None else None
 
@@ -110,6 +125,23 @@ class _GlyphSet(dict):
         return self
 
 
+def _closeOverComponents(layer, glyphNames):
+    # the glyphs in the given layer (or glyph set) with the given names, plus those
+    # referenced as components by them, in the layer's order
+    result = set()
+    stack = [name for name in glyphNames if name in layer]
+    while stack:
+        glyphName = stack.pop()
+        if glyphName not in result:
+            result.add(glyphName)
+            stack.extend(
+                component.baseGlyph
+                for component in layer[glyphName].components
+                if component.baseGlyph in layer
+            )
+    return [name for name in layer.keys() if name in result]
+
+
 def _copyLayer(layer, obj_type=dict):
     try:
         g = next(iter(layer))
@@ -293,14 +325,205 @@ def compileGDEF(featureFile, glyphOrder):
 
 
 def closeGlyphsOverGSUB(gsub, glyphs):
-    """Use the FontTools subsetter to perform a closure over the GSUB table
-    given the initial `glyphs` (set of glyph names, str). Update the set
-    in-place adding all the glyph names that can be reached via GSUB
-    substitutions from this initial set.
+    """Perform a closure over the GSUB table given the initial `glyphs` (set of
+    glyph names, str). Update the set in-place adding all the glyph names that
+    can be reached via GSUB substitutions from this initial set.
     """
-    subsetter = subset.Subsetter()
-    subsetter.glyphs = glyphs
-    gsub.closure_glyphs(subsetter)
+    glyphs.update(getGSUBClosure(gsub).closeGlyphs(glyphs))
+
+
+class GSUBClosure:
+    """An index of the substitutions in a GSUB table, to find the glyphs that
+    can be reached via GSUB substitutions from many sets of glyphs.
+
+    The single, multiple, alternate and ligature substitutions of the lookups
+    referenced by the features are indexed once as a graph mapping each glyph
+    to the glyphs it can be substituted with (a ligature being reached once all
+    its components are), so closures are computed by traversing the graph
+    instead of walking the whole GSUB each time.
+
+    The contextual substitutions also depend on the glyphs around the
+    substituted ones. When the GSUB contains any of these, the FontTools
+    subsetter computes the closure of the union of all the sets once, and the
+    glyphs it finds are assigned to each set that can reach them via the
+    lookups which the contextual ones reference, regardless of their context.
+
+    The table must not be modified after the index is built. Use `getGSUBClosure`
+    to get the index shared by all the feature writers using the same GSUB.
+    """
+
+    def __init__(self, gsub):
+        self.gsub = gsub
+        # glyph name => set of the names of the glyphs it can be substituted with
+        self._substitutions = {}
+        # glyph name => list of (components, ligature glyph name) of the
+        # ligatures it is a component of
+        self._ligatures = {}
+        # whether some substitutions depend on their context
+        self._contextual = False
+        table = gsub.table
+        if not table.LookupList:
+            return
+        lookupIndices = self._collectLookups(table)
+        for lookupIndex in lookupIndices:
+            self._indexLookup(table, lookupIndex, self._substitutions, self._ligatures)
+        if not self._contextual:
+            return
+        # the same including the substitutions of the contextual lookups (and of
+        # the lookups they reference), as if their context was always matched
+        self._contextSubstitutions = {
+            glyph: set(substs) for glyph, substs in self._substitutions.items()
+        }
+        self._contextLigatures = {
+            glyph: list(ligatures) for glyph, ligatures in self._ligatures.items()
+        }
+        for lookupIndex in table.LookupList.closure_lookups(lookupIndices):
+            if lookupIndex not in lookupIndices:
+                self._indexLookup(
+                    table,
+                    lookupIndex,
+                    self._contextSubstitutions,
+                    self._contextLigatures,
+                )
+        for st in self._iterSubTables(table, lookupIndices):
+            if isinstance(st, otTables.ReverseChainSingleSubst):
+                for glyph, subst in zip(st.Coverage.glyphs, st.Substitute):
+                    self._contextSubstitutions.setdefault(glyph, set()).add(subst)
+
+    @staticmethod
+    def _collectLookups(table):
+        # the lookups that the subsetter considers for the closure
+        if table.ScriptList:
+            featureIndices = table.ScriptList.collect_features()
+        else:
+            featureIndices = []
+        if table.FeatureList:
+            lookupIndices = table.FeatureList.collect_lookups(featureIndices)
+        else:
+            lookupIndices = []
+        if getattr(table, "FeatureVariations", None):
+            lookupIndices += table.FeatureVariations.collect_lookups(featureIndices)
+        return sorted({i for i in lookupIndices if i < table.LookupList.LookupCount})
+
+    @staticmethod
+    def _iterSubTables(table, lookupIndices):
+        for lookupIndex in lookupIndices:
+            lookup = table.LookupList.Lookup[lookupIndex]
+            if not lookup:
+                continue
+            for st in lookup.SubTable:
+                if not st:
+                    continue
+                if lookup.LookupType == 7:
+                    st = st.ExtSubTable
+                yield st
+
+    def _indexLookup(self, table, lookupIndex, substitutions, ligatures):
+        for st in self._iterSubTables(table, [lookupIndex]):
+            if isinstance(st, otTables.SingleSubst):
+                for glyph, subst in st.mapping.items():
+                    substitutions.setdefault(glyph, set()).add(subst)
+            elif isinstance(st, otTables.MultipleSubst):
+                for glyph, subst in st.mapping.items():
+                    substitutions.setdefault(glyph, set()).update(subst)
+            elif isinstance(st, otTables.AlternateSubst):
+                for glyph, alternates in st.alternates.items():
+                    substitutions.setdefault(glyph, set()).update(alternates)
+            elif isinstance(st, otTables.LigatureSubst):
+                for glyph, ligs in st.ligatures.items():
+                    for lig in ligs:
+                        components = (glyph, *lig.Component)
+                        for component in set(components):
+                            ligatures.setdefault(component, []).append(
+                                (components, lig.LigGlyph)
+                            )
+            else:
+                self._contextual = True
+
+    def closeGlyphs(self, glyphs):
+        """Return a new set containing the given `glyphs` (set of glyph names,
+        str) plus all the glyph names that can be reached via GSUB substitutions
+        from them.
+        """
+        return self.closeGlyphSets([glyphs])[0]
+
+    def closeGlyphSets(self, glyphSets):
+        """Like `closeGlyphs`, but for a list of sets of glyph names; return a
+        list of new sets, one for each of the given ones.
+
+        The substitution graph is traversed only once for all the sets, each
+        glyph being labeled with the sets it can be reached from.
+        """
+        if not self._contextual:
+            return self._closeGlyphSets(glyphSets, self._substitutions, self._ligatures)
+
+        subsetter = subset.Subsetter()
+        subsetter.glyphs = set().union(*glyphSets)
+        self.gsub.closure_glyphs(subsetter)
+        return [
+            glyphs & subsetter.glyphs
+            for glyphs in self._closeGlyphSets(
+                glyphSets, self._contextSubstitutions, self._contextLigatures
+            )
+        ]
+
+    @staticmethod
+    def _closeGlyphSets(glyphSets, substitutions, ligatures):
+        # glyph name => bit mask of the indices of the sets it belongs to
+        labels = {}
+        for i, glyphs in enumerate(glyphSets):
+            bit = 1 << i
+            for glyph in glyphs:
+                labels[glyph] = labels.get(glyph, 0) | bit
+        # the glyphs whose sets grew, to propagate to the glyphs they reach
+        stack = list(labels)
+        while stack:
+            glyph = stack.pop()
+            mask = labels[glyph]
+            for subst in substitutions.get(glyph, ()):
+                substMask = labels.get(subst, 0)
+                if mask & ~substMask:
+                    labels[subst] = substMask | mask
+                    stack.append(subst)
+            for components, lig in ligatures.get(glyph, ()):
+                # the sets that contain all the components of the ligature
+                ligMask = mask
+                for component in components:
+                    ligMask &= labels.get(component, 0)
+                    if not ligMask:
+                        break
+                substMask = labels.get(lig, 0)
+                if ligMask & ~substMask:
+                    labels[lig] = substMask | ligMask
+                    stack.append(lig)
+
+        result = [set() for _ in glyphSets]
+        for glyph, mask in labels.items():
+            for i, glyphs in enumerate(result):
+                if mask & (1 << i):
+                    glyphs.add(glyph)
+        return result
+
+
+def getGSUBClosure(gsub):
+    """Return the GSUBClosure index of the given GSUB table (a fontTools table
+    object).
+
+    The index is stored on the table object, so that it is built only once for
+    all the feature writers that classify glyphs using the same GSUB table.
+    """
+    closure = getattr(gsub, "_glyphClosure", None)
+    if closure is None or closure.gsub is not gsub:
+        closure = gsub._glyphClosure = GSUBClosure(gsub)
+    return closure
+
+
+def closeGlyphsOverComponents(glyphSet, glyphs):
+    """Return a new set containing the given `glyphs` (set of glyph names, str)
+    plus all the glyphs from `glyphSet` that reference any of them as components,
+    either directly or through nested components.
+    """
+    return getComponentGraph(glyphSet).closeOverComposites(glyphs)
 
 
 def classifyGlyphs(unicodeFunc, cmap, gsub=None, extra_substitutions=None):
@@ -331,13 +554,16 @@ def classifyGlyphs(unicodeFunc, cmap, gsub=None, extra_substitutions=None):
             glyphSets.setdefault(key_or_keys, set()).add(glyphName)
 
     if gsub is not None:
+        closure = getGSUBClosure(gsub)
         if neutralGlyphs:
-            closeGlyphsOverGSUB(gsub, neutralGlyphs)
+            neutralGlyphs = closure.closeGlyphs(neutralGlyphs)
 
-        for glyphs in glyphSets.values():
-            s = glyphs | neutralGlyphs
-            closeGlyphsOverGSUB(gsub, s)
-            glyphs.update(s - neutralGlyphs)
+        keys = list(glyphSets)
+        closedSets = closure.closeGlyphSets(
+            [glyphSets[key] | neutralGlyphs for key in keys]
+        )
+        for key, s in zip(keys, closedSets):
+            glyphSets[key].update(s - neutralGlyphs)
 
     if extra_substitutions:
         for glyphs in glyphSets.values():
@@ -349,28 +575,111 @@ def classifyGlyphs(unicodeFunc, cmap, gsub=None, extra_substitutions=None):
     return glyphSets
 
 
+# we consider the 'Common' and 'Inherited' scripts as neutral for
+# determining a script horizontal direction
+DFLT_SCRIPTS = {"Zyyy", "Zinh"}
+
+
+RTL_BIDI_TYPES = {"R", "AL"}
+LTR_BIDI_TYPES = {"L", "AN", "EN"}
+
+
+class UnicodeProperties:
+    """Table of the Unicode properties that the feature writers look up for
+    each codepoint of a font: the (aliased) script extensions, the horizontal
+    direction of the script and the bidi type.
+
+    The script properties are stored as arrays of ranges, one entry for each
+    run of codepoints sharing the same Script and Script_Extensions values,
+    which are looked up with bisect. The bidi types are not available as
+    ranges, so they are memoized per codepoint as they get requested.
+    """
+
+    def __init__(self, aliases=UNICODE_SCRIPT_ALIASES):
+        starts = sorted(set(Scripts.RANGES).union(ScriptExtensions.RANGES))
+        self.starts = array("L", starts)
+        self.scriptExtensions = []
+        self.scriptDirections = []
+        interned = {}
+        for start in starts:
+            char = chr(start)
+            extensions = frozenset(
+                aliases.get(s, s) for s in unicodedata.script_extension(char)
+            )
+            self.scriptExtensions.append(interned.setdefault(extensions, extensions))
+            script = unicodedata.script(char)
+            if script in DFLT_SCRIPTS:
+                direction = None
+            else:
+                direction = unicodedata.script_horizontal_direction(script, "LTR")
+            self.scriptDirections.append(direction)
+        self.bidiTypes = {}
+
+    def getScriptExtensions(self, codepoint):
+        """Return the frozenset of script extensions of the codepoint."""
+        return self.scriptExtensions[bisect_right(self.starts, codepoint) - 1]
+
+    def getScriptDirection(self, codepoint):
+        """Return "LTR" or "RTL" for the script of the codepoint, or None for
+        the 'Common' and 'Inherited' scripts.
+        """
+        return self.scriptDirections[bisect_right(self.starts, codepoint) - 1]
+
+    def getBidiType(self, codepoint):
+        """Return "R" for RTL bidi types, "L" for LTR ones (whether 'strong' or
+        'weak'), or None for neutral ones.
+        """
+        try:
+            return self.bidiTypes[codepoint]
+        except KeyError:
+            pass
+        bidiType = unicodedata.bidirectional(chr(codepoint))
+        if bidiType in RTL_BIDI_TYPES:
+            result = "R"
+        elif bidiType in LTR_BIDI_TYPES:
+            result = "L"
+        else:
+            result = None
+        self.bidiTypes[codepoint] = result
+        return result
+
+
+_unicodeProperties = None
+
+
+def getUnicodeProperties():
+    """Return the UnicodeProperties table for the default script aliases.
+
+    The table is built on first use and shared by the whole process, so that
+    all the feature writers and all the masters look up the same one.
+    """
+    global _unicodeProperties
+    if _unicodeProperties is None:
+        _unicodeProperties = UnicodeProperties()
+    return _unicodeProperties
+
+
 def unicodeInScripts(uv, scripts):
     """Check UnicodeData's ScriptExtension property for unicode codepoint
     'uv' and return True if it intersects with the set of 'scripts' provided,
     False if it does not intersect.
     Return None for 'Common' script ('Zyyy').
     """
-    sx = unicodeScriptExtensions(uv)
+    sx = getUnicodeProperties().getScriptExtensions(uv)
     if "Zyyy" in sx:
         return None
     return not sx.isdisjoint(scripts)
 
 
-# we consider the 'Common' and 'Inherited' scripts as neutral for
-# determining a script horizontal direction
-DFLT_SCRIPTS = {"Zyyy", "Zinh"}
+def unicodeScriptDirection(uv):
+    return getUnicodeProperties().getScriptDirection(uv)
 
 
-def unicodeScriptDirection(uv):
-    sc = unicodedata.script(chr(uv))
-    if sc in DFLT_SCRIPTS:
-        return None
-    return unicodedata.script_horizontal_direction(sc, "LTR")
+def unicodeBidiType(uv):
+    """Return "R" for characters with RTL direction, or "L" for LTR (whether
+    'strong' or 'weak'), or None for neutral direction.
+    """
+    return getUnicodeProperties().getBidiType(uv)
 
 
 def calcCodePageRanges(unicodes):
@@ -381,7 +690,7 @@ def calcCodePageRanges(unicodes):
     """
     codepageRanges = set()
 
-    chars = [chr(u) for u in unicodes]
+    chars = {chr(u) for u in unicodes}
 
     hasAscii = set(range(0x20, 0x7E)).issubset(unicodes)
     hasLineart = "┤" in chars
@@ -673,6 +982,154 @@ def getMaxComponentDepth(
     return maxComponentDepth
 
 
+class ComponentGraph:
+    """An index of the component references between the glyphs of a glyph set.
+
+    It maps each glyph to the composite glyphs that reference it, and caches the
+    max component depth of each glyph (see `getMaxComponentDepth`).
+
+    The glyphs may be modified after the graph is built: the `update` method
+    finds the glyphs whose components were added, removed or changed, and only
+    invalidates the cached depths of those and of the composites referencing
+    them. Use `getComponentGraph` to get the graph shared by all the filters and
+    compilers that process the same glyph set.
+    """
+
+    def __init__(self, glyphSet):
+        self.glyphSet = glyphSet
+        # glyph name => tuple of the glyph's component base glyph names
+        self._baseGlyphs = {}
+        # base glyph name => set of the names of the glyphs that reference it
+        self._composites = {}
+        self._depths = {}
+        self.update()
+
+    def update(self):
+        """Update the graph after the glyphs in the glyph set were modified.
+
+        Return the set of names of the glyphs whose components changed.
+        """
+        glyphSet = self.glyphSet
+        baseGlyphs = self._baseGlyphs
+        changed = {name for name in baseGlyphs if name not in glyphSet}
+        for glyphName in changed:
+            self._setBaseGlyphs(glyphName, None)
+        for glyphName, glyph in glyphSet.items():
+            bases = tuple(component.baseGlyph for component in glyph.components)
+            if baseGlyphs.get(glyphName) != bases:
+                self._setBaseGlyphs(glyphName, bases)
+                changed.add(glyphName)
+        if changed and self._depths:
+            for glyphName in self.closeOverComposites(changed):
+                self._depths.pop(glyphName, None)
+        return changed
+
+    def _setBaseGlyphs(self, glyphName, bases):
+        for baseGlyph in set(self._baseGlyphs.pop(glyphName, ())):
+            composites = self._composites[baseGlyph]
+            composites.discard(glyphName)
+            if not composites:
+                del self._composites[baseGlyph]
+        if bases is not None:
+            self._baseGlyphs[glyphName] = bases
+            for baseGlyph in bases:
+                self._composites.setdefault(baseGlyph, set()).add(glyphName)
+
+    def closeOverComposites(self, glyphNames):
+        """Return a new set containing the given glyph names plus those of all the
+        glyphs that reference any of them as components, either directly or
+        through nested components.
+        """
+        result = set()
+        stack = list(glyphNames)
+        while stack:
+            glyphName = stack.pop()
+            if glyphName not in result:
+                result.add(glyphName)
+                stack.extend(self._composites.get(glyphName, ()))
+        return result
+
+    def getMaxComponentDepth(self, glyphName):
+        """Return the height of a glyph's tree of components, like the
+        `getMaxComponentDepth` function does for a glyph object.
+
+        Raises InvalidFontData if a cyclical component reference is detected.
+        """
+        depth = self._depths.get(glyphName)
+        if depth is None:
+            depth = self._depths[glyphName] = self._computeDepth(glyphName, [])
+        return depth
+
+    def getMaxComponentDepths(self):
+        """Return a dictionary of non zero max component depths keyed by the names
+        of the composite glyphs.
+        """
+        result = {}
+        for glyphName, bases in self._baseGlyphs.items():
+            if bases:
+                result[glyphName] = self.getMaxComponentDepth(glyphName)
+        return result
+
+    def _computeDepth(self, glyphName, stack):
+        bases = self._baseGlyphs.get(glyphName)
+        if not bases:
+            return 0
+        stack.append(glyphName)
+        depth = 0
+        for baseGlyph in bases:
+            if baseGlyph in stack:
+                raise InvalidFontData(
+                    f"cyclical component reference:"
+                    f" {' -> '.join(stack)} => {baseGlyph}"
+                )
+            baseDepth = self._depths.get(baseGlyph)
+            if baseDepth is None:
+                baseDepth = self._depths[baseGlyph] = self._computeDepth(
+                    baseGlyph, stack
+                )
+            depth = max(depth, baseDepth)
+        stack.pop()
+        return depth + 1
+
+
+def getComponentGraph(glyphSet):
+    """Return the ComponentGraph of the given glyph set (dict of glyph objects),
+    updated to reflect its current glyphs.
+
+    The graph is stored on glyph set objects that support it (e.g. the ones
+    returned by `_GlyphSet.from_layer`), so that it is shared and only updated
+    incrementally by all the filters and compilers that use the same glyph set;
+    for other mappings, e.g. a plain dict, a new graph is built every time.
+    """
+    graph = getattr(glyphSet, "_componentGraph", None)
+    if graph is not None and graph.glyphSet is glyphSet:
+        graph.update()
+        return graph
+    graph = ComponentGraph(glyphSet)
+    try:
+        glyphSet._componentGraph = graph
+    except AttributeError:
+        pass
+    return graph
+
+
+def _processPoolMap(func, iterable, jobs):
+    """Like the builtin map(), but call `func` in a pool of `jobs` worker processes.
+
+    Both `func` and the items in `iterable` must be picklable. The results are
+    returned as a list in the same order as the input items. If `jobs` is less
+    than 2, or there is at most one item, `func` is called in the current process.
+    """
+    items = list(iterable)
+    if not jobs or jobs < 2 or len(items) < 2:
+        return [func(item) for item in items]
+    jobs = min(jobs, len(items))
+    # send items to the workers in batches to amortize the cost of pickling
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+
 def location_to_string(location):
     """Reports a designspace location (dictionary mapping axis:loc)
     in a user-friendly way"""
@@ -689,6 +1146,8 @@ def unicodeScriptExtensions(
     is being able to kern Hiragana and Katakana against each other, Unicode
     defines "Hrkt" as an alias for both scripts.
     """
+    if aliases is UNICODE_SCRIPT_ALIASES:
+        return set(getUnicodeProperties().getScriptExtensions(codepoint))
     return {aliases.get(s, s) for s in unicodedata.script_extension(chr(codepoint))}
 
 
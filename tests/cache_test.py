@@ -0,0 +1,46 @@
+import pickle
+
+import ufo2ft
+from ufo2ft.cache import DiskCache
+
+
+def test_makeKey():
+    key = DiskCache.makeKey("a", (1, 2.5), [("moveTo", ((0, 0),))])
+    assert key == DiskCache.makeKey("a", (1, 2.5), [("moveTo", ((0, 0),))])
+    assert key != DiskCache.makeKey("a", (1, 2.0), [("moveTo", ((0, 0),))])
+
+
+def test_makeKey_ufo2ft_version(monkeypatch):
+    key = DiskCache.makeKey("a")
+    monkeypatch.setattr(ufo2ft, "__version__", "999.0.0")
+    assert DiskCache.makeKey("a") != key
+
+
+def test_get_set(tmp_path):
+    cache = DiskCache(tmp_path, "test")
+    key = cache.makeKey("foo")
+    assert cache.get(key) is None
+    assert cache.get(key, default=0) == 0
+
+    cache.set(key, {"foo": [1, 2, 3]})
+    assert cache.get(key) == {"foo": [1, 2, 3]}
+
+    # a new cache object pointing to the same directory sees the stored entries
+    assert DiskCache(tmp_path, "test").get(key) == {"foo": [1, 2, 3]}
+    # but entries are grouped by namespace
+    assert DiskCache(tmp_path, "other").get(key) is None
+
+    cache.set(key, "bar")
+    assert cache.get(key) == "bar"
+
+
+def test_get_invalid_entry(tmp_path, caplog):
+    cache = DiskCache(tmp_path, "test")
+    key = cache.makeKey("foo")
+    cache.set(key, "bar")
+    path = cache._entryPath(key)
+    with open(path, "wb") as f:
+        f.write(pickle.dumps("bar")[:-2])
+
+    assert cache.get(key) is None
+    assert "Ignoring invalid cache entry" in caplog.text
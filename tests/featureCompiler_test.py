@@ -1,3 +1,4 @@
+import io
 import logging
 import re
 from textwrap import dedent
@@ -312,6 +313,118 @@ class FeatureCompilerTest:
             if tmpfile is not None:
                 tmpfile.remove(ignore_errors=True)
 
+    def test_buildTables_from_featureFile(self, FontClass, monkeypatch):
+        ufo = FontClass()
+        for name in ("a", "v", "w"):
+            ufo.newGlyph(name)
+        ufo.groups.update({"public.kern1.a": ["a"], "public.kern2.vw": ["v", "w"]})
+        ufo.kerning.update({("public.kern1.a", "public.kern2.vw"): -40})
+
+        def fromString(*args, **kwargs):
+            raise AssertionError("features should be built from the AST")
+
+        monkeypatch.setattr(
+            "ufo2ft.featureCompiler.addOpenTypeFeaturesFromString", fromString
+        )
+        compiler = FeatureCompiler(ufo)
+        ttFont = compiler.compile()
+
+        assert "GPOS" in ttFont
+        pairPos = ttFont["GPOS"].table.LookupList.Lookup[0].SubTable[0]
+        assert pairPos.Format == 2
+        assert pairPos.ClassDef2.classDefs == {"v": 1, "w": 1}
+        # the feature text is still available, generated from the AST
+        assert "@kern2.Default.vw = [v w];" in compiler.features
+
+    def test_buildTables_useExtension(self, FontClass):
+        ufo = FontClass()
+        for name in ("a", "b", "b.alt"):
+            ufo.newGlyph(name)
+        ufo.features.text = dedent(
+            """\
+            lookup kern_ext useExtension {
+                pos a b -10;
+            } kern_ext;
+            lookup salt_ext useExtension {
+                sub b by b.alt;
+            } salt_ext;
+            feature kern {
+                lookup kern_ext;
+                pos b a -20;
+            } kern;
+            feature salt {
+                lookup salt_ext;
+            } salt;
+            """
+        )
+
+        ttFont = FeatureCompiler(ufo).compile()
+
+        gposLookups = ttFont["GPOS"].table.LookupList.Lookup
+        assert [lookup.LookupType for lookup in gposLookups] == [9, 2]
+        gsubLookups = ttFont["GSUB"].table.LookupList.Lookup
+        assert [lookup.LookupType for lookup in gsubLookups] == [7]
+        # the tables can be compiled and read back
+        data = ttFont.getTableData("GPOS")
+        gpos = ttLib.newTable("GPOS")
+        gpos.decompile(data, ttFont)
+        assert gpos.table.LookupList.Lookup[0].LookupType == 9
+
+    def test_buildTables_cacheDir(self, FontClass, tmp_path, monkeypatch):
+        ufo = FontClass()
+        for name in ("a", "a.alt", "v"):
+            ufo.newGlyph(name)
+        ufo.kerning.update({("a", "v"): -40})
+        ufo.features.text = "feature salt { sub a by a.alt; } salt;"
+        expected = FeatureCompiler(ufo).compile()
+
+        ttFont = FeatureCompiler(ufo, cacheDir=tmp_path).compile()
+        assert (tmp_path / "features").is_dir()
+        for tag in ("GPOS", "GSUB"):
+            assert ttFont.getTableData(tag) == expected.getTableData(tag)
+
+        # the second time the tables are loaded from the cache
+        def build(*args, **kwargs):
+            raise AssertionError("unexpected feature compilation")
+
+        monkeypatch.setattr("ufo2ft.featureCompiler._addOpenTypeFeatures", build)
+        ttFont = FeatureCompiler(ufo, cacheDir=tmp_path).compile()
+        for tag in ("GPOS", "GSUB"):
+            assert ttFont.getTableData(tag) == expected.getTableData(tag)
+
+        # tables other than the layout ones are never cached
+        ufo.features.text += "table OS/2 { FSType 0; } OS/2;"
+        with pytest.raises(AssertionError, match="unexpected feature compilation"):
+            FeatureCompiler(ufo, cacheDir=tmp_path).compile()
+
+    def test_buildTables_cacheDir_asFea(self, FontClass, tmp_path, monkeypatch):
+        ufo = FontClass()
+        for name in ("a", "v"):
+            ufo.newGlyph(name)
+        ufo.kerning.update({("a", "v"): -40})
+
+        calls = []
+        asFea = ast.FeatureFile.asFea
+
+        def countingAsFea(self, *args, **kwargs):
+            calls.append(self)
+            return asFea(self, *args, **kwargs)
+
+        monkeypatch.setattr(ast.FeatureFile, "asFea", countingAsFea)
+
+        # without a cache, the tables are built from the AST alone
+        FeatureCompiler(ufo).compile()
+        assert not calls
+
+        # with a cache, the features are stringified once, for both the cache
+        # key and the debug feature file
+        for _ in range(2):
+            calls.clear()
+            compiler = FeatureCompiler(ufo, cacheDir=tmp_path)
+            compiler.compile()
+            compiler.writeFeatures(io.StringIO())
+            assert len(calls) == 1
+
     def test_setupFeatures_custom_feaIncludeDir(self, FontClass, tmp_path):
         (tmp_path / "family.fea").write_text(
             """\
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 from ufo2ft.featureWriters import (
     FEATURE_WRITERS_KEY,
     BaseFeatureWriter,
@@ -16,6 +18,9 @@ except ImportError:
 
 import pytest
 
+from ufo2ft.featureCompiler import FeatureCompiler
+from ufo2ft.featureWriters import ast
+
 from ..testSupport import _TempModule
 
 TEST_LIB_PLIST = readPlistFromString(
@@ -91,3 +96,84 @@ def test_loadFeatureWriterFromString_valid(spec, FontClass):
     writer = loadFeatureWriterFromString(spec)
     assert writer.tableTag in {"GSUB", "GPOS"}
     assert callable(writer.write)
+
+
+class AnalysisWriter(BaseFeatureWriter):
+    features = frozenset(["test"])
+    results = []
+
+    def _write(self):
+        self.context.glyphSet = self.getOrderedGlyphSet()
+        self.results.append((self.guessFontScripts(), self.getGDEFGlyphClasses()))
+        return False
+
+
+class GDEFWriter(BaseFeatureWriter):
+    features = frozenset(["test"])
+
+    def _write(self):
+        feaFile = self.context.feaFile
+        gdef = ast.TableBlock("GDEF")
+        gdef.statements.append(
+            ast.GlyphClassDefStatement(ast.GlyphClass(["a"]), None, None, None)
+        )
+        feaFile.statements.extend([ast.LanguageSystemStatement("grek", "dflt"), gdef])
+        return True
+
+
+def test_analysis_shared_across_writers(FontClass, monkeypatch):
+    ufo = FontClass()
+    ufo.newGlyph("a").unicodes = [0x61]
+    ufo.newGlyph("acutecomb").unicodes = [0x301]
+    ufo.lib["public.openTypeCategories"] = {"a": "base", "acutecomb": "mark"}
+
+    calls = []
+    guessFontScripts = BaseFeatureWriter._guessFontScripts
+
+    def _guessFontScripts(self):
+        calls.append(self)
+        return guessFontScripts(self)
+
+    monkeypatch.setattr(BaseFeatureWriter, "_guessFontScripts", _guessFontScripts)
+    monkeypatch.setattr(AnalysisWriter, "results", [])
+
+    writers = [AnalysisWriter(), AnalysisWriter(), GDEFWriter(), AnalysisWriter()]
+    FeatureCompiler(ufo, featureWriters=writers).compile()
+
+    first, second, third = AnalysisWriter.results
+    assert first == second == ({"Latn", "Zinh"}, ({"a"}, set(), {"acutecomb"}, set()))
+    assert third == ({"Grek", "Latn", "Zinh"}, ({"a"}, set(), set(), set()))
+    # computed again only after the languagesystems of the feature file changed
+    assert len(calls) == 2
+
+
+class MutatingAnalysisWriter(BaseFeatureWriter):
+    features = frozenset(["test"])
+    results = []
+
+    def _write(self):
+        self.context.glyphSet = self.getOrderedGlyphSet()
+        cmap = self.makeUnicodeToGlyphNameMapping()
+        langSysMap = self.getScriptLanguageSystems()
+        scripts = self.guessFontScripts()
+        self.results.append(deepcopy((cmap, langSysMap, scripts)))
+        cmap.clear()
+        langSysMap["Latn"][0][1].append("TRK ")
+        langSysMap.clear()
+        scripts.clear()
+        return False
+
+
+def test_analysis_shared_across_writers_copies(FontClass, monkeypatch):
+    ufo = FontClass()
+    ufo.newGlyph("a").unicodes = [0x61]
+    ufo.features.text = "languagesystem DFLT dflt; languagesystem latn dflt;"
+    monkeypatch.setattr(MutatingAnalysisWriter, "results", [])
+
+    writers = [MutatingAnalysisWriter(), MutatingAnalysisWriter()]
+    FeatureCompiler(ufo, featureWriters=writers).compile()
+
+    first, second = MutatingAnalysisWriter.results
+    assert first == ({0x61: "a"}, {"Latn": [("latn", ["dflt"])]}, {"Latn"})
+    # the writers' changes to the results don't leak into the shared analysis
+    assert second == first
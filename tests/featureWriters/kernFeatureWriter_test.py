@@ -1,14 +1,23 @@
 import logging
 import os
 from textwrap import dedent
+from types import SimpleNamespace
 
 import pytest
 from fontTools import unicodedata
+from fontTools.designspaceLib import DesignSpaceDocument
+from fontTools.feaLib.builder import addOpenTypeFeatures
+from fontTools.ttLib import TTFont
+from fontTools.ufoLib.kerning import lookupKerningValue
 
 from ufo2ft.constants import UNICODE_SCRIPT_ALIASES
 from ufo2ft.errors import InvalidFeaturesData
 from ufo2ft.featureCompiler import FeatureCompiler, parseLayoutFeatures
 from ufo2ft.featureWriters import KernFeatureWriter, ast
+from ufo2ft.featureWriters.kernFeatureWriter import (
+    mergeScripts,
+    splitLargeKerningLookup,
+)
 from ufo2ft.util import DFLT_SCRIPTS, unicodeScriptExtensions
 
 from . import FeatureWriterTest
@@ -2205,6 +2214,132 @@ def test_dflt_language(FontClass):
     )
 
 
+def test_getVariableKerningPairs_fallbacks(FontClass):
+    glyphMap = {"A": 0x41, "Aacute": 0xC1, "V": 0x56, "W": 0x57}
+    groups = {"public.kern1.A": ["A", "Aacute"], "public.kern2.V": ["V", "W"]}
+    kernings = [
+        {("public.kern1.A", "public.kern2.V"): -40, ("Aacute", "W"): -10},
+        {("public.kern1.A", "public.kern2.V"): -80, ("A", "public.kern2.V"): -60},
+    ]
+    doc = DesignSpaceDocument()
+    doc.addAxisDescriptor(
+        name="Weight", tag="wght", minimum=400, default=400, maximum=700
+    )
+    for weight, kerning in zip((400, 700), kernings):
+        doc.addSourceDescriptor(
+            font=makeUFO(FontClass, glyphMap, groups, kerning),
+            location={"Weight": weight},
+        )
+
+    side1Classes = {"public.kern1.A": ("A", "Aacute")}
+    side2Classes = {"public.kern2.V": ("V", "W")}
+    pairs = KernFeatureWriter.getVariableKerningPairs(
+        doc,
+        side1Classes,
+        side2Classes,
+        glyphMap,
+        SimpleNamespace(**KernFeatureWriter.options),
+    )
+
+    # each source falls back to the values of the more general pairs
+    result = {}
+    for pair in pairs:
+        values = sorted(pair.value.values.items(), key=lambda item: sorted(item[0]))
+        result[pair.side1, pair.side2] = [value for _, value in values]
+    expected = {}
+    for side1, side2 in set(kernings[0]) | set(kernings[1]):
+        key = (side1Classes.get(side1, side1), side2Classes.get(side2, side2))
+        expected[key] = [lookupKerningValue((side1, side2), k, groups) for k in kernings]
+    assert result == expected
+    assert result[("Aacute", "W")] == [-10, -80]
+    assert result[("A", ("V", "W"))] == [-40, -60]
+
+
+def test_mergeScripts():
+    kerningPerScript = {
+        ("Latn",): [1],
+        ("Arab", "Syrc"): [2],
+        ("Grek",): [3],
+        ("Cyrl", "Latn"): [4],
+        ("Syrc", "Thaa"): [5],
+        ("Cyrl", "Grek"): [6],
+    }
+    assert mergeScripts(kerningPerScript) == {
+        ("Cyrl", "Grek", "Latn"): [1, 3, 4, 6],
+        ("Arab", "Syrc", "Thaa"): [2, 5],
+    }
+    assert list(mergeScripts(kerningPerScript)) == [
+        ("Cyrl", "Grek", "Latn"),
+        ("Arab", "Syrc", "Thaa"),
+    ]
+
+
+def test_splitLargeKerningLookup():
+    feaFile = ast.FeatureFile()
+    classes = {}
+    for side in ("kern1", "kern2"):
+        for i in range(4):
+            name = f"{side}.{i}"
+            glyphs = [f"{side}{i}.{j}" for j in range(3)]
+            classes[name] = ast.makeGlyphClassDefinition(name, glyphs)
+            feaFile.statements.append(classes[name])
+
+    lookup = ast.LookupBlock("kern_Default")
+    lookup.statements.append(
+        ast.PairPosStatement(
+            ast.GlyphName("kern10.0"),
+            ast.ValueRecord(xAdvance=-5),
+            ast.GlyphName("kern20.0"),
+            None,
+        )
+    )
+    for i in range(4):
+        for j in range(4):
+            lookup.statements.append(
+                ast.PairPosStatement(
+                    ast.GlyphClassName(classes[f"kern1.{i}"]),
+                    ast.ValueRecord(xAdvance=-10 * (i + j)),
+                    ast.GlyphClassName(classes[f"kern2.{j}"]),
+                    None,
+                )
+            )
+    feaFile.statements.append(lookup)
+    feature = ast.FeatureBlock("kern")
+    feature.statements.append(ast.LookupReferenceStatement(lookup))
+    feaFile.statements.append(feature)
+
+    # the subtables are small enough
+    assert splitLargeKerningLookup(lookup) < 200
+    assert not any(isinstance(st, ast.SubtableStatement) for st in lookup.statements)
+    assert not lookup.use_extension
+
+    size = splitLargeKerningLookup(lookup, maxSize=100)
+    assert size > 100
+    assert lookup.use_extension
+    # breaks are only added where the first class changes
+    breaks = [
+        i
+        for i, st in enumerate(lookup.statements)
+        if isinstance(st, ast.SubtableStatement)
+    ]
+    assert breaks
+    for i in breaks:
+        assert (
+            lookup.statements[i - 1].glyphs1.glyphclass
+            is not lookup.statements[i + 1].glyphs1.glyphclass
+        )
+
+    font = TTFont()
+    font.setGlyphOrder(
+        [".notdef"]
+        + [g for classDef in classes.values() for g in classDef.glyphs.glyphSet()]
+    )
+    addOpenTypeFeatures(font, feaFile, tables={"GPOS"})
+    (gposLookup,) = font["GPOS"].table.LookupList.Lookup
+    # a glyph pairs subtable plus one class pairs subtable per break, plus one
+    assert len(gposLookup.SubTable) == len(breaks) + 2
+
+
 if __name__ == "__main__":
     import sys
 
@@ -141,3 +141,24 @@ def test_variable_features_old_kern_writer(FontClass):
         } curs;
 """  # noqa: B950
     )
+
+
+def test_variable_anchors_index_shared(FontClass, monkeypatch):
+    from ufo2ft.featureWriters import BaseFeatureWriter
+
+    calls = []
+    makeVariableAnchors = BaseFeatureWriter._makeVariableAnchors
+
+    def _makeVariableAnchors(self):
+        calls.append(self)
+        return makeVariableAnchors(self)
+
+    monkeypatch.setattr(BaseFeatureWriter, "_makeVariableAnchors", _makeVariableAnchors)
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        "tests/data/TestVarfea.designspace"
+    )
+    designspace.loadSourceFonts(FontClass)
+    compileVariableTTF(designspace)
+
+    # the mark, GDEF and curs writers all use the same anchor index
+    assert len(calls) == 1
@@ -0,0 +1,223 @@
+import random
+
+import fontMath
+import fontTools.designspaceLib as designspaceLib
+import pytest
+
+import ufo2ft.instantiator
+from ufo2ft.util import openFontFactory
+
+pytest.importorskip("numpy")
+
+from ufo2ft.instantiator import (  # noqa: E402
+    GlyphVariator,
+    KerningVariator,
+    Variator,
+)
+from ufo2ft.instantiatorNumpy import GlyphArrays, KerningArrays  # noqa: E402
+
+
+@pytest.fixture
+def generator(ufo_module, data_dir):
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufo_module))
+    return ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+
+
+@pytest.mark.parametrize(
+    "location",
+    [
+        {"width": 0.0, "weight": 0.0},
+        {"width": 0.3, "weight": 0.6},
+        {"width": 1.0, "weight": 0.25},
+        {"width": 0.5, "weight": 1.0},
+        {"width": 0.8, "weight": 0.95},
+    ],
+)
+def test_GlyphVariator_matches_fontMath(generator, location):
+    arrays = 0
+    for glyph_name in generator.glyph_names:
+        sources = ufo2ft.instantiator.collect_glyph_masters(
+            generator.source_layers,
+            glyph_name,
+            generator.axis_bounds,
+            generator.default_source_idx,
+        )
+        expected = Variator.from_masters(sources, generator.axis_order)
+        variator = GlyphVariator.from_masters(sources, generator.axis_order)
+        arrays += variator.arrays is not None
+
+        instance = variator.instance_at(location)
+        assert instance == expected.instance_at(location)
+        assert instance.round() == expected.instance_at(location).round()
+    assert arrays
+
+
+def test_GlyphArrays_incompatible_masters(generator):
+    sources = ufo2ft.instantiator.collect_glyph_masters(
+        generator.source_layers,
+        "A",
+        generator.axis_bounds,
+        generator.default_source_idx,
+    )
+    masters = [master for _, master in sources]
+    assert GlyphArrays.fromMasters(masters) is not None
+
+    masters[1] = masters[1].copy()
+    masters[1].anchors.append({"name": "extra", "x": 0, "y": 0})
+    assert GlyphArrays.fromMasters(masters) is None
+
+
+def test_GlyphVariator_master_copy(generator):
+    sources = ufo2ft.instantiator.collect_glyph_masters(
+        generator.source_layers,
+        "A",
+        generator.axis_bounds,
+        generator.default_source_idx,
+    )
+    variator = GlyphVariator.from_masters(sources, generator.axis_order)
+    location, master = sources[generator.default_source_idx]
+    instance = variator.instance_at(location)
+    assert instance == master
+    assert instance.contours is not master.contours
+    assert instance.contours[0] is not master.contours[0]
+
+
+@pytest.mark.parametrize(
+    "location",
+    [
+        {"width": 0.3, "weight": 0.6},
+        {"width": 1.0, "weight": 0.25},
+        {"width": 0.8, "weight": 0.95},
+    ],
+)
+def test_KerningVariator_matches_fontMath(ufo_module, data_dir, location):
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufo_module))
+    generator = ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+    sources = ufo2ft.instantiator.collect_kerning_masters(
+        designspace, generator.axis_bounds
+    )
+    variator = KerningVariator.from_masters(sources, generator.axis_order)
+    assert variator.arrays is not None
+
+    expected = Variator.from_masters(sources, generator.axis_order)
+    instance = variator.instance_at(location)
+    assert instance == expected.instance_at(location)
+    assert dict(instance.items()) == dict(expected.instance_at(location).items())
+
+
+def _fontMathSum(masters, scalars):
+    result = None
+    for master, scalar in zip(masters, scalars):
+        if scalar:
+            contribution = master * scalar
+            result = contribution if result is None else result + contribution
+    return result
+
+
+def test_KerningArrays_group_exceptions():
+    groups = {
+        "public.kern1.A": ["A", "Aacute"],
+        "public.kern2.V": ["V", "W"],
+    }
+    masters = [
+        fontMath.MathKerning(
+            {
+                ("public.kern1.A", "public.kern2.V"): -100,
+                ("Aacute", "public.kern2.V"): -50,
+                ("T", "o"): 0,
+            },
+            groups,
+        ),
+        fontMath.MathKerning(
+            {
+                ("public.kern1.A", "public.kern2.V"): -60,
+                ("A", "W"): 0,
+                ("T", "o"): -20,
+            },
+            groups,
+        ),
+        fontMath.MathKerning({("A", "V"): 10}, groups),
+    ]
+    arrays = KerningArrays.fromMasters(masters)
+
+    kerning = arrays.interpolate([0.5, 0.5, 0])
+    assert dict(kerning.items()) == {
+        ("public.kern1.A", "public.kern2.V"): -80,
+        ("Aacute", "public.kern2.V"): -55,
+        ("A", "W"): -50,
+        ("T", "o"): -10,
+    }
+    assert kerning.groups() == groups
+
+    # only the pairs of the contributing masters are kept, and those with a
+    # zero value are dropped unless they are exceptions
+    kerning = arrays.interpolate([0, 1.5, -0.5])
+    assert dict(kerning.items()) == {
+        ("public.kern1.A", "public.kern2.V"): -90,
+        ("A", "W"): 0,
+        ("A", "V"): -95,
+        ("T", "o"): -30,
+    }
+
+    assert arrays.interpolate([0, 0, 0]) is None
+
+    masters[2] = fontMath.MathKerning({}, {})
+    assert KerningArrays.fromMasters(masters) is None
+
+
+def test_KerningArrays_partial_sums_fall_back_to_groups():
+    # the masters list pairs whose values fall back to different group pairs:
+    # fontMath resolves the pairs of the later masters against the group
+    # kerning of the sum of the earlier ones
+    groups = {"public.kern1.A": ["a"], "public.kern2.B": ["b"]}
+    masters = [
+        fontMath.MathKerning({("public.kern1.A", "b"): -100}, groups),
+        fontMath.MathKerning({("a", "public.kern2.B"): -50}, groups),
+        fontMath.MathKerning({("a", "b"): 10}, groups),
+    ]
+    arrays = KerningArrays.fromMasters(masters)
+    scalars = [0.49, 0.21, 0.3]
+
+    kerning = arrays.interpolate(scalars)
+    expected = _fontMathSum(masters, scalars)
+    assert dict(kerning.items()) == dict(expected.items())
+    # (public.kern1.A, b) is found before (a, public.kern2.B) in the partial sum
+    assert kerning[("a", "b")] == -49 + 3
+
+
+def test_KerningArrays_matches_fontMath_random():
+    rng = random.Random(1234)
+    groups = {
+        "public.kern1.A": ["A", "Aacute"],
+        "public.kern1.O": ["O", "Q"],
+        "public.kern2.V": ["V", "W"],
+        "public.kern2.o": ["o", "oacute"],
+    }
+    sides1 = ["public.kern1.A", "public.kern1.O", "A", "Aacute", "O", "Q", "T"]
+    sides2 = ["public.kern2.V", "public.kern2.o", "V", "W", "o", "oacute", "x"]
+    allPairs = [(side1, side2) for side1 in sides1 for side2 in sides2]
+    for _ in range(50):
+        masters = [
+            fontMath.MathKerning(
+                {
+                    pair: rng.choice([0, rng.randint(-200, 200)])
+                    for pair in rng.sample(allPairs, rng.randint(0, 20))
+                },
+                groups,
+            )
+            for _ in range(4)
+        ]
+        arrays = KerningArrays.fromMasters(masters)
+        scalars = [rng.choice([0, 0.25, 0.5, -0.3, 1.0, 1.7]) for _ in masters]
+        kerning = arrays.interpolate(scalars)
+        expected = _fontMathSum(masters, scalars)
+        if expected is None:
+            assert kerning is None
+        else:
+            assert dict(kerning.items()) == dict(expected.items())
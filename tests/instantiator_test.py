@@ -702,3 +702,146 @@ def test_strict_math_glyph(ufo_module, data_dir):
     glyph = fonts[0]["test"]
     assert len(glyph.contours) == 1
     assert len(glyph.contours[0].points) == 16
+
+
+def test_replace_source_layers_invalidates_modified_glyphs(ufo_module, data_dir):
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufo_module))
+    generator = ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+    location = generator.normalize(designspace.instances[0].location)
+    glyph_names = ["A", "Aacute", "Adieresis", "B", "dieresis", "dot", "O", "Q"]
+    for glyph_name in glyph_names:
+        generator.generate_glyph_instance(glyph_name, location)
+    layers = [glyphs for _, glyphs in generator.source_layers]
+
+    # the glyphs modified in place, plus the composites that reference them
+    generator.replace_source_layers(layers, {"dot"})
+    assert set(generator.glyph_mutators) == {"A", "Aacute", "B", "O", "Q"}
+
+    # the glyphs that were removed from (or replaced in) any layer
+    layers[0] = {k: v for k, v in layers[0].items() if k != "O"}
+    generator.replace_source_layers(layers, set())
+    assert set(generator.glyph_mutators) == {"A", "Aacute", "B"}
+
+    generator.replace_source_layers(layers)
+    assert not generator.glyph_mutators
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_generate_instances(data_dir, tmp_path, jobs):
+    # defcon fonts can't be pickled back from the worker processes
+    ufoLib2 = pytest.importorskip("ufoLib2")
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufoLib2))
+    generator = ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+    instances = designspace.instances[:3]
+    expected = [generator.generate_instance(instance) for instance in instances]
+    generator.glyph_mutators.clear()
+
+    fonts = list(generator.generate_instances(instances, jobs=jobs))
+    assert [font.info.styleName for font in fonts] == [
+        font.info.styleName for font in expected
+    ]
+    for font, expected_font in zip(fonts, expected):
+        assert font.keys() == expected_font.keys()
+        for glyph_name in expected_font.keys():
+            assert font[glyph_name].width == expected_font[glyph_name].width
+            pen, expected_pen = RecordingPen(), RecordingPen()
+            font[glyph_name].draw(pen)
+            expected_font[glyph_name].draw(expected_pen)
+            assert pen.value == expected_pen.value
+
+    paths = [str(tmp_path / f"instance{i}.ufo") for i in range(len(instances))]
+    assert list(generator.generate_instances(instances, jobs, paths)) == paths
+    for path, expected_font in zip(paths, expected):
+        font = openFont(path, ufo_module=ufoLib2)
+        assert font.info.styleName == expected_font.info.styleName
+        assert font.keys() == expected_font.keys()
+
+    # the arguments are checked when called, not when first iterated
+    with pytest.raises(ValueError, match="Expected 3 output paths"):
+        generator.generate_instances(instances, jobs, paths[:1])
+
+
+def test_generate_instances_without_fork(ufo_module, data_dir, monkeypatch):
+    # the instances are generated serially where workers can't be forked, as
+    # the source fonts (e.g. defcon ones) may not be picklable
+    monkeypatch.setattr(
+        ufo2ft.instantiator.multiprocessing, "get_all_start_methods", lambda: ["spawn"]
+    )
+
+    def pool(*args, **kwargs):
+        raise AssertionError("unexpected process pool")
+
+    monkeypatch.setattr(ufo2ft.instantiator, "ProcessPoolExecutor", pool)
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufo_module))
+    generator = ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+    instances = designspace.instances[:3]
+
+    fonts = list(generator.generate_instances(instances, jobs=2))
+    assert [font.info.styleName for font in fonts] == [
+        instance.styleName for instance in instances
+    ]
+
+
+def test_generate_instances_save(data_dir, tmp_path, monkeypatch):
+    ufoLib2 = pytest.importorskip("ufoLib2")
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufoLib2))
+    generator = ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+    instance = designspace.instances[0]
+    path = str(tmp_path / "instance.ufo")
+
+    # like defcon's Font.save, which has no 'overwrite' argument
+    calls = []
+
+    def save(self, path=None, formatVersion=None):
+        calls.append(path)
+
+    monkeypatch.setattr(ufoLib2.Font, "save", save)
+    assert list(generator.generate_instances([instance], 1, [path])) == [path]
+    assert calls == [path]
+
+    # errors raised while saving are not mistaken for an unsupported signature
+    def save(self, path=None, overwrite=False):
+        if overwrite:
+            raise TypeError("boom")
+        calls.append(path)
+
+    monkeypatch.setattr(ufoLib2.Font, "save", save)
+    with pytest.raises(TypeError, match="boom"):
+        list(generator.generate_instances([instance], 1, [path]))
+
+
+def test_variation_models_shared(ufo_module, data_dir):
+    designspace = designspaceLib.DesignSpaceDocument.fromfile(
+        data_dir / "MutatorSans" / "MutatorSans.designspace"
+    )
+    designspace.loadSourceFonts(openFontFactory(ufo_module=ufo_module))
+    generator = ufo2ft.instantiator.Instantiator.from_designspace(designspace)
+    location = generator.normalize(designspace.instances[0].location)
+    for glyph_name in "ABCDE":
+        generator.generate_glyph_instance(glyph_name, location)
+
+    # 'B' and 'E' also have a master in the sparse 'support' layer
+    models = {name: generator.glyph_mutators[name].model for name in "ABCDE"}
+    assert models["A"] is models["C"] is models["D"]
+    assert models["B"] is models["E"]
+    assert models["A"] is not models["B"]
+    assert generator.info_mutator.model is generator.kerning_mutator.model
+    assert generator.info_mutator.model is models["A"]
+    assert len(generator.variation_models) == 2
+
+    model = models["B"]
+    scalars = ufo2ft.instantiator.get_master_scalars(model, location)
+    assert scalars == model.getMasterScalars(location)
+    assert ufo2ft.instantiator.get_master_scalars(model, location) is scalars
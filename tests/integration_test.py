@@ -12,12 +12,14 @@ from fontTools.designspaceLib import DesignSpaceDocument
 from fontTools.otlLib.optimize.gpos import COMPRESSION_LEVEL as GPOS_COMPRESSION_LEVEL
 from fontTools.pens.boundsPen import BoundsPen
 from fontTools.pens.transformPen import TransformPen
+from fontTools.ttLib import TTFont
 from fontTools.ttLib.tables._g_l_y_f import (
     OVERLAP_COMPOUND,
     flagCubic,
     flagOverlapSimple,
 )
 
+import ufo2ft._compilers.baseCompiler
 from ufo2ft import (
     compileInterpolatableTTFs,
     compileOTF,
@@ -27,9 +29,12 @@ from ufo2ft import (
     compileVariableTTF,
     compileVariableTTFs,
 )
+from ufo2ft._compilers.ttfCompiler import TTFCompiler
 from ufo2ft.constants import KEEP_GLYPH_NAMES, TRUETYPE_OVERLAP_KEY
 from ufo2ft.errors import InvalidFontData
 from ufo2ft.filters import TransformationsFilter
+from ufo2ft.outlineCompiler import OutlineTTFCompiler
+from ufo2ft.preProcessor import TTFPreProcessor
 
 
 def getpath(filename):
@@ -93,6 +98,123 @@ class IntegrationTest:
         otf = compileOTF(testufo)
         expectTTX(otf, "TestFont-CFF.ttx")
 
+    def test_TestFont_TTF_cacheDir(self, testufo, tmp_path):
+        expectTTX(compileTTF(testufo, cacheDir=tmp_path), "TestFont.ttx")
+        # the second time the glyphs and layout tables are loaded from the cache
+        expectTTX(compileTTF(testufo, cacheDir=tmp_path), "TestFont.ttx")
+
+    def test_TestFont_TTF_incremental_unchanged(self, testufo):
+        previous = compileTTF(testufo)
+        ttf = TTFCompiler().compile(testufo, previous=previous, changedGlyphs=())
+        expectTTX(ttf, "TestFont.ttx")
+
+    @pytest.mark.parametrize("reloadPrevious", [False, True])
+    @pytest.mark.parametrize("glyphName", ["a", "b", "space"])
+    def test_TestFont_TTF_incremental(self, testufo, glyphName, reloadPrevious):
+        previous = compileTTF(testufo)
+        if reloadPrevious:
+            buf = io.BytesIO()
+            previous.save(buf)
+            buf.seek(0)
+            previous = TTFont(buf)
+
+        glyph = testufo[glyphName]
+        glyph.width += 10
+        pen = glyph.getPen()
+        pen.moveTo((0, 0))
+        pen.lineTo((0, 900))
+        pen.lineTo((900, 0))
+        pen.closePath()
+
+        expected = compileTTF(testufo)
+        ttf = TTFCompiler().compile(
+            testufo, previous=previous, changedGlyphs=[glyphName]
+        )
+        for font in (expected, ttf):
+            font.recalcTimestamp = False
+            font["head"].created = font["head"].modified = 0
+            # computed from the timestamps when the post-processor saves the font
+            font["head"].checkSumAdjustment = 0
+        assert ttf.getGlyphOrder() == expected.getGlyphOrder()
+        for tag in sorted(expected.keys()):
+            if tag == "GlyphOrder":
+                continue
+            assert ttf.getTableData(tag) == expected.getTableData(tag), tag
+
+    def test_TTF_incremental_only_changed_glyphs(self, testufo, monkeypatch):
+        previous = TTFCompiler().compile(testufo)
+        testufo["a"].width += 10
+
+        processed = []
+        process = TTFPreProcessor.process
+
+        def spy_process(self):
+            glyphSet = process(self)
+            processed.append(set(glyphSet.keys()))
+            return glyphSet
+
+        compiled = []
+        compile = OutlineTTFCompiler.compile
+
+        def spy_compile(self):
+            otf = compile(self)
+            compiled.append(set(otf.keys()))
+            return otf
+
+        monkeypatch.setattr(TTFPreProcessor, "process", spy_process)
+        monkeypatch.setattr(OutlineTTFCompiler, "compile", spy_compile)
+        ttf = TTFCompiler().compile(testufo, previous=previous, changedGlyphs=["a"])
+
+        # the composites referencing 'a' are also compiled again
+        assert processed == [{"a", "g", "i", "j", "k", "l"}]
+        # the other tables are copied from the previous font
+        assert len(compiled) == 1
+        assert {"glyf", "hmtx", "vmtx", "OS/2"} <= compiled[0]
+        assert not {"cmap", "name", "post", "GPOS"} & compiled[0]
+        for tag in ("cmap", "name", "post", "GPOS"):
+            assert ttf.getTableData(tag) == previous.getTableData(tag), tag
+        assert ttf["hmtx"]["uni0061"] != previous["hmtx"]["uni0061"]
+
+    def test_TTF_incremental_glyph_set_changed(self, testufo):
+        previous = compileTTF(testufo)
+        testufo.newGlyph("z")
+        ttf = TTFCompiler().compile(testufo, previous=previous, changedGlyphs=["z"])
+        expected = compileTTF(testufo)
+        assert ttf.getGlyphOrder() == expected.getGlyphOrder()
+        assert ttf.getTableData("glyf") == expected.getTableData("glyf")
+
+    def test_TTF_incremental_anchors_removed(self, testufo):
+        testufo["a"].appendAnchor({"name": "top", "x": 250, "y": 500})
+        testufo["b"].appendAnchor({"name": "_top", "x": 250, "y": 400})
+        previous = TTFCompiler().compile(testufo)
+        assert "mark" in {
+            fr.FeatureTag for fr in previous["GPOS"].table.FeatureList.FeatureRecord
+        }
+
+        testufo["b"].clearAnchors()
+        ttf = TTFCompiler().compile(testufo, previous=previous, changedGlyphs=["b"])
+        expected = compileTTF(testufo)
+        assert expected.getTableData("GPOS") != previous.getTableData("GPOS")
+        assert ttf.getTableData("GPOS") == expected.getTableData("GPOS")
+
+    def test_TTF_incremental_glyph_order_changed(self, testufo):
+        previous = TTFCompiler().compile(testufo)
+        glyphOrder = list(testufo.glyphOrder)
+        i, j = glyphOrder.index("a"), glyphOrder.index("b")
+        glyphOrder[i], glyphOrder[j] = glyphOrder[j], glyphOrder[i]
+        testufo.glyphOrder = glyphOrder
+
+        ttf = TTFCompiler().compile(testufo, previous=previous, changedGlyphs=())
+        expected = compileTTF(testufo)
+        assert ttf.getGlyphOrder() == expected.getGlyphOrder()
+        for tag in ("glyf", "hmtx", "GPOS"):
+            assert ttf.getTableData(tag) == expected.getTableData(tag), tag
+
+    def test_TTF_incremental_requires_changedGlyphs(self, testufo):
+        previous = compileTTF(testufo)
+        with pytest.raises(TypeError, match="changedGlyphs"):
+            TTFCompiler().compile(testufo, previous=previous)
+
     def test_included_features(self, FontClass):
         """Checks how the compiler handles include statements in features.fea.
 
@@ -249,12 +371,34 @@ class IntegrationTest:
         varfont = compileVariableCFF2(designspace, optimizeCFF=2)
         expectTTX(varfont, "TestVariableFont-CFF2-cffsubr.ttx")
 
+    def test_compileVariableTTF_jobs(self, designspace):
+        varfont = compileVariableTTF(designspace, jobs=2)
+        expectTTX(varfont, "TestVariableFont-TTF.ttx")
+
+    def test_compileVariableTTF_jobs_without_fork(self, designspace, monkeypatch):
+        # the masters are compiled serially where workers can't be forked
+        monkeypatch.setattr(
+            ufo2ft._compilers.baseCompiler.multiprocessing,
+            "get_all_start_methods",
+            lambda: ["spawn"],
+        )
+
+        def pool(*args, **kwargs):
+            raise AssertionError("unexpected process pool")
+
+        monkeypatch.setattr(ufo2ft._compilers.baseCompiler, "ProcessPoolExecutor", pool)
+        varfont = compileVariableTTF(designspace, jobs=2)
+        expectTTX(varfont, "TestVariableFont-TTF.ttx")
+
+    def test_compileVariableCFF2_jobs(self, designspace):
+        varfont = compileVariableCFF2(designspace, jobs=2)
+        expectTTX(varfont, "TestVariableFont-CFF2.ttx")
+
     def test_debugFeatureFile(self, designspace):
         tmp = io.StringIO()
 
         _ = compileVariableTTF(designspace, debugFeatureFile=tmp)
-        assert "\n" + tmp.getvalue() == dedent(
-            """
+        assert "\n" + tmp.getvalue() == dedent("""
             markClass dotabovecomb <anchor -2 465> @MC_top;
 
             feature liga {
@@ -268,8 +412,7 @@ class IntegrationTest:
                 } mark2base;
 
             } mark;
-        """  # noqa: B950
-        )
+        """)  # noqa: B950
 
     @pytest.mark.parametrize(
         "output_format, options, expected_ttx",
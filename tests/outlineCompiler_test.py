@@ -9,6 +9,7 @@ from fontTools.misc.arrayTools import quantizeRect
 from fontTools.ttLib import TTFont
 from fontTools.ttLib.tables._g_l_y_f import USE_MY_METRICS
 
+import ufo2ft.outlineCompiler
 from ufo2ft import (
     compileInterpolatableOTFsFromDS,
     compileInterpolatableTTFs,
@@ -110,6 +111,48 @@ class OutlineTTFCompilerTest:
         assert compiler.getMaxComponentDepths()["d"] == 1
         assert compiler.getMaxComponentDepths()["e"] == 2
 
+    @pytest.mark.parametrize("roundCoordinates", [True, False])
+    def test_compileGlyphs_jobs(self, quadufo, roundCoordinates):
+        serial = OutlineTTFCompiler(quadufo, roundCoordinates=roundCoordinates)
+        parallel = OutlineTTFCompiler(
+            quadufo, roundCoordinates=roundCoordinates, jobs=2
+        )
+        serialGlyphs = serial.compileGlyphs()
+        parallelGlyphs = parallel.compileGlyphs()
+        assert list(parallelGlyphs) == list(serialGlyphs)
+        for name, glyph in serialGlyphs.items():
+            assert parallelGlyphs[name] == glyph
+
+    def test_compile_jobs_nested_components(self, nestedcomponentsufo):
+        serial = compileTTF(nestedcomponentsufo)
+        parallel = compileTTF(nestedcomponentsufo, jobs=2)
+        assert parallel.getGlyphOrder() == serial.getGlyphOrder()
+        for tag in ("glyf", "loca", "maxp"):
+            assert parallel[tag].compile(parallel) == serial[tag].compile(serial)
+
+    def test_compileGlyphs_cacheDir(self, quadufo, tmp_path, monkeypatch):
+        expected = OutlineTTFCompiler(quadufo).compileGlyphs()
+
+        compiler = OutlineTTFCompiler(quadufo, cacheDir=tmp_path)
+        assert compiler.compileGlyphs() == expected
+        assert any((tmp_path / "glyf").iterdir())
+
+        # the second time, all the simple glyphs are read from the cache
+        def fail(*args, **kwargs):
+            raise AssertionError("glyph was not cached")
+
+        monkeypatch.setattr(ufo2ft.outlineCompiler, "_buildSimpleTTGlyph", fail)
+        compiler = OutlineTTFCompiler(quadufo, cacheDir=tmp_path)
+        assert compiler.compileGlyphs() == expected
+
+        # modified glyphs are compiled again
+        monkeypatch.undo()
+        quadufo["a"].move((10, 0))
+        compiler = OutlineTTFCompiler(quadufo, cacheDir=tmp_path)
+        ttGlyphs = compiler.compileGlyphs()
+        assert ttGlyphs["a"] != expected["a"]
+        assert ttGlyphs["d"] == expected["d"]
+
     def test_autoUseMyMetrics(self, use_my_metrics_ufo):
         compiler = OutlineTTFCompiler(use_my_metrics_ufo)
         ttf = compiler.compile()
@@ -529,6 +572,56 @@ class OutlineOTFCompilerTest:
         compiler = OutlineOTFCompiler(testufo, roundTolerance=0.1)
         assert compiler.glyphBoundingBoxes["d"] == (90, 77, 211, 198)
 
+    @pytest.mark.parametrize("optimizeCFF", [True, False])
+    @pytest.mark.parametrize("roundTolerance", [0.5, 0])
+    def test_compileGlyphs_jobs(self, testufo, optimizeCFF, roundTolerance):
+        kwargs = dict(optimizeCFF=optimizeCFF, roundTolerance=roundTolerance)
+        serial = OutlineOTFCompiler(testufo, **kwargs).compileGlyphs()
+        parallel = OutlineOTFCompiler(testufo, jobs=2, **kwargs).compileGlyphs()
+        assert list(parallel) == list(serial)
+        for name, charString in serial.items():
+            assert parallel[name].program == charString.program
+
+    def test_compileGlyphs_jobs_getCharStringForGlyph_override(self, testufo):
+        class CustomOTFCompiler(OutlineOTFCompiler):
+            def getCharStringForGlyph(self, glyph, private, globalSubrs=None):
+                self.drawn.add(glyph.name)
+                return super().getCharStringForGlyph(glyph, private, globalSubrs)
+
+        compiler = CustomOTFCompiler(testufo, jobs=2)
+        compiler.drawn = set()
+        compiler.compileGlyphs()
+        assert compiler.drawn == set(compiler.glyphOrder)
+
+    def test_compile_jobs(self, testufo):
+        serial = compileOTF(testufo)
+        parallel = compileOTF(testufo, jobs=2)
+        assert parallel["CFF "].compile(parallel) == serial["CFF "].compile(serial)
+
+    def test_compileGlyphs_cacheDir(self, testufo, tmp_path, monkeypatch):
+        expected = OutlineOTFCompiler(testufo).compileGlyphs()
+
+        compiler = OutlineOTFCompiler(testufo, cacheDir=tmp_path)
+        charStrings = compiler.compileGlyphs()
+        assert {k: cs.program for k, cs in charStrings.items()} == {
+            k: cs.program for k, cs in expected.items()
+        }
+
+        def fail(*args, **kwargs):
+            raise AssertionError("glyph was not cached")
+
+        monkeypatch.setattr(ufo2ft.outlineCompiler, "_buildT2CharStringProgram", fail)
+        compiler = OutlineOTFCompiler(testufo, cacheDir=tmp_path)
+        charStrings = compiler.compileGlyphs()
+        assert {k: cs.program for k, cs in charStrings.items()} == {
+            k: cs.program for k, cs in expected.items()
+        }
+
+        # the cache is keyed by the compile options too
+        compiler = OutlineOTFCompiler(testufo, cacheDir=tmp_path, roundTolerance=0)
+        with pytest.raises(AssertionError, match="glyph was not cached"):
+            compiler.compileGlyphs()
+
     def test_importTTX(self, testufo):
         compiler = OutlineOTFCompiler(testufo)
         otf = compiler.otf = TTFont(sfntVersion="OTTO")
@@ -4,8 +4,10 @@ import os
 import pytest
 from fontTools import designspaceLib
 from fontTools.cu2qu.ufo import CURVE_TYPE_LIB_KEY
+from fontTools.pens.recordingPen import RecordingPointPen
 
 import ufo2ft
+import ufo2ft.filters.cubicToQuadratic
 from ufo2ft.constants import (
     COLOR_LAYER_MAPPING_KEY,
     COLOR_LAYERS_KEY,
@@ -18,6 +20,7 @@ from ufo2ft.preProcessor import (
     TTFPreProcessor,
     _init_explode_color_layer_glyphs_filter,
 )
+from ufo2ft.util import _GlyphSet
 
 
 def getpath(filename):
@@ -31,6 +34,15 @@ def glyph_has_qcurve(ufo, glyph_name):
     )
 
 
+def glyph_set_points(glyphSet):
+    result = {}
+    for name, glyph in glyphSet.items():
+        pen = RecordingPointPen()
+        glyph.drawPoints(pen)
+        result[name] = pen.value
+    return result
+
+
 class TTFPreProcessorTest:
     def test_no_inplace(self, FontClass):
         ufo = FontClass(getpath("TestFont.ufo"))
@@ -145,6 +157,52 @@ class TTFPreProcessorTest:
         assert points[2].segmentType is None
         assert points[3].segmentType == "curve"
 
+    def test_cacheDir(self, FontClass, tmp_path, monkeypatch):
+        ufo = FontClass(getpath("TestFont.ufo"))
+        expected = glyph_set_points(TTFPreProcessor(ufo).process())
+
+        glyphSet = TTFPreProcessor(ufo, cacheDir=tmp_path).process()
+        assert glyph_set_points(glyphSet) == expected
+        assert (tmp_path / "cu2qu").is_dir()
+
+        # the second time the converted contours are all loaded from the cache
+        def cu2qu_pen(*args, **kwargs):
+            raise AssertionError("unexpected cu2qu conversion")
+
+        monkeypatch.setattr(ufo2ft.filters.cubicToQuadratic, "Cu2QuPointPen", cu2qu_pen)
+        glyphSet = TTFPreProcessor(ufo, cacheDir=tmp_path).process()
+        assert glyph_set_points(glyphSet) == expected
+
+    def test_glyphNames(self, FontClass):
+        ufo = FontClass(getpath("TestFont.ufo"))
+        expected = glyph_set_points(TTFPreProcessor(ufo).process())
+
+        # the components of the given glyphs are included, e.g. to decompose
+        # those of 'i', which has both contours and components
+        glyphSet = TTFPreProcessor(ufo, glyphNames=["c", "g", "i"]).process()
+        assert set(glyphSet.keys()) == {"a", "c", "g", "i"}
+        assert glyph_set_points(glyphSet) == {
+            name: expected[name] for name in glyphSet.keys()
+        }
+        assert not glyphSet["i"].components
+
+    @pytest.mark.parametrize("cacheDir", [False, True])
+    def test_jobs(self, FontClass, tmp_path, caplog, cacheDir):
+        ufo = FontClass(getpath("TestFont.ufo"))
+        kwargs = dict(removeOverlaps=True, cacheDir=tmp_path if cacheDir else None)
+        with caplog.at_level(logging.INFO, logger="ufo2ft.filters"):
+            expected = glyph_set_points(TTFPreProcessor(ufo, **kwargs).process())
+        expectedStats = [r.msg for r in caplog.records if "spline lengths" in r.msg]
+        caplog.clear()
+
+        with caplog.at_level(logging.INFO, logger="ufo2ft.filters"):
+            glyphSet = TTFPreProcessor(ufo, jobs=2, **kwargs).process()
+        assert glyph_set_points(glyphSet) == expected
+        stats = [r.msg for r in caplog.records if "spline lengths" in r.msg]
+        assert stats == expectedStats
+        # the input UFO is left untouched
+        assert not glyph_has_qcurve(ufo, "c")
+
 
 class TTFInterpolatablePreProcessorTest:
     def test_no_inplace(self, FontClass):
@@ -196,6 +254,57 @@ class TTFInterpolatablePreProcessorTest:
             assert glyph_has_qcurve(ufo1, "c")
             assert glyph_has_qcurve(ufo2, "c")
 
+    @pytest.mark.parametrize("inplace", [False, True])
+    def test_cacheDir(self, FontClass, tmp_path, monkeypatch, inplace):
+        def ufos():
+            ufo1 = FontClass(getpath("TestFont.ufo"))
+            ufo2 = FontClass(getpath("TestFont.ufo"))
+            for contour in ufo2["c"]:
+                for point in contour:
+                    point.x += 10
+            return [ufo1, ufo2]
+
+        expected = [
+            glyph_set_points(glyphSet)
+            for glyphSet in TTFInterpolatablePreProcessor(
+                ufos(), inplace=inplace
+            ).process()
+        ]
+
+        for _ in range(2):
+            glyphSets = TTFInterpolatablePreProcessor(
+                ufos(), inplace=inplace, cacheDir=tmp_path
+            ).process()
+            assert [glyph_set_points(gs) for gs in glyphSets] == expected
+
+            # after the first build, the converted contours are loaded from the cache
+            def glyphs_to_quadratic(*args, **kwargs):
+                raise AssertionError("unexpected cu2qu conversion")
+
+            monkeypatch.setattr(
+                ufo2ft.filters.cubicToQuadratic,
+                "glyphs_to_quadratic",
+                glyphs_to_quadratic,
+            )
+
+    @pytest.mark.parametrize("cacheDir", [False, True])
+    def test_fontsToQuadratic_returns_set(self, FontClass, tmp_path, cacheDir):
+        ufos = [FontClass(getpath("TestFont.ufo")) for _ in range(2)]
+        glyphSets = [_GlyphSet.from_layer(ufo) for ufo in ufos]
+        kwargs = dict(cacheDir=tmp_path if cacheDir else None)
+
+        modified = ufo2ft.filters.cubicToQuadratic.fontsToQuadratic(
+            glyphSets, [1, 1], **kwargs
+        )
+        assert isinstance(modified, set)
+        assert "c" in modified
+
+        # the curves are already quadratic
+        modified = ufo2ft.filters.cubicToQuadratic.fontsToQuadratic(
+            glyphSets, [1, 1], **kwargs
+        )
+        assert modified == set()
+
     def test_custom_filters(self, FontClass):
         ufo1 = FontClass(getpath("TestFont.ufo"))
         ufo1.lib[FILTERS_KEY] = [
@@ -86,6 +86,252 @@ def test_getMaxComponentDepth_cyclical_reference():
     assert util.getMaxComponentDepth(glyph_h, test_ufo) == 0
 
 
+def test_ComponentGraph_cyclical_reference():
+    test_ufo = pytest.importorskip("ufoLib2").Font()
+    for name in "ABCD":
+        test_ufo.newGlyph(name)
+    test_ufo["A"].getPen().addComponent("C", (1, 0, 0, 1, 0, 0))
+    test_ufo["B"].getPen().addComponent("A", (1, 0, 0, 1, 0, 0))
+    test_ufo["C"].getPen().addComponent("B", (1, 0, 0, 1, 0, 0))
+    test_ufo["D"].getPen().addComponent("D", (1, 0, 0, 1, 0, 0))
+    graph = util.ComponentGraph({g.name: g for g in test_ufo})
+
+    with pytest.raises(
+        InvalidFontData, match="cyclical component reference: A -> C -> B => A"
+    ):
+        graph.getMaxComponentDepth("A")
+    with pytest.raises(InvalidFontData, match="cyclical component reference: D => D"):
+        graph.getMaxComponentDepth("D")
+
+
+def test_ComponentGraph_getMaxComponentDepth(FontClass):
+    test_ufo = FontClass()
+    for name in "ABCDEFG":
+        test_ufo.newGlyph(name)
+    test_ufo["B"].getPen().addComponent("A", (1, 0, 0, 1, 0, 0))
+    test_ufo["C"].getPen().addComponent("B", (1, 0, 0, 1, 0, 0))
+    test_ufo["C"].getPen().addComponent("B", (1, 0, 0, 1, 0, 0))
+    # D references C both directly and through E
+    test_ufo["D"].getPen().addComponent("C", (1, 0, 0, 1, 0, 0))
+    test_ufo["D"].getPen().addComponent("E", (1, 0, 0, 1, 0, 0))
+    test_ufo["E"].getPen().addComponent("C", (1, 0, 0, 1, 0, 0))
+    test_ufo["F"].getPen().addComponent("missing", (1, 0, 0, 1, 0, 0))
+    glyphSet = {g.name: g for g in test_ufo}
+    graph = util.ComponentGraph(glyphSet)
+
+    assert graph.getMaxComponentDepth("A") == 0
+    assert graph.getMaxComponentDepth("B") == 1
+    assert graph.getMaxComponentDepth("C") == 2
+    assert graph.getMaxComponentDepth("D") == 4
+    assert graph.getMaxComponentDepth("E") == 3
+    assert graph.getMaxComponentDepth("F") == 1
+    assert graph.getMaxComponentDepths() == {"B": 1, "C": 2, "D": 4, "E": 3, "F": 1}
+
+
+def test_ComponentGraph_update(FontClass):
+    test_ufo = FontClass()
+    for name in "ABCD":
+        test_ufo.newGlyph(name)
+    test_ufo["B"].getPen().addComponent("A", (1, 0, 0, 1, 0, 0))
+    test_ufo["C"].getPen().addComponent("B", (1, 0, 0, 1, 0, 0))
+    test_ufo["D"].getPen().addComponent("missing", (1, 0, 0, 1, 0, 0))
+    glyphSet = {g.name: g for g in test_ufo}
+    graph = util.ComponentGraph(glyphSet)
+    assert graph.getMaxComponentDepths() == {"B": 1, "C": 2, "D": 1}
+    assert graph.update() == set()
+
+    # decompose B
+    test_ufo["B"].clearComponents()
+    assert graph.update() == {"B"}
+    assert graph.getMaxComponentDepths() == {"C": 1, "D": 1}
+    assert graph.closeOverComposites({"A"}) == {"A"}
+
+    # add the glyph referenced by D, itself a composite
+    test_ufo.newGlyph("missing").getPen().addComponent("C", (1, 0, 0, 1, 0, 0))
+    glyphSet["missing"] = test_ufo["missing"]
+    assert graph.update() == {"missing"}
+    assert graph.getMaxComponentDepths() == {"C": 1, "D": 3, "missing": 2}
+
+    # remove C
+    del glyphSet["C"]
+    assert graph.update() == {"C"}
+    assert graph.getMaxComponentDepths() == {"D": 2, "missing": 1}
+    assert graph.closeOverComposites({"C"}) == {"C", "D", "missing"}
+
+
+def test_getComponentGraph(FontClass):
+    test_ufo = FontClass()
+    test_ufo.newGlyph("A")
+    test_ufo.newGlyph("B").getPen().addComponent("A", (1, 0, 0, 1, 0, 0))
+
+    glyphSet = util._GlyphSet.from_layer(test_ufo)
+    graph = util.getComponentGraph(glyphSet)
+    assert util.getComponentGraph(glyphSet) is graph
+    assert graph.getMaxComponentDepth("B") == 1
+    glyphSet["B"].clearComponents()
+    assert util.getComponentGraph(glyphSet).getMaxComponentDepth("B") == 0
+
+    # plain dicts can't store the graph, a new one is returned each time
+    glyphSet = {g.name: g for g in test_ufo}
+    assert util.getComponentGraph(glyphSet) is not util.getComponentGraph(glyphSet)
+
+
+def test_closeGlyphsOverComponents(FontClass):
+    test_ufo = FontClass()
+    for name in "ABCDE":
+        test_ufo.newGlyph(name)
+    test_ufo["B"].getPen().addComponent("A", (1, 0, 0, 1, 0, 0))
+    test_ufo["C"].getPen().addComponent("B", (1, 0, 0, 1, 0, 0))
+    test_ufo["D"].getPen().addComponent("E", (1, 0, 0, 1, 0, 0))
+    glyphSet = {g.name: g for g in test_ufo}
+
+    assert util.closeGlyphsOverComponents(glyphSet, {"A"}) == {"A", "B", "C"}
+    assert util.closeGlyphsOverComponents(glyphSet, {"B", "E"}) == {"B", "C", "D", "E"}
+    assert util.closeGlyphsOverComponents(glyphSet, {"C"}) == {"C"}
+    assert util.closeGlyphsOverComponents(glyphSet, set()) == set()
+
+
+def _compileGSUB(features, glyphOrder):
+    from io import StringIO
+
+    from fontTools.feaLib.parser import Parser
+
+    featureFile = Parser(StringIO(features), glyphNames=glyphOrder).parse()
+    return util.compileGSUB(featureFile, glyphOrder)
+
+
+def test_GSUBClosure_closeGlyphSets():
+    glyphOrder = ["a", "a.alt", "a.sc", "b", "b.alt", "c", "c.sc", "d"]
+    gsub = _compileGSUB(
+        """\
+        feature salt { sub a by a.alt; sub b from [b.alt]; } salt;
+        feature smcp { sub a.alt by a.sc; sub c by c.sc d; } smcp;
+        """,
+        glyphOrder,
+    )
+    closure = util.getGSUBClosure(gsub)
+    assert util.getGSUBClosure(gsub) is closure
+    assert not closure._contextual
+
+    seeds = [{"a"}, {"b", "c"}, {"d"}, set()]
+    result = closure.closeGlyphSets(seeds)
+    assert result == [
+        {"a", "a.alt", "a.sc"},
+        {"b", "b.alt", "c", "c.sc", "d"},
+        {"d"},
+        set(),
+    ]
+    # the seed sets are not modified
+    assert seeds == [{"a"}, {"b", "c"}, {"d"}, set()]
+
+
+def _subsetterClosure(gsub, glyphs):
+    from fontTools import subset
+
+    subsetter = subset.Subsetter()
+    subsetter.glyphs = set(glyphs)
+    gsub.closure_glyphs(subsetter)
+    return subsetter.glyphs
+
+
+@pytest.mark.parametrize(
+    "features",
+    [
+        "feature liga { sub a b by c; } liga;",
+        # the components of a ligature reached via other substitutions, and
+        # ligatures of ligatures
+        "feature salt { sub a by a.alt; } salt;"
+        "feature liga { sub a.alt b by c; sub c d by c.sc; sub b b b by d; } liga;",
+    ],
+)
+def test_GSUBClosure_ligatures(features, monkeypatch):
+    from fontTools import subset
+
+    glyphOrder = ["a", "a.alt", "b", "b.alt", "c", "c.sc", "d"]
+    gsub = _compileGSUB(features, glyphOrder)
+    closure = util.GSUBClosure(gsub)
+    assert not closure._contextual
+
+    seeds = [{"a"}, {"b"}, {"a", "b"}, {"c", "d"}, {"a", "b", "d"}]
+    expected = [_subsetterClosure(gsub, seed) for seed in seeds]
+    # the closure of ligatures doesn't need the subsetter
+    monkeypatch.setattr(subset, "Subsetter", None)
+    assert closure.closeGlyphSets(seeds) == expected
+
+
+@pytest.mark.parametrize(
+    "features",
+    [
+        "feature calt { sub a b' by b.alt; sub d c' by c.sc; } calt;",
+        "feature salt { sub a by a.alt; } salt;"
+        "feature calt { sub a.alt b' by b.alt; } calt;",
+        "feature liga { sub a b by c; } liga;"
+        "feature calt { sub d c' by c.sc; } calt;",
+        "feature rclt { rsub a b' by b.alt; } rclt;",
+    ],
+)
+def test_GSUBClosure_contextual(features, monkeypatch):
+    from fontTools import subset
+
+    glyphOrder = ["a", "a.alt", "b", "b.alt", "c", "c.sc", "d"]
+    gsub = _compileGSUB(features, glyphOrder)
+    closure = util.GSUBClosure(gsub)
+    assert closure._contextual
+
+    seeds = [{"a"}, {"b"}, {"a", "b"}, {"c", "d"}]
+    union = _subsetterClosure(gsub, set().union(*seeds))
+
+    subsetters = []
+    subsetterClass = subset.Subsetter
+
+    def Subsetter(*args, **kwargs):
+        subsetters.append(subsetterClass(*args, **kwargs))
+        return subsetters[-1]
+
+    monkeypatch.setattr(subset, "Subsetter", Subsetter)
+    results = closure.closeGlyphSets(seeds)
+    # the subsetter only runs once, for all the sets
+    assert len(subsetters) == 1
+    monkeypatch.undo()
+
+    for seed, result in zip(seeds, results):
+        # the glyphs each set reaches regardless of the context, among those
+        # that the union of the sets reaches
+        assert _subsetterClosure(gsub, seed) <= result <= union
+
+
+def test_UnicodeProperties():
+    from fontTools import unicodedata
+
+    from ufo2ft.constants import UNICODE_SCRIPT_ALIASES
+
+    properties = util.getUnicodeProperties()
+    assert util.getUnicodeProperties() is properties
+
+    for uv in list(range(0x3100)) + [0x10FFFF, 0x1E900, 0xFEFF, 0x30A0, 0xFF70]:
+        char = chr(uv)
+        expected = {
+            UNICODE_SCRIPT_ALIASES.get(s, s) for s in unicodedata.script_extension(char)
+        }
+        assert properties.getScriptExtensions(uv) == expected
+        assert util.unicodeScriptExtensions(uv) == expected
+
+        script = unicodedata.script(char)
+        direction = properties.getScriptDirection(uv)
+        if script in util.DFLT_SCRIPTS:
+            assert direction is None
+        else:
+            assert direction == unicodedata.script_horizontal_direction(script, "LTR")
+
+        bidiType = unicodedata.bidirectional(char)
+        if bidiType in util.RTL_BIDI_TYPES:
+            assert util.unicodeBidiType(uv) == "R"
+        elif bidiType in util.LTR_BIDI_TYPES:
+            assert util.unicodeBidiType(uv) == "L"
+        else:
+            assert util.unicodeBidiType(uv) is None
+
+
 def test_zip_strict():
     assert list(zip_strict([0, 1], [2, 3])) == [(0, 2), (1, 3)]
 